@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+
+"""
+    Copyright 2024- ZiJian Jiang @ https://github.com/CallmeNezha
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+"""
+Latency of binding a book: switching between existing books with
+FFDB.bindDatabase, and creating a new book with System.new.
+
+    python scripts/bench_bind.py [binds]
+"""
+
+import datetime
+import pathlib
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent.absolute()))
+
+from simpleaccounting.ffdb import FFDB
+from simpleaccounting.app.system import System
+
+
+def report(label: str, samples: list[float]):
+    samples = sorted(samples)
+    print(f"{label:<28}median {statistics.median(samples) * 1000:8.2f} ms"
+          f"   max {samples[-1] * 1000:8.2f} ms   ({len(samples)} runs)")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    directory = pathlib.Path(tempfile.mkdtemp())
+
+    samples = []
+    for i in range(max(n // 10, 3)):
+        t = time.perf_counter()
+        System.new(directory / f"book{i}.db", '一般企业会计准则（2018）', datetime.date(2024, 1, 1))
+        samples.append(time.perf_counter() - t)
+    # 1for
+    report('System.new', samples)
+
+    books = sorted(directory.glob('*.db'))
+    samples = []
+    for i in range(n):
+        t = time.perf_counter()
+        FFDB.bindDatabase(books[i % len(books)])
+        samples.append(time.perf_counter() - t)
+    # 1for
+    report('FFDB.bindDatabase', samples)
+
+    samples = []
+    for i in range(n):
+        t = time.perf_counter()
+        FFDB.bindDatabase(books[i % len(books)])
+        System.meta()
+        samples.append(time.perf_counter() - t)
+    # 1for
+    report('bind + first query', samples)
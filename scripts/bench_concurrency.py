@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+
+"""
+    Copyright 2024- ZiJian Jiang @ https://github.com/CallmeNezha
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+"""
+Writer threads saving vouchers while reader threads report the total of the two
+balances every voucher moves, which is 0 in every state of the book. Run once
+with the reports read through System.consistentRead and once with plain reads.
+
+    python scripts/bench_concurrency.py [vouchers per writer] [writers] [readers]
+"""
+
+import concurrent.futures
+import datetime
+import pathlib
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent.absolute()))
+
+from simpleaccounting.ffdb import FFDB
+from simpleaccounting.app import system
+from simpleaccounting.app.system import System, VoucherEntry
+
+UNTIL = datetime.date(2024, 12, 31)
+
+
+def total() -> float:
+    """The balances of 1122 and 1001 added up, read apart from each other"""
+    return (System.endingBalance('1122', UNTIL)[1] + System.endingBalance('1001', UNTIL)[1]).value
+
+
+def run(directory: pathlib.Path, consistent: bool, n: int, writers: int, readers: int):
+    System.new(directory / f"{'consistent' if consistent else 'plain'}.db", '一般企业会计准则（2018）',
+               datetime.date(2024, 1, 1))
+    System.setAccountCurrency('1122', '人民币')
+    System.setAccountCurrency('1001', '人民币')
+    done = threading.Event()
+    totals = []
+
+    def write(worker: int):
+        try:
+            for i in range(n):
+                number = f"2024-01/{worker}-{i:05d}"
+                System.createVoucher(number, datetime.date(2024, 1, 1) + datetime.timedelta(days=i % 365))
+                System.updateDebitCreditEntries(number,
+                    [VoucherEntry(account_code='1122', amount=1.0 + i, currency='人民币', exchange_rate=1.0)],
+                    [VoucherEntry(account_code='1001', amount=1.0 + i, currency='人民币', exchange_rate=1.0)])
+            # 1for
+        finally:
+            FFDB.db.disconnect()
+
+    def read():
+        try:
+            while not done.is_set():
+                totals.append(System.consistentRead(total) if consistent else total())
+            # 1while
+        finally:
+            FFDB.db.disconnect()
+
+    t = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(writers + readers) as pool:
+        reading = [pool.submit(read) for _ in range(readers)]
+        for future in [pool.submit(write, w) for w in range(writers)]:
+            future.result()
+        # 1for
+        seconds = time.perf_counter() - t
+        done.set()
+        for future in reading:
+            future.result()
+        # 1for
+    # !with
+    unbalanced = sum(1 for x in totals if x != 0.0)
+    print(f"{'consistentRead' if consistent else 'plain reads':<16}"
+          f"{writers * n / seconds:8.0f} saves/s {len(totals) / seconds:8.0f} reports/s"
+          f"   {unbalanced} of {len(totals)} reports unbalanced")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    writers = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    readers = int(sys.argv[3]) if len(sys.argv) > 3 else 2
+    directory = pathlib.Path(tempfile.mkdtemp())
+    system.TEMPLATE_DIR = directory / 'templates'
+
+    print(f"{writers} writers of {n} vouchers, {readers} readers")
+    run(directory, True, n, writers, readers)
+    run(directory, False, n, writers, readers)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+
+"""
+    Copyright 2024- ZiJian Jiang @ https://github.com/CallmeNezha
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+"""
+Voucher queries through Pony lambdas against the typed queries of System, on a
+book of a year of vouchers. The lambdas capture fresh dates on every call the
+way the widgets did.
+
+    python scripts/bench_queries.py [vouchers] [runs]
+"""
+
+import datetime
+import pathlib
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent.absolute()))
+
+from simpleaccounting.ffdb import FFDB
+from simpleaccounting.app.system import System, VoucherEntry, VoucherHeader
+from simpleaccounting.tools.dateutil import first_day_of_month, last_day_of_month
+
+
+def report(label: str, samples: list[float]):
+    samples = sorted(samples)
+    print(f"{label:<44}median {statistics.median(samples) * 1000:8.3f} ms"
+          f"   max {samples[-1] * 1000:8.3f} ms   ({len(samples)} runs)")
+
+
+def measure(label: str, query, runs: int):
+    samples = []
+    for i in range(runs):
+        month = datetime.date(2024, i % 12 + 1, 1)
+        t = time.perf_counter()
+        query(month)
+        samples.append(time.perf_counter() - t)
+    # 1for
+    report(label, samples)
+
+
+def lambda_headers(month: datetime.date) -> list[VoucherHeader]:
+    date_from, date_until = first_day_of_month(month), last_day_of_month(month)
+    with FFDB.db_session:
+        query = FFDB.db.Voucher.select(lambda v: v.date >= date_from and v.date <= date_until)
+        return [VoucherHeader(v) for v in query.order_by(FFDB.db.Voucher.number)]
+
+
+def lambda_counts(month: datetime.date) -> dict[str, int]:
+    date_from, date_until = first_day_of_month(month), last_day_of_month(month)
+    counts = {}
+    for category in ('记账', '汇兑损益结转', '月末结转', '年末结转'):
+        counts[category] = len(System.vouchers(
+            lambda v: v.date >= date_from and v.date <= date_until and v.category == category))
+    # 1for
+    return counts
+
+
+def lambda_translation(month: datetime.date):
+    """Translation only, the query is built but not run"""
+    date_from, date_until = first_day_of_month(month), last_day_of_month(month)
+    with FFDB.db_session:
+        FFDB.db.Voucher.select(lambda v: v.date >= date_from and v.date <= date_until).get_sql()
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1200
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+    directory = pathlib.Path(tempfile.mkdtemp())
+
+    System.new(directory / 'bench.db', '一般企业会计准则（2018）', datetime.date(2024, 1, 1))
+    System.setAccountCurrency('1122', '人民币')
+    System.setAccountCurrency('1001', '人民币')
+    for i in range(n):
+        date = datetime.date(2024, 1, 1) + datetime.timedelta(days=i * 365 // n)
+        number = f"{date:%Y-%m}/{i:05d}"
+        System.createVoucher(number, date)
+        System.updateDebitCreditEntries(number,
+            [VoucherEntry(account_code='1122', amount=1.0 + i, currency='人民币', exchange_rate=1.0)],
+            [VoucherEntry(account_code='1001', amount=1.0 + i, currency='人民币', exchange_rate=1.0)])
+    # 1for
+    print(f"{n} vouchers")
+
+    measure('lambda translation (get_sql)', lambda_translation, runs)
+    measure('headers of a month, lambda', lambda_headers, runs)
+    measure('headers of a month, voucherHeadersOfMonth', System.voucherHeadersOfMonth, runs)
+    measure('counts of a month, System.vouchers', lambda_counts, runs)
+    measure('counts of a month, voucherCounts',
+            lambda month: System.voucherCounts(first_day_of_month(month), last_day_of_month(month)), runs)
+    measure('headers of 1122 in a month',
+            lambda month: System.voucherHeadersOfAccount('1122', first_day_of_month(month), last_day_of_month(month)),
+            runs)
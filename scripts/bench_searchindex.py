@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+
+"""
+    Copyright 2024- ZiJian Jiang @ https://github.com/CallmeNezha
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+"""
+Compares stringscores.findMatchingChoices with SearchIndex while a query is typed
+one character at a time over 10k account like choices.
+
+    python scripts/bench_searchindex.py [choices] [query]
+"""
+
+import pathlib
+import random
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent.absolute()))
+
+from simpleaccounting.tools import stringscores
+from simpleaccounting.tools.searchindex import SearchIndex
+
+WORDS = ['bank', 'cash', 'deposit', 'receivable', 'payable', 'inventory', 'asset', 'tax', 'salary',
+         'revenue', 'cost', 'expense', 'interest', 'loan', 'equity', 'profit', 'reserve', 'goods']
+NAMES = ['银行存款', '库存现金', '应收账款', '应付账款', '原材料', '固定资产', '应交税费', '应付职工薪酬',
+         '主营业务收入', '管理费用', '财务费用', '短期借款', '实收资本', '本年利润', '盈余公积']
+
+
+def make_choices(n: int, seed: int = 0) -> list[str]:
+    rnd = random.Random(seed)
+    choices = []
+    for i in range(n):
+        code = f"{rnd.randint(1001, 6901)}.{rnd.randint(1, 99):02d}.{i:05d}"
+        name = rnd.choice(NAMES) + ' ' + ' '.join(rnd.sample(WORDS, 2))
+        choices.append(f"{code} {name}")
+    # 1for
+    return choices
+
+
+def bench(label: str, search, query: str, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        t = time.perf_counter()
+        for i in range(1, len(query) + 1):
+            search(query[:i])
+        best = min(best, time.perf_counter() - t)
+    # 1for
+    print(f"{label:<28}{best * 1000 / len(query):10.2f} ms / keystroke")
+    return best
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    query = sys.argv[2] if len(sys.argv) > 2 else 'bankdeposit'
+    choices = make_choices(n)
+    print(f"{n} choices, typing {query!r}")
+
+    t = time.perf_counter()
+    index = SearchIndex(choices)
+    print(f"{'SearchIndex build':<28}{(time.perf_counter() - t) * 1000:10.2f} ms")
+
+    expected = stringscores.findMatchingChoices(query, choices, template='<b>{0}</b>', valid_only=True, sort=True)
+    actual = index.search(query, template='<b>{0}</b>')
+    assert [(r.choice, r.enriched, r.score) for r in actual] == expected
+
+    before = bench('findMatchingChoices', lambda q: stringscores.findMatchingChoices(
+        q, choices, template='<b>{0}</b>', valid_only=True, sort=True), query)
+    after = bench('SearchIndex.search', lambda q: index.search(q, template='<b>{0}</b>'), query)
+    print(f"speedup {before / after:.1f}x")
@@ -18,7 +18,8 @@ import pathlib
 from qtpy import QtWidgets, QtGui, QtCore
 from simpleaccounting.widgets.login import LoginDialog
 from simpleaccounting.widgets.mainwindow import MainWindow
-from simpleaccounting import resource # noqa
+from simpleaccounting.app.system import System
+from simpleaccounting.app import startuptrace
 
 
 class Application(QtWidgets.QApplication):
@@ -27,16 +28,25 @@ class Application(QtWidgets.QApplication):
         super().__init__(*args, **kwargs)
         self.setQuitOnLastWindowClosed(True)
         self.setApplicationName("简单记账")
+        self.aboutToQuit.connect(System.flushMRUAccounts)
+        with startuptrace.phase('resources'):
+            from simpleaccounting import resource # noqa
         self.setupUI()
 
     def setupUI(self):
         self.setWindowIcon(QtGui.QIcon(':/icons/accounting-calculator.png'))
+        startuptrace.begin('login')
         self.dialog_login = LoginDialog()
         self.dialog_login.sigLoginRequest.connect(self.login)
         self.dialog_login.exec_()
 
-    def login(self):
+    def login(self, filename: pathlib.Path):
         self.dialog_login.hide()
+        startuptrace.end('login')
+        with startuptrace.phase('db bind'):
+            System.bindDatabase(filename)
         # BulletinBoardDialog().exec_()
-        self.main_window = MainWindow()
+        with startuptrace.phase('main window'):
+            self.main_window = MainWindow()
+        startuptrace.begin('first paint')
         self.main_window.show()
@@ -0,0 +1,216 @@
+"""
+    Copyright 2024- ZiJian Jiang @ https://github.com/CallmeNezha
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+import contextlib
+import datetime
+import threading
+import typing
+
+from decimal import Decimal, ROUND_HALF_UP
+
+
+def cents(amount: float, exchange_rate: float = 1.0) -> tuple[int, bool]:
+    """
+    ``amount`` times ``exchange_rate`` rounded the way FloatWithPrecision rounds
+    it, in cents, and whether it was a whole number of cents before rounding
+    """
+    value = Decimal(str(amount)) * Decimal(str(exchange_rate)) * 100
+    rounded = value.quantize(Decimal(1), rounding=ROUND_HALF_UP)
+    return int(rounded), rounded == value
+
+
+class Posting(typing.NamedTuple):
+    """One voucher entry as it counts towards the balances of its leaf account, in cents"""
+    account: str
+    date: datetime.date
+    debit: int              # in the account currency, 0 for entries in another currency
+    credit: int
+    debit_local: int
+    credit_local: int
+    exact: bool = True      # False when an amount has a fraction of a cent, see AccountBalances
+
+
+class FenwickTree:
+    """Prefix sums of integers, O(log n) to update a position or to sum a prefix"""
+
+    def __init__(self, values: list[int]):
+        self._tree = list(values)
+        n = len(self._tree)
+        for i in range(n):
+            j = i | (i + 1)
+            if j < n:
+                self._tree[j] += self._tree[i]
+        # 1for
+
+    def __len__(self) -> int:
+        return len(self._tree)
+
+    def add(self, i: int, delta: int):
+        n = len(self._tree)
+        while i < n:
+            self._tree[i] += delta
+            i |= i + 1
+        # 1while
+
+    def prefix(self, i: int) -> int:
+        """The sum of positions [0, i]"""
+        i = min(i, len(self._tree) - 1)
+        total = 0
+        while i >= 0:
+            total += self._tree[i]
+            i = (i & (i + 1)) - 1
+        # 1while
+        return total
+
+
+class AccountBalances:
+    """
+    Cumulative debit and credit cents of one leaf account by day. A tree per
+    Posting column covers the days from the first posting on, with room to grow;
+    a posting outside of it rebuilds the trees.
+
+    The balances of an account having postings that are not whole cents are not
+    answered from the trees: FloatWithPrecision rounds a running total after
+    every entry, which no sum of rounded entries reproduces.
+    """
+
+    def __init__(self, postings: typing.Iterable[Posting] = ()):
+        self._days: dict[int, list[int]] = {}     # day ordinal -> debit, credit, debit_local, credit_local
+        self.inexact = 0                           # number of postings not exact
+        for posting in postings:
+            self._accumulate(posting, 1)
+        # 1for
+        self._build()
+
+    def _accumulate(self, posting: Posting, sign: int):
+        if not posting.exact:
+            self.inexact += sign
+        day = self._days.setdefault(posting.date.toordinal(), [0, 0, 0, 0])
+        for k, value in enumerate(posting[2:6]):
+            day[k] += sign * value
+        # 1for
+
+    def _build(self):
+        days = self._days or {datetime.date.today().toordinal(): [0, 0, 0, 0]}
+        first, last = min(days), max(days)
+        # a year back and twice the span ahead, so that new vouchers rarely rebuild
+        self._origin = first - 366
+        size = (last - self._origin + 1) * 2
+        columns = [[0] * size for _ in range(4)]
+        for day, values in self._days.items():
+            for k in range(4):
+                columns[k][day - self._origin] = values[k]
+        # 1for
+        self._trees = [FenwickTree(column) for column in columns]
+
+    def add(self, posting: Posting, sign: int = 1):
+        """Adds the posting, or takes it back with ``sign`` -1"""
+        self._accumulate(posting, sign)
+        i = posting.date.toordinal() - self._origin
+        if not 0 <= i < len(self._trees[0]):
+            self._build()
+            return
+        for tree, value in zip(self._trees, posting[2:6]):
+            if value:
+                tree.add(i, sign * value)
+        # 1for
+
+    def until(self, date: datetime.date) -> tuple[int, int, int, int]:
+        """Debit, credit, debit_local and credit_local summed over the postings dated up to ``date``"""
+        i = date.toordinal() - self._origin
+        return tuple(tree.prefix(i) for tree in self._trees)
+
+
+class BalanceWrite:
+    """The postings a write takes back and adds, applied once it is committed"""
+
+    def __init__(self):
+        self.changes: list[tuple[int, Posting]] = []
+
+    def remove(self, postings: typing.Iterable[Posting]):
+        self.changes.extend((-1, p) for p in postings)
+
+    def add(self, postings: typing.Iterable[Posting]):
+        self.changes.extend((1, p) for p in postings)
+
+
+class BalanceIndex:
+    """
+    The balances of the leaf accounts by day, built per account on first use from
+    its postings and then kept up to date by the writes.
+
+    An account built while a write is in flight is used once but not kept, it may
+    have read the book before or after the write committed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._accounts: dict[str, AccountBalances] = {}
+        self._epoch = 0             # number of writes and drops so far
+        self._writers = 0           # writes not applied yet
+
+    def query(self, code: str, dates: typing.Iterable[datetime.date],
+              load: typing.Callable[[], typing.Iterable[Posting]]) -> typing.Optional[list[tuple[int, int, int, int]]]:
+        """
+        :meth:`AccountBalances.until` of ``code`` at every one of ``dates``,
+        ``load`` returns the postings of the account when it is not built yet.
+        None when the account has postings that are not whole cents.
+        """
+        with self._lock:
+            balances = self._accounts.get(code)
+            if balances is not None:
+                return None if balances.inexact else [balances.until(date) for date in dates]
+            epoch = self._epoch
+        # !with
+        balances = AccountBalances(load())
+        with self._lock:
+            if epoch == self._epoch and self._writers == 0:
+                self._accounts[code] = balances
+            return None if balances.inexact else [balances.until(date) for date in dates]
+
+    @contextlib.contextmanager
+    def writing(self):
+        """
+        Brackets a write of the book, the postings recorded on the yielded
+        :class:`BalanceWrite` are applied when the block exits without an error
+        """
+        write = BalanceWrite()
+        with self._lock:
+            self._writers += 1
+            self._epoch += 1
+        try:
+            yield write
+            with self._lock:
+                for sign, posting in write.changes:
+                    if (balances := self._accounts.get(posting.account)) is not None:
+                        balances.add(posting, sign)
+                # 1for
+        finally:
+            with self._lock:
+                self._writers -= 1
+                self._epoch += 1
+
+    def drop(self, code: str = None):
+        """Forgets the account ``code``, or every account, it is built again on next use"""
+        with self._lock:
+            if code is None:
+                self._accounts.clear()
+            else:
+                self._accounts.pop(code, None)
+            self._epoch += 1
+
+    def __len__(self) -> int:
+        return len(self._accounts)
@@ -0,0 +1,135 @@
+"""
+    Copyright 2024- ZiJian Jiang @ https://github.com/CallmeNezha
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+import contextlib
+import datetime
+import functools
+import pathlib
+import threading
+import typing
+
+from pony.orm import Database
+
+from simpleaccounting.ffdb import ACTIVE_BOOK
+from simpleaccounting.app.system import System, BookState
+
+
+class Book:
+    """
+    A handle on one open book: its own database and the caches System keeps for it.
+
+    Every public operation of System is available as a method running against this
+    book, e.g. ``book.accounts()`` or ``book.createVoucher(...)``, whatever book the
+    static System API is bound to. Books are independent of each other and of the
+    default book, several can be open at once and queried from different threads.
+
+    The methods activate the book in the calling context only. Work System hands
+    over to other threads, e.g. prefetching, still runs against the default book.
+    """
+
+    def __init__(self):
+        self.db: typing.Optional[Database] = None
+        self.state = BookState()
+
+    @staticmethod
+    def open(filename: pathlib.Path) -> 'Book':
+        book = Book()
+        book.bindDatabase(filename)
+        return book
+
+    @staticmethod
+    def create(filename: pathlib.Path,
+               standard: typing.Literal['一般企业会计准则（2018）', '小企业会计准则（2013）'],
+               month: datetime.date) -> 'Book':
+        book = Book()
+        book.new(filename, standard, month)
+        return book
+
+    @property
+    def filename(self) -> typing.Optional[pathlib.Path]:
+        return pathlib.Path(self.db.provider.pool.filename) if self.db is not None else None
+
+    @contextlib.contextmanager
+    def activate(self):
+        """Makes the static System API and ``FFDB.db`` use this book within the block"""
+        token = ACTIVE_BOOK.set(self)
+        try:
+            yield self
+        finally:
+            ACTIVE_BOOK.reset(token)
+
+    def close(self):
+        """Writes back the pending MRU hits and closes the connection of the calling thread"""
+        if self.db is None:
+            return
+        with self.activate():
+            System.flushMRUAccounts()
+        self.db.disconnect()
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        func = getattr(System, name)
+        if not callable(func):
+            return func
+
+        @functools.wraps(func)
+        def bound(*args, **kwargs):
+            with self.activate():
+                return func(*args, **kwargs)
+        return bound
+
+    def __repr__(self):
+        return f"Book({str(self.filename)!r})"
+
+
+class BookRegistry:
+    """The open books by file name, opening a file again returns its open handle"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._books: dict[pathlib.Path, Book] = {}
+
+    def __len__(self) -> int:
+        return len(self._books)
+
+    def __iter__(self) -> typing.Iterator[Book]:
+        return iter(list(self._books.values()))
+
+    def __contains__(self, filename: pathlib.Path) -> bool:
+        return pathlib.Path(filename).absolute() in self._books
+
+    def get(self, filename: pathlib.Path) -> typing.Optional[Book]:
+        return self._books.get(pathlib.Path(filename).absolute())
+
+    def open(self, filename: pathlib.Path) -> Book:
+        filename = pathlib.Path(filename).absolute()
+        with self._lock:
+            if (book := self._books.get(filename)) is None:
+                book = self._books[filename] = Book.open(filename)
+        return book
+
+    def close(self, filename: pathlib.Path):
+        with self._lock:
+            book = self._books.pop(pathlib.Path(filename).absolute(), None)
+        if book is not None:
+            book.close()
+
+    def closeAll(self):
+        with self._lock:
+            books, self._books = list(self._books.values()), {}
+        for book in books:
+            book.close()
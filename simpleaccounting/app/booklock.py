@@ -0,0 +1,74 @@
+"""
+    Copyright 2024- ZiJian Jiang @ https://github.com/CallmeNezha
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+import contextlib
+import threading
+import typing
+
+T = typing.TypeVar('T')
+
+
+class BookLock:
+    """
+    Serializes the writers of one book and lets readers run beside them, a
+    sequence lock: the sequence is odd while a write runs and grows by two with
+    every write. A reader that saw the same even sequence before and after it ran
+    did not overlap any write, otherwise it runs again.
+
+    Writes may nest on the thread holding the lock, only the outermost one counts.
+    """
+
+    def __init__(self, retries: int = 3):
+        self.retries = retries
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._sequence = 0
+
+    @property
+    def sequence(self) -> int:
+        return self._sequence
+
+    @contextlib.contextmanager
+    def writing(self):
+        with self._lock:
+            self._depth += 1
+            if self._depth == 1:
+                self._sequence += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._sequence += 1
+
+    def read(self, func: typing.Callable[[], T]) -> T:
+        """
+        The result of ``func`` computed while no write ran. After ``retries``
+        overlapping writes ``func`` runs once more with the writers held off.
+        """
+        for _ in range(self.retries):
+            sequence = self._sequence
+            if sequence % 2 == 0:
+                result = func()
+                if self._sequence == sequence:
+                    return result
+            else:
+                # wait for the running write, the thread holding the lock passes
+                with self._lock:
+                    pass
+        # 1for
+        with self._lock:
+            return func()
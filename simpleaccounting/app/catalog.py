@@ -0,0 +1,87 @@
+"""
+    Copyright 2024- ZiJian Jiang @ https://github.com/CallmeNezha
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+import datetime
+import pathlib
+import sqlite3
+import typing
+
+
+class BookInfo(typing.NamedTuple):
+    filename: pathlib.Path
+    version: str
+    standard: str
+    company: str
+    month_from: datetime.date
+    month_until: datetime.date
+
+
+def read_book_info(filename: pathlib.Path) -> typing.Optional[BookInfo]:
+    """
+    The Meta row of the book ``filename`` read with a plain read-only sqlite
+    connection, without binding the book. None if it is not a readable book.
+    """
+    filename = pathlib.Path(filename)
+    try:
+        connection = sqlite3.connect(f"{filename.absolute().as_uri()}?mode=ro", uri=True)
+    except sqlite3.Error:
+        return None
+    try:
+        row = connection.execute(
+            "SELECT version, standard, company, month_from, month_until FROM Meta LIMIT 1").fetchone()
+        if row is None:
+            return None
+        version, standard, company, month_from, month_until = row
+        return BookInfo(filename, version, standard, company,
+                        datetime.date.fromisoformat(month_from), datetime.date.fromisoformat(month_until))
+    except (sqlite3.Error, TypeError, ValueError):
+        return None
+    finally:
+        connection.close()
+
+
+class BookCatalog:
+    """
+    The books of a directory with their Meta, for choosing a book before binding
+    it. Infos are read once per file and read again when the file changed.
+    """
+
+    def __init__(self, directory: pathlib.Path):
+        self.directory = pathlib.Path(directory)
+        self._infos: dict[pathlib.Path, tuple[tuple, typing.Optional[BookInfo]]] = {}
+
+    def books(self) -> list[str]:
+        """File names of the books in the directory, sorted"""
+        return sorted(p.name for p in self.directory.glob('*.db') if p.is_file())
+
+    def info(self, name: str) -> typing.Optional[BookInfo]:
+        filename = self.directory / name
+        try:
+            stat = filename.stat()
+        except OSError:
+            self._infos.pop(filename, None)
+            return None
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        # a book in WAL mode is written to its -wal file until a checkpoint
+        try:
+            wal = filename.with_name(filename.name + '-wal').stat()
+            stamp += (wal.st_mtime_ns, wal.st_size)
+        except OSError:
+            pass
+        cached = self._infos.get(filename)
+        if cached is None or cached[0] != stamp:
+            cached = self._infos[filename] = (stamp, read_book_info(filename))
+        return cached[1]
@@ -0,0 +1,263 @@
+"""
+    Copyright 2024- ZiJian Jiang @ https://github.com/CallmeNezha
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+"""
+Command line for batch reporting without Qt, e.g. from cron:
+
+    python -m simpleaccounting trial-balance 公司.db --month 2024-03 -o tb.csv
+    python -m simpleaccounting ledger 公司.db 1002 --from 2024-01-01 --until 2024-03-31
+    python -m simpleaccounting balance-sheet 公司.db --month 2024-03
+    python -m simpleaccounting close 公司.db --month 2024-03 --forward
+    python -m simpleaccounting export 公司.db reports/
+    python -m simpleaccounting consolidate --month 2024-03
+
+A book is a path, or the name of a book in SIMPLEACCOUNTING_DIR. Reports are
+written as CSV, to stdout or to ``--output``. The ORM is only imported once the
+arguments are parsed, the exit status is 0 on success and 1 on error.
+"""
+
+import argparse
+import contextlib
+import csv
+import datetime
+import pathlib
+import sys
+import typing
+
+from simpleaccounting.tools.dateutil import first_day_of_month, last_day_of_month, last_day_of_year
+
+TRIAL_BALANCE_HEADER = ['代码', '科目', '方向', '期初余额', '本期借方', '本期贷方', '期末余额']
+LEDGER_HEADER = ['日期', '凭证号', '摘要', '科目', '币种', '汇率', '借方', '贷方', '借方（本位币）', '贷方（本位币）', '余额']
+BALANCE_SHEET_HEADER = ['类别', '项目', '行次', '年初余额', '期末余额']
+
+
+class CommandError(Exception):
+    pass
+
+
+def parse_month(text: str) -> datetime.date:
+    try:
+        return datetime.datetime.strptime(text, '%Y-%m').date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a month YYYY-MM: {text}")
+
+
+def parse_date(text: str) -> datetime.date:
+    try:
+        return datetime.date.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a date YYYY-MM-DD: {text}")
+
+
+def amount(value) -> str:
+    return '' if value is None else f"{float(getattr(value, 'value', value)):.2f}"
+
+
+def book_path(name: str) -> pathlib.Path:
+    """``name`` as a path, else as a book of SIMPLEACCOUNTING_DIR"""
+    path = pathlib.Path(name)
+    if path.is_file():
+        return path
+    from simpleaccounting.app.iniconfig import SIMPLEACCOUNTING_DIR
+    for candidate in (pathlib.Path(SIMPLEACCOUNTING_DIR) / name, pathlib.Path(SIMPLEACCOUNTING_DIR) / f"{name}.db"):
+        if candidate.is_file():
+            return candidate
+    # 1for
+    raise CommandError(f"book not found: {name}")
+
+
+def open_book(name: str):
+    from simpleaccounting.app.system import System
+    System.bindDatabase(book_path(name))
+    return System
+
+
+@contextlib.contextmanager
+def output(filename: typing.Optional[str]):
+    if filename is None:
+        yield sys.stdout
+    else:
+        # with a BOM, spreadsheet programs then read the file as utf-8
+        with open(filename, 'w', encoding='utf-8-sig', newline='') as f:
+            yield f
+
+
+def write_csv(filename: typing.Optional[str], header: list[str], rows: typing.Iterable[typing.Iterable]):
+    with output(filename) as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def report_month(system, month: typing.Optional[datetime.date]) -> datetime.date:
+    return first_day_of_month(month) if month is not None else system.meta().month_until
+
+
+def trial_balance_csv_rows(system, month: datetime.date) -> list[list[str]]:
+    from simpleaccounting.app.consolidation import trial_balance_rows
+    return [[r.code, r.qualname, r.direction, *map(amount, r.balances)]
+            for r in trial_balance_rows(system, first_day_of_month(month), last_day_of_month(month))]
+
+
+def balance_sheet_csv_rows(system, template: str, month: datetime.date) -> list[list[str]]:
+    from simpleaccounting.app.consolidation import balance_sheet_rows
+    return [[r.category, r.item, '' if r.line_number is None else r.line_number, amount(r.beginning), amount(r.ending)]
+            for r in balance_sheet_rows(system, template, last_day_of_month(month))]
+
+
+def cmd_trial_balance(args):
+    system = open_book(args.book)
+    write_csv(args.output, TRIAL_BALANCE_HEADER, trial_balance_csv_rows(system, report_month(system, args.month)))
+
+
+def cmd_ledger(args):
+    system = open_book(args.book)
+    if system.account(args.account) is None:
+        raise CommandError(f"account not found: {args.account}")
+    month = system.meta().month_until
+    date_from = args.date_from or first_day_of_month(month)
+    date_until = args.date_until or last_day_of_month(month)
+    opening_balance, entries = system.ledgerEntries(args.account, date_from, date_until)
+    rows = [['', '', '期初余额', '', '', '', '', '', '', '', amount(opening_balance)]]
+    for e in entries:
+        rows.append([e.date.isoformat(), e.voucher_number, e.brief, e.account, e.currency, e.exchange_rate,
+                     amount(e.debit_amount), amount(e.credit_amount),
+                     amount(e.debit_local_amount), amount(e.credit_local_amount), amount(e.balance)])
+    # 1for
+    write_csv(args.output, LEDGER_HEADER, rows)
+
+
+def cmd_balance_sheet(args):
+    system = open_book(args.book)
+    write_csv(args.output, BALANCE_SHEET_HEADER,
+              balance_sheet_csv_rows(system, args.template, report_month(system, args.month)))
+
+
+def post_voucher(system, number: str, date: datetime.date, category: str, entries) -> bool:
+    """Creates or replaces the carry forward voucher ``number``, False if there is nothing to carry forward"""
+    from simpleaccounting.app.system import EntryNotFound
+    debit_entries, credit_entries = entries
+    if not (debit_entries and credit_entries):
+        return False
+    try:
+        system.voucher(number)
+    except EntryNotFound:
+        system.createVoucher(number, date, category=category)
+    system.updateDebitCreditEntries(number, debit_entries, credit_entries)
+    return True
+
+
+def cmd_close(args):
+    """Posts the carry forward vouchers of the month the way the voucher windows do, then forwards if asked"""
+    system = open_book(args.book)
+    month = report_month(system, args.month)
+    if args.forward and month != system.meta().month_until:
+        raise CommandError(f"{month:%Y-%m} is not the current month {system.meta().month_until:%Y-%m}")
+    posted = []
+    # exchange gains and losses first, they are carried forward at month end
+    if post_voucher(system, month.strftime('%Y-%m/EGLCF'), last_day_of_month(month), '汇兑损益结转',
+                    system.previewExchangeGainsAndLosses(month)):
+        posted.append(month.strftime('%Y-%m/EGLCF'))
+    if post_voucher(system, month.strftime('%Y-%m/MECF'), last_day_of_month(month), '月末结转',
+                    system.previewMonthEndCarryForwardVoucherEntries(month)):
+        posted.append(month.strftime('%Y-%m/MECF'))
+    if month.month == 12 and post_voucher(system, month.strftime('%Y-XX/YECF'), last_day_of_year(month), '年末结转',
+                                          system.previewYearEndCarryForwardVoucherEntries(month)):
+        posted.append(month.strftime('%Y-XX/YECF'))
+    for number in posted:
+        print(f"posted {number}")
+    if args.forward:
+        system.forwardToNextMonth()
+        print(f"forwarded to {system.meta().month_until:%Y-%m}")
+
+
+def cmd_export(args):
+    system = open_book(args.book)
+    month = report_month(system, args.month)
+    directory = pathlib.Path(args.directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    stem = book_path(args.book).stem
+    files = {
+        directory / f"{stem}_trial_balance_{month:%Y-%m}.csv": (TRIAL_BALANCE_HEADER,
+                                                                 trial_balance_csv_rows(system, month)),
+        directory / f"{stem}_balance_sheet_{month:%Y-%m}.csv": (BALANCE_SHEET_HEADER,
+                                                                balance_sheet_csv_rows(system, args.template, month)),
+    }
+    for filename, (header, rows) in files.items():
+        write_csv(str(filename), header, rows)
+        print(filename)
+    # 1for
+
+
+def cmd_consolidate(args):
+    from simpleaccounting.app import consolidation
+    consolidation.main(args.rest)
+
+
+def parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(prog='python -m simpleaccounting', description='简单记账命令行')
+    commands = p.add_subparsers(dest='command', required=True)
+
+    def command(name: str, func, help: str, book: bool = True, **kwargs) -> argparse.ArgumentParser:
+        c = commands.add_parser(name, help=help, description=help, **kwargs)
+        c.set_defaults(func=func)
+        if book:
+            c.add_argument('book', help='账套文件，或账套目录中的账套名')
+        return c
+
+    c = command('trial-balance', cmd_trial_balance, '试算平衡表')
+    c.add_argument('--month', type=parse_month, help='月份 YYYY-MM，默认为当前月份')
+    c.add_argument('-o', '--output', help='输出的 CSV 文件，默认为标准输出')
+    c = command('ledger', cmd_ledger, '明细账')
+    c.add_argument('account', help='科目代码')
+    c.add_argument('--from', dest='date_from', type=parse_date, help='起始日期 YYYY-MM-DD，默认为当前月份第一天')
+    c.add_argument('--until', dest='date_until', type=parse_date, help='截止日期 YYYY-MM-DD，默认为当前月份最后一天')
+    c.add_argument('-o', '--output', help='输出的 CSV 文件，默认为标准输出')
+    c = command('balance-sheet', cmd_balance_sheet, '资产负债表')
+    c.add_argument('--month', type=parse_month, help='月份 YYYY-MM，默认为当前月份')
+    c.add_argument('--template', default='默认', help='资产负债表模板')
+    c.add_argument('-o', '--output', help='输出的 CSV 文件，默认为标准输出')
+    c = command('close', cmd_close, '期末结账：汇兑损益、月末及年末结转凭证')
+    c.add_argument('--month', type=parse_month, help='月份 YYYY-MM，默认为当前月份')
+    c.add_argument('--forward', action='store_true', help='结转后进入下一个账期')
+    c = command('export', cmd_export, '导出试算平衡表与资产负债表')
+    c.add_argument('directory', help='输出目录')
+    c.add_argument('--month', type=parse_month, help='月份 YYYY-MM，默认为当前月份')
+    c.add_argument('--template', default='默认', help='资产负债表模板')
+    # the arguments of consolidate are parsed by the consolidation module, see consolidate --help
+    command('consolidate', cmd_consolidate, '合并报表', book=False, add_help=False)
+    return p
+
+
+def main(argv: list[str] = None) -> int:
+    p = parser()
+    args, rest = p.parse_known_args(argv)
+    if args.command == 'consolidate':
+        args.rest = rest
+    elif rest:
+        p.error(f"unrecognized arguments: {' '.join(rest)}")
+    try:
+        args.func(args)
+    except (CommandError, OSError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    except Exception as e:
+        from simpleaccounting.app.system import IllegalOperation
+        if not isinstance(e, IllegalOperation):
+            raise
+        print(f"error: {type(e).__name__} {e}", file=sys.stderr)
+        return 1
+    return 0
@@ -0,0 +1,222 @@
+"""
+    Copyright 2024- ZiJian Jiang @ https://github.com/CallmeNezha
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+"""
+Group consolidation: the trial balance and balance sheet of every book are
+computed in a process of their own, then added up account by account and line
+by line. Only local currency amounts are added up, the books are expected to
+share their local currency.
+
+    python -m simpleaccounting.app.consolidation [--dir DIR] [--month YYYY-MM]
+                                                [--key code|qualname] [--template NAME] [--workers N]
+"""
+
+import argparse
+import concurrent.futures
+import datetime
+import pathlib
+import time
+import traceback
+import typing
+
+from simpleaccounting.tools.dateutil import first_day_of_month, last_day_of_month
+
+# local currency balances of a trial balance row, in this order
+TRIAL_BALANCE_COLUMNS = ('期初余额', '本期借方', '本期贷方', '期末余额')
+
+
+class TrialBalanceRow(typing.NamedTuple):
+    code: str
+    qualname: str
+    direction: str
+    balances: tuple[float, float, float, float]      # see TRIAL_BALANCE_COLUMNS
+
+
+class BalanceSheetRow(typing.NamedTuple):
+    category: str
+    item: str
+    line_number: typing.Optional[int]
+    beginning: float
+    ending: float
+
+
+class BookReport(typing.NamedTuple):
+    filename: str
+    company: str
+    seconds: float                  # spent computing the book in its worker
+    trial_balance: list[TrialBalanceRow]
+    balance_sheet: list[BalanceSheetRow]
+    error: typing.Optional[str] = None
+
+
+class Consolidation(typing.NamedTuple):
+    date_from: datetime.date
+    date_until: datetime.date
+    books: list[BookReport]                 # slowest first
+    trial_balance: list[TrialBalanceRow]    # sorted by code
+    balance_sheet: list[BalanceSheetRow]    # in the order of the first book's template
+    seconds: float                          # wall time of the whole consolidation
+
+
+def trial_balance_rows(book, date_from: datetime.date, date_until: datetime.date) -> list[TrialBalanceRow]:
+    """
+    The trial balance of ``book``, a :class:`Book` or System for the default book,
+    as of one state of the book, see ``System.consistentRead``
+    """
+    def rows() -> list[TrialBalanceRow]:
+        result = []
+        for account in book.accounts():
+            (_, begin, _, debit, _, credit, _, end) = book.incurredBalances(account.code, date_from, date_until)
+            result.append(TrialBalanceRow(account.code, account.qualname, account.direction,
+                                          (begin.value, debit.value, credit.value, end.value)))
+        # 1for
+        return result
+
+    return book.consistentRead(rows)
+
+
+def balance_sheet_rows(book, template: str, date_until: datetime.date) -> list[BalanceSheetRow]:
+    """
+    The balance sheet of ``book`` at ``date_until``, a :class:`Book` or System for the
+    default book, as of one state of the book
+    """
+    bste = book.balanceSheetTemplate(template)
+    beginnings, endings = book.consistentRead(lambda: book.balanceSheet(bste, date_until))
+    return [BalanceSheetRow(e.category, e.item or '', e.line_number,
+                            beginnings[e.line_number].value if e.line_number in beginnings else 0.0,
+                            endings[e.line_number].value if e.line_number in endings else 0.0)
+            for e in bste.entries]
+
+
+def book_report(filename: str, date_from: datetime.date, date_until: datetime.date,
+                template: str = '默认') -> BookReport:
+    """The trial balance over [date_from, date_until] and the balance sheet at ``date_until`` of one book"""
+    # imported here so that the parent process does not need to load the ORM
+    from simpleaccounting.app.book import Book
+
+    t = time.perf_counter()
+    book = None
+    try:
+        book = Book.open(pathlib.Path(filename))
+        company = book.meta().company
+        trial_balance = trial_balance_rows(book, date_from, date_until)
+        balance_sheet = balance_sheet_rows(book, template, date_until)
+        return BookReport(str(filename), company, time.perf_counter() - t, trial_balance, balance_sheet)
+    except Exception:
+        return BookReport(str(filename), pathlib.Path(filename).stem, time.perf_counter() - t, [], [],
+                          traceback.format_exc())
+    finally:
+        if book is not None:
+            book.close()
+
+
+def merge_trial_balances(reports: typing.Iterable[BookReport], key: str = 'code') -> list[TrialBalanceRow]:
+    """Adds up the rows of the books having the same account ``key``, 'code' or 'qualname'"""
+    merged: dict[str, TrialBalanceRow] = {}
+    for report in reports:
+        for row in report.trial_balance:
+            k = getattr(row, key)
+            if (into := merged.get(k)) is None:
+                merged[k] = row
+            else:
+                merged[k] = into._replace(balances=tuple(a + b for a, b in zip(into.balances, row.balances)))
+        # 1for
+    # 1for
+    return sorted(merged.values(), key=lambda r: [int(s) if s.isdigit() else s for s in r.code.split('.')])
+
+
+def merge_balance_sheets(reports: typing.Iterable[BookReport]) -> list[BalanceSheetRow]:
+    """Adds up the lines of the books having the same category and item"""
+    merged: dict[tuple[str, str], BalanceSheetRow] = {}
+    for report in reports:
+        for row in report.balance_sheet:
+            if not row.item:
+                continue
+            k = (row.category, row.item)
+            if (into := merged.get(k)) is None:
+                merged[k] = row
+            else:
+                merged[k] = into._replace(beginning=into.beginning + row.beginning, ending=into.ending + row.ending)
+        # 1for
+    # 1for
+    return list(merged.values())
+
+
+def consolidate(filenames: typing.Iterable[pathlib.Path], month: datetime.date, key: str = 'code',
+                template: str = '默认', max_workers: int = None) -> Consolidation:
+    """Consolidates the books at the end of ``month``, one worker process per book at a time"""
+    t = time.perf_counter()
+    date_from, date_until = first_day_of_month(month), last_day_of_month(month)
+    filenames = [str(f) for f in filenames]
+    with concurrent.futures.ProcessPoolExecutor(max_workers) as executor:
+        futures = [executor.submit(book_report, f, date_from, date_until, template) for f in filenames]
+        reports = [future.result() for future in futures]
+    # !with
+    valid = [r for r in reports if r.error is None]
+    return Consolidation(date_from, date_until,
+                         sorted(reports, key=lambda r: r.seconds, reverse=True),
+                         merge_trial_balances(valid, key),
+                         merge_balance_sheets(valid),
+                         time.perf_counter() - t)
+
+
+def format_consolidation(consolidation: Consolidation) -> str:
+    lines = [f"合并报表 {consolidation.date_from} - {consolidation.date_until}", '', '账套用时']
+    for r in consolidation.books:
+        lines.append(f"  {r.seconds * 1000:10.1f} ms  {r.company}  {r.filename}")
+        if r.error is not None:
+            lines.append('    ' + r.error.strip().splitlines()[-1])
+    # 1for
+    lines.append(f"  {consolidation.seconds * 1000:10.1f} ms  合计")
+    lines += ['', '试算平衡表', '  ' + '\t'.join(('代码', '科目') + TRIAL_BALANCE_COLUMNS)]
+    for row in consolidation.trial_balance:
+        if any(row.balances):
+            lines.append('  ' + '\t'.join([row.code, row.qualname] + [f"{b:.2f}" for b in row.balances]))
+    # 1for
+    lines += ['', '资产负债表', '  ' + '\t'.join(('类别', '项目', '年初余额', '期末余额'))]
+    for row in consolidation.balance_sheet:
+        lines.append('  ' + '\t'.join((row.category, row.item, f"{row.beginning:.2f}", f"{row.ending:.2f}")))
+    # 1for
+    return '\n'.join(lines)
+
+
+def main(argv: list[str] = None):
+    from simpleaccounting.app.catalog import BookCatalog
+    from simpleaccounting.app.iniconfig import SIMPLEACCOUNTING_DIR
+
+    parser = argparse.ArgumentParser(prog='python -m simpleaccounting.app.consolidation',
+                                     description='合并所有账套的试算平衡表与资产负债表')
+    parser.add_argument('--dir', default=SIMPLEACCOUNTING_DIR, help='账套目录')
+    parser.add_argument('--month', help='合并月份 YYYY-MM，默认为各账套当前月份中最早的一个')
+    parser.add_argument('--key', choices=('code', 'qualname'), default='code', help='按科目代码或科目全名合并')
+    parser.add_argument('--template', default='默认', help='资产负债表模板')
+    parser.add_argument('--workers', type=int, default=None, help='进程数')
+    args = parser.parse_args(argv)
+
+    catalog = BookCatalog(pathlib.Path(args.dir))
+    infos = [info for name in catalog.books() if (info := catalog.info(name)) is not None]
+    if not infos:
+        parser.error(f"no book in {args.dir}")
+    if args.month:
+        month = datetime.datetime.strptime(args.month, '%Y-%m').date()
+    else:
+        month = min(info.month_until for info in infos)
+    print(format_consolidation(consolidate([info.filename for info in infos], month, args.key,
+                                           args.template, args.workers)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+    Copyright 2024- ZiJian Jiang @ https://github.com/CallmeNezha
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+import datetime
+import threading
+import traceback
+import typing
+
+
+# events published by System after a write succeeded
+class BookOpened(typing.NamedTuple):
+    """A book was created or bound, everything derived from the previous one is stale"""
+    filename: str
+
+
+class MonthForwarded(typing.NamedTuple):
+    month_until: datetime.date
+
+
+class AccountCreated(typing.NamedTuple):
+    code: str
+    parent_code: str
+
+
+class AccountDeleted(typing.NamedTuple):
+    code: str
+
+
+class AccountCurrencySet(typing.NamedTuple):
+    code: str
+    currency: str
+
+
+class CurrencyCreated(typing.NamedTuple):
+    name: str
+
+
+class CurrencyDeleted(typing.NamedTuple):
+    name: str
+
+
+class ExchangeRatesChanged(typing.NamedTuple):
+    currency: str
+
+
+class VoucherCreated(typing.NamedTuple):
+    number: str
+    date: datetime.date
+
+
+class VoucherChanged(typing.NamedTuple):
+    """
+    Entries or date of a voucher changed. ``accounts`` holds the codes posted to
+    before and after the change, ``dates`` the voucher dates before and after.
+    """
+    number: str
+    accounts: frozenset[str]
+    dates: frozenset[datetime.date]
+
+
+class VoucherDeleted(typing.NamedTuple):
+    number: str
+    accounts: frozenset[str]
+    dates: frozenset[datetime.date]
+
+
+class VoucherRenumbered(typing.NamedTuple):
+    old_number: str
+    new_number: str
+    date: datetime.date
+
+
+class BalanceSheetTemplateCreated(typing.NamedTuple):
+    name: str
+
+
+class BalanceSheetTemplateDeleted(typing.NamedTuple):
+    name: str
+
+
+class BalanceSheetTemplateRenamed(typing.NamedTuple):
+    old_name: str
+    new_name: str
+
+
+class BalanceSheetTemplateUpdated(typing.NamedTuple):
+    name: str
+
+
+def is_related_account(code: str, other: str) -> bool:
+    """True if one of the codes is the other or one of its ancestors"""
+    return code == other or other.startswith(code + '.') or code.startswith(other + '.')
+
+
+class EventBus:
+    """
+    Synchronous publish / subscribe of the events above.
+
+    Callbacks run on the publishing thread, in the order they subscribed. A
+    callback may be limited to some event types. An exception raised by a callback
+    is not propagated to the publisher, the write has already succeeded.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: list[tuple[typing.Callable, tuple[type, ...]]] = []
+
+    def subscribe(self, callback: typing.Callable[[typing.Any], None], *types: type):
+        with self._lock:
+            self._subscribers = self._subscribers + [(callback, types)]
+
+    def unsubscribe(self, callback: typing.Callable[[typing.Any], None]):
+        with self._lock:
+            self._subscribers = [s for s in self._subscribers if s[0] != callback]
+
+    def publish(self, event):
+        for callback, types in self._subscribers:
+            if types and not isinstance(event, types):
+                continue
+            try:
+                callback(event)
+            except Exception:
+                traceback.print_exc()
+        # 1for
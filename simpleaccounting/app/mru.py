@@ -0,0 +1,122 @@
+"""
+    Copyright 2024- ZiJian Jiang @ https://github.com/CallmeNezha
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+import heapq
+import threading
+import time
+
+from collections import defaultdict
+
+
+class MRUTracker:
+    """
+    In-memory most recently used counter.
+
+    Hits are counted in memory and ranked without touching the database, the
+    accumulated deltas are handed out by :meth:`takePending` so that they can be
+    written back in one batch.
+
+    Two rankings are supported:
+
+    - plain: by total hits, kept in a list that is re-ordered on every hit
+    - decayed: by a score that halves every ``half_life`` seconds, so that
+      accounts used recently rank above accounts used a lot long ago
+    """
+
+    def __init__(self, half_life: float = 7 * 24 * 3600.0):
+        self.half_life = half_life
+        self._lock = threading.Lock()
+        self._hits: dict[str, int] = {}                 # code -> total hits
+        self._ranking: list[str] = []                   # codes sorted by hits, descending
+        self._position: dict[str, int] = {}             # code -> index in ranking
+        self._pending: dict[str, int] = defaultdict(int)  # code -> hits not flushed yet
+        self._recency: dict[str, tuple[float, float]] = {}  # code -> (score, timestamp)
+
+    def load(self, hits: dict[str, int], now: float = None):
+        """Seed the tracker with persisted hit counts"""
+        now = time.time() if now is None else now
+        with self._lock:
+            for code, count in hits.items():
+                self._hits[code] = self._hits.get(code, 0) + count
+                score, _ = self._decayed(code, now)
+                self._recency[code] = (score + count, now)
+            # 1for
+            self._ranking = sorted(self._hits, key=lambda c: self._hits[c], reverse=True)
+            self._position = {code: i for i, code in enumerate(self._ranking)}
+
+    def hit(self, code: str, now: float = None):
+        """Record one use of ``code``"""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._pending[code] += 1
+            self._hits[code] = self._hits.get(code, 0) + 1
+            score, _ = self._decayed(code, now)
+            self._recency[code] = (score + 1.0, now)
+            #
+            if code not in self._position:
+                self._position[code] = len(self._ranking)
+                self._ranking.append(code)
+            # bubble up past the entries one hit behind, O(k) for k entries tied on hits
+            i = self._position[code]
+            while i > 0 and self._hits[self._ranking[i - 1]] < self._hits[code]:
+                other = self._ranking[i - 1]
+                self._ranking[i - 1], self._ranking[i] = code, other
+                self._position[other] = i
+                i -= 1
+            # 1while
+            self._position[code] = i
+
+    def top(self, n: int, decayed: bool = False, now: float = None) -> list[str]:
+        """Returns the ``n`` best ranked codes"""
+        with self._lock:
+            if not decayed:
+                return self._ranking[:n]
+            now = time.time() if now is None else now
+            return heapq.nlargest(n, self._recency, key=lambda c: self._decayed(c, now)[0])
+
+    def hits(self, code: str) -> int:
+        with self._lock:
+            return self._hits.get(code, 0)
+
+    def discard(self, code: str):
+        """Forget ``code``, e.g. when its account is deleted"""
+        with self._lock:
+            if code not in self._position:
+                return
+            self._ranking.remove(code)
+            self._position = {c: i for i, c in enumerate(self._ranking)}
+            self._hits.pop(code, None)
+            self._pending.pop(code, None)
+            self._recency.pop(code, None)
+
+    def takePending(self) -> dict[str, int]:
+        """Returns the hit deltas accumulated since the last call and resets them"""
+        with self._lock:
+            pending = dict(self._pending)
+            self._pending.clear()
+            return pending
+
+    def restorePending(self, pending: dict[str, int]):
+        """Puts back deltas taken by :meth:`takePending` whose write failed"""
+        with self._lock:
+            for code, count in pending.items():
+                self._pending[code] += count
+
+    def _decayed(self, code: str, now: float) -> tuple[float, float]:
+        score, timestamp = self._recency.get(code, (0.0, now))
+        if self.half_life:
+            score *= 0.5 ** (max(0.0, now - timestamp) / self.half_life)
+        return score, timestamp
@@ -0,0 +1,37 @@
+"""
+    Copyright 2024- ZiJian Jiang @ https://github.com/CallmeNezha
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from qtpy import QtCore
+
+from simpleaccounting.app.system import System
+
+
+class SystemNotifier(QtCore.QObject):
+    """
+    Re-emits the change events of System as a Qt signal. Writes made on the GUI
+    thread reach the widgets before the System call returns, writes made on other
+    threads are queued to the thread of the receiver.
+    """
+    changed = QtCore.Signal(object)
+
+    __instance: 'SystemNotifier' = None
+
+    @staticmethod
+    def instance() -> 'SystemNotifier':
+        if SystemNotifier.__instance is None:
+            SystemNotifier.__instance = SystemNotifier()
+            System.subscribe(SystemNotifier.__instance.changed.emit)
+        return SystemNotifier.__instance
@@ -0,0 +1,83 @@
+"""
+    Copyright 2024- ZiJian Jiang @ https://github.com/CallmeNezha
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+import typing
+
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class Prefetcher:
+    """
+    Small LRU of values loaded by key, with background loading of the keys
+    likely to be asked for next.
+
+    The requested key is loaded in the calling thread when it is not cached,
+    prefetched keys are loaded one at a time by a single worker thread. Meant
+    to be used from one thread, e.g. the GUI thread.
+    """
+
+    def __init__(self, loader: typing.Callable[[str], typing.Any], capacity: int = 8):
+        self.loader = loader
+        self.capacity = capacity
+        self._futures: OrderedDict[str, Future] = OrderedDict()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='prefetch')
+
+    def get(self, key: str):
+        """Returns the value of ``key``, waiting for a prefetch in flight if there is one"""
+        future = self._futures.get(key)
+        if future is None:
+            future = Future()
+            future.set_result(self.loader(key))
+            self._store(key, future)
+        else:
+            self._futures.move_to_end(key)
+        try:
+            return future.result()
+        except Exception:
+            self._futures.pop(key, None)
+            raise
+
+    def prefetch(self, *keys: str):
+        """Starts loading ``keys`` in the background, keys already cached are left alone"""
+        for key in keys:
+            if key not in self._futures:
+                self._store(key, self._executor.submit(self.loader, key))
+
+    def invalidate(self, key: str = None):
+        """Drops ``key``, or everything when no key is given"""
+        futures = list(self._futures.values()) if key is None else [self._futures.get(key)]
+        for future in futures:
+            if future is not None:
+                future.cancel()
+        # 1for
+        if key is None:
+            self._futures.clear()
+        else:
+            self._futures.pop(key, None)
+
+    def shutdown(self):
+        self.invalidate()
+        self._executor.shutdown(wait=False)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._futures
+
+    def _store(self, key: str, future: Future):
+        self._futures[key] = future
+        while len(self._futures) > self.capacity:
+            _, evicted = self._futures.popitem(last=False)
+            evicted.cancel()
@@ -0,0 +1,118 @@
+"""
+    Copyright 2024- ZiJian Jiang @ https://github.com/CallmeNezha
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+import sys
+import threading
+import typing
+
+from collections import OrderedDict
+
+
+def estimate_size(obj, _depth: int = 0) -> int:
+    """Rough number of bytes held by ``obj``, following containers and plain objects a few levels deep"""
+    size = sys.getsizeof(obj)
+    if _depth >= 4:
+        return size
+    if isinstance(obj, dict):
+        size += sum(estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, _depth + 1) for item in obj)
+    elif hasattr(obj, '__dict__'):
+        size += estimate_size(vars(obj), _depth + 1)
+    return size
+
+
+class ReportCache:
+    """
+    LRU of report results keyed by report type and parameters.
+
+    Entries stay valid until :meth:`invalidate` drops them, the owner decides which
+    keys a write affects. A result computed while an invalidation happened is
+    returned but not stored, it may have read data from before the write. The sum
+    of the estimated sizes of the entries is kept below ``max_bytes``. Safe to use
+    from report jobs running on other threads.
+    """
+    MISSING = object()
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[typing.Hashable, tuple[typing.Any, int]] = OrderedDict()  # key -> (value, size)
+        self._bytes = 0
+        self._epoch = 0                 # number of invalidations so far
+
+    def get(self, key: typing.Hashable):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return self.MISSING
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: typing.Hashable, value, size: int = None, epoch: int = None):
+        """Stores ``value``, unless ``epoch`` is given and an invalidation happened since"""
+        size = estimate_size(value) if size is None else size
+        with self._lock:
+            if epoch is not None and epoch != self._epoch:
+                return
+            if key in self._entries:
+                self._drop(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+            # 1while
+
+    def getOrCompute(self, key: typing.Hashable, compute: typing.Callable[[], typing.Any]):
+        """Returns the cached value of ``key``, computing and caching it when there is none"""
+        value = self.get(key)
+        if value is self.MISSING:
+            epoch = self.epoch
+            value = compute()
+            self.put(key, value, epoch=epoch)
+        return value
+
+    def invalidate(self, predicate: typing.Callable[[typing.Hashable], bool] = None) -> int:
+        """Drops the entries whose key matches ``predicate``, all of them without one"""
+        with self._lock:
+            self._epoch += 1
+            keys = [key for key in self._entries if predicate is None or predicate(key)]
+            for key in keys:
+                self._drop(key)
+            return len(keys)
+
+    def clear(self):
+        self.invalidate()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: typing.Hashable) -> bool:
+        return key in self._entries
+
+    @property
+    def epoch(self) -> int:
+        return self._epoch
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
+
+    def _drop(self, key):
+        _, size = self._entries.pop(key)
+        self._bytes -= size
@@ -0,0 +1,131 @@
+"""
+    Copyright 2024- ZiJian Jiang @ https://github.com/CallmeNezha
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+import threading
+import typing
+
+from qtpy import QtCore
+
+from simpleaccounting.ffdb import FFDB
+
+
+class ReportJobCancelled(Exception):
+    """Raised inside a job function to stop it once the job has been cancelled"""
+
+
+class ReportJobSignals(QtCore.QObject):
+    progress = QtCore.Signal(int, int)  # done, total
+    partial = QtCore.Signal(object)     # a chunk of the result, in the order it was computed
+    finished = QtCore.Signal(object)    # the whole result
+    failed = QtCore.Signal(object)      # the exception raised by the job function
+
+
+class ReportJob(QtCore.QRunnable):
+    """
+    Runs ``func(job)`` on a worker thread of the global QThreadPool.
+
+    ``func`` reports through :meth:`reportProgress` and :meth:`reportPartial` and
+    should call :meth:`checkCancelled` between steps. The signals are emitted from
+    the worker thread, slots of objects living in the GUI thread are therefore
+    invoked there. Nothing is emitted after the job has been cancelled.
+
+    Pony keeps one connection per thread, so the job reads through a connection of
+    its own, which is closed again when the job ends.
+    """
+
+    def __init__(self, func: typing.Callable[['ReportJob'], typing.Any]):
+        super().__init__()
+        self.func = func
+        self.signals = ReportJobSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def isCancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def checkCancelled(self):
+        if self._cancelled.is_set():
+            raise ReportJobCancelled()
+
+    def reportProgress(self, done: int, total: int):
+        self.checkCancelled()
+        self.signals.progress.emit(done, total)
+
+    def reportPartial(self, chunk):
+        self.checkCancelled()
+        self.signals.partial.emit(chunk)
+
+    def run(self):
+        try:
+            result = self.func(self)
+        except ReportJobCancelled:
+            return
+        except Exception as e:
+            if not self.isCancelled():
+                self.signals.failed.emit(e)
+        else:
+            if not self.isCancelled():
+                self.signals.finished.emit(result)
+        finally:
+            if FFDB.db is not None:
+                FFDB.db.disconnect()
+
+
+class ReportJobRunner(QtCore.QObject):
+    """
+    Runs one report job at a time for a widget. Starting a job cancels the one
+    still running, and signals of a job that is no longer current are dropped
+    even when they were already queued.
+    """
+    started = QtCore.Signal()
+    progress = QtCore.Signal(int, int)
+    partial = QtCore.Signal(object)
+    finished = QtCore.Signal(object)
+    failed = QtCore.Signal(object)
+    stopped = QtCore.Signal()           # the current job finished, failed or was cancelled
+
+    def __init__(self, parent: QtCore.QObject = None, pool: QtCore.QThreadPool = None):
+        super().__init__(parent)
+        self.pool = pool or QtCore.QThreadPool.globalInstance()
+        self._job: typing.Optional[ReportJob] = None
+
+    def isRunning(self) -> bool:
+        return self._job is not None
+
+    def start(self, func: typing.Callable[[ReportJob], typing.Any]) -> ReportJob:
+        self.cancel()
+        job = ReportJob(func)
+        job.signals.progress.connect(lambda done, total: self._job is job and self.progress.emit(done, total))
+        job.signals.partial.connect(lambda chunk: self._job is job and self.partial.emit(chunk))
+        job.signals.finished.connect(lambda result: self._job is job and self._stop(self.finished, result))
+        job.signals.failed.connect(lambda e: self._job is job and self._stop(self.failed, e))
+        self._job = job
+        self.started.emit()
+        self.pool.start(job)
+        return job
+
+    def cancel(self):
+        if self._job is not None:
+            self._job.cancel()
+            self._job = None
+            self.stopped.emit()
+
+    def _stop(self, signal, value):
+        self._job = None
+        signal.emit(value)
+        self.stopped.emit()
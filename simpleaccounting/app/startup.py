@@ -16,8 +16,13 @@
 
 import os
 import sys
-from simpleaccounting.app.application import Application
 import traceback
+from simpleaccounting.app import startuptrace
+
+if '--startup-trace' in sys.argv:
+    startuptrace.enable()
+with startuptrace.phase('imports'):
+    from simpleaccounting.app.application import Application
 
 
 def trap_exc_during_debug(exc_type, exc_value, exc_traceback):
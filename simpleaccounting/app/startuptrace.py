@@ -0,0 +1,89 @@
+"""
+    Copyright 2024- ZiJian Jiang @ https://github.com/CallmeNezha
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+"""
+Timings of the phases of the application start, from the launch to the first
+paint of the main window. Enabled by the environment variable below or by
+``--startup-trace`` on the command line, the report is then printed to stderr
+once the main window has been painted. Disabled, every call is a no-op.
+"""
+
+import contextlib
+import os
+import sys
+import time
+import typing
+
+ENV_VAR = 'SIMPLEACCOUNTING_STARTUP_TRACE'
+
+_enabled = bool(os.environ.get(ENV_VAR))
+_origin = time.perf_counter()
+_open: dict[str, float] = {}
+_phases: list[tuple[str, float]] = []
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable(on: bool = True):
+    global _enabled
+    _enabled = on
+
+
+def reset():
+    global _origin
+    _origin = time.perf_counter()
+    _open.clear()
+    _phases.clear()
+
+
+def begin(name: str):
+    if _enabled:
+        _open[name] = time.perf_counter()
+
+
+def end(name: str):
+    """Records the phase begun last under ``name``, ignored if there is none"""
+    if _enabled and (start := _open.pop(name, None)) is not None:
+        _phases.append((name, time.perf_counter() - start))
+
+
+@contextlib.contextmanager
+def phase(name: str):
+    begin(name)
+    try:
+        yield
+    finally:
+        end(name)
+
+
+def phases() -> list[tuple[str, float]]:
+    """(name, seconds) of the recorded phases, in the order they ended"""
+    return list(_phases)
+
+
+def report() -> str:
+    lines = ['startup trace']
+    for name, seconds in _phases:
+        lines.append(f"  {name:<20}{seconds * 1000:10.1f} ms")
+    lines.append(f"  {'total':<20}{(time.perf_counter() - _origin) * 1000:10.1f} ms")
+    return '\n'.join(lines)
+
+
+def dump(file: typing.TextIO = None):
+    if _enabled:
+        print(report(), file=file or sys.stderr, flush=True)
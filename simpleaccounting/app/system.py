@@ -16,22 +16,43 @@
 
 import pathlib
 import datetime
+import contextlib
+import functools
+import hashlib
+import os
+import re
+import shutil
+import tempfile
 import typing
 
 from typing import Optional
 
 from pydantic import BaseModel, PositiveFloat
-from collections import defaultdict, deque
+from collections import defaultdict
 
 
-from simpleaccounting.ffdb import FFDB
+from simpleaccounting.ffdb import FFDB, ACTIVE_BOOK
+from simpleaccounting.app import events
+from simpleaccounting.app.events import is_related_account
+from simpleaccounting.app.balanceindex import BalanceIndex, Posting, cents
+from simpleaccounting.app.booklock import BookLock
+from simpleaccounting.app.mru import MRUTracker
+from simpleaccounting.app.reportcache import ReportCache
 from simpleaccounting.tools.mymath import FloatWithPrecision
-from simpleaccounting.standards import (ACCOUNTS_GENERAL_STANDARD_2018, ACCOUNTS_SMALL_STANDARD_2013,
-                                        BALANCE_SHEET_SMALL_STANDARD_2013, BALANCE_SHEET_GENERAL_STANDARD_2018)
+from simpleaccounting.tools.pinyin import PinyinTable
+from simpleaccounting import standards
 from simpleaccounting.tools.dateutil import last_day_of_previous_month, first_day_of_month, last_day_of_month, \
     month_of_date, first_day_of_year, last_day_of_year, first_day_of_next_month, last_day_of_previous_year
 
 
+BOOK_VERSION = '2024.11.07'
+# bumped with every change to the entities or to what System.__populate adds, the
+# template books of an earlier version are then built again
+TEMPLATE_VERSION = 1
+# where the template books are kept, SIMPLEACCOUNTING_DIR/templates when None
+TEMPLATE_DIR: Optional[pathlib.Path] = None
+
+
 def parse_expression(expression):
     """
     Parses and evaluates a mathematical expression containing only + and - operators.
@@ -103,6 +124,8 @@ class Account:
         self.direction: str = account.direction
         self.is_custom: bool = account.is_custom
         self.need_exchange_gains_losses: bool = account.need_exchange_gains_losses
+        self.depth: int = account.depth
+        self.is_leaf: bool = account.is_leaf
 
     @property
     def parent(self) -> typing.Optional['Account']:
@@ -170,6 +193,21 @@ class VoucherEntry(BaseModel):
     brief: str = ""
 
 
+class LedgerEntry(typing.NamedTuple):
+    """One debit or credit entry of a ledger, ``balance`` is the local debit-minus-credit balance after it"""
+    date: datetime.date
+    voucher_number: str
+    brief: str
+    account: str        # account qualname
+    currency: str
+    exchange_rate: float
+    debit_amount: Optional[float]
+    credit_amount: Optional[float]
+    debit_local_amount: Optional[FloatWithPrecision]
+    credit_local_amount: Optional[FloatWithPrecision]
+    balance: FloatWithPrecision
+
+
 class Voucher:
 
     def __init__(self, voucher: 'FFDB.db.Voucher'):
@@ -189,6 +227,21 @@ class Voucher:
                 self.credit_entries.append(CreditEntry(credit_entry))
 
 
+class VoucherHeader:
+    """Number, date and category of a voucher without its entries"""
+    def __init__(self, voucher: 'FFDB.db.Voucher'):
+        self.number: str = voucher.number
+        self.category: str = voucher.category
+        self.date = voucher.date
+
+    @classmethod
+    def fromRow(cls, number: str, category: str, date: str) -> 'VoucherHeader':
+        """A header from a row of the Voucher table"""
+        header = cls.__new__(cls)
+        header.number, header.category, header.date = number, category, datetime.date.fromisoformat(date)
+        return header
+
+
 class BalanceSheetEntry:
     """"""
     def __init__(self, balance_sheet_entry: 'FFDB.db.BalanceSheetEntry'):
@@ -205,9 +258,60 @@ class BalanceSheetTemplate:
         with FFDB.db_session:
             self.entries = [BalanceSheetEntry(bste) for bste in FFDB.db.BalanceSheetTemplate.get(name=self.name).asset_liability_entries.sort_by(FFDB.db.BalanceSheetEntry.id)]
 
+def mutating(func):
+    """
+    Marks a System method that writes the book, every call bumps the data version.
+    A successful call bumps it when publishing its change event. The writes of a
+    book are serialized, see :meth:`System.consistentRead`.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            with System.bookLock().writing():
+                return func(*args, **kwargs)
+        except Exception:
+            # bumped on failure as well, a rolled back write only costs a refresh
+            System.bumpDataVersion()
+            raise
+    return wrapper
+
+
+class BookState:
+    """The caches and subscribers of one open book"""
+    def __init__(self):
+        self.mru: Optional[MRUTracker] = None
+        self.mru_accounts: dict[str, Account] = {}
+        self.data_version: int = 0
+        self.report_cache = ReportCache()
+        self.events = events.EventBus()
+        self.pinyin: Optional[PinyinTable] = None
+        self.balance_index = BalanceIndex()
+        self.lock = BookLock()
+
+
 # system
 class System:
-    """"""
+    """
+    Operations on the active book: the book of a :class:`simpleaccounting.app.book.Book`
+    while it is activated in the current context, else the default book bound by
+    :meth:`new` or :meth:`bindDatabase`.
+
+    Reads and writes may run on any thread once the book is bound. Every thread
+    queries through a connection of its own, writes are serialized by the book's
+    :class:`BookLock`, and a report made of several reads sees one state of the
+    book when run through :meth:`consistentRead`. ledgerEntries, the balance sheet
+    and ending balance windows, and the trial balance and balance sheet rows of
+    the command line and the consolidation are. Other sequences of reads may see
+    a save between two of them. Binding a book is expected to happen while no
+    other thread uses System.
+    """
+    __default_state = BookState()
+
+    @staticmethod
+    def __state() -> BookState:
+        book = ACTIVE_BOOK.get()
+        return System.__default_state if book is None else book.state
+
     @staticmethod
     def __account_qualname(account):
         qualname = account.name
@@ -235,100 +339,248 @@ class System:
             return False
 
     @staticmethod
+    @mutating
     def new(filename: pathlib.Path, standard: typing.Literal['一般企业会计准则（2018）', '小企业会计准则（2013）'], month: datetime.date):
-        if standard == '一般企业会计准则（2018）':
-            standard_accounts = ACCOUNTS_GENERAL_STANDARD_2018
-            balance_entries = BALANCE_SHEET_GENERAL_STANDARD_2018
-        elif standard == '小企业会计准则（2013）':
-            standard_accounts = ACCOUNTS_SMALL_STANDARD_2013
-            balance_entries = BALANCE_SHEET_SMALL_STANDARD_2013
-
+        """
+        Creates the book ``filename`` as a copy of the template book of ``standard``,
+        built on first use and kept in TEMPLATE_DIR, then sets its company and month
+        """
         # hard transfer
         month = month_of_date(month)
         #
-        FFDB.bindDatabase(filename)
-
-        with FFDB.db_session:
-            FFDB.db.Meta(
-                version='2024.11.07',
-                standard=standard,
-                company=filename.stem,
-                month_from=month,
-                month_until=month
-            )
+        filename = pathlib.Path(filename)
+        if filename.exists():
+            # not replaced, the tables and the chart are added to what it holds
+            System.__bindDatabase(filename)
+            with FFDB.db_session:
+                FFDB.db.Meta(version=BOOK_VERSION, standard=standard, company=filename.stem,
+                             month_from=month, month_until=month)
+                System.__populate(standard)
+        else:
+            shutil.copyfile(System.__template(standard), filename)
+            System.__bindDatabase(filename)
+            with FFDB.db_session:
+                meta = FFDB.db.Meta.select().first()
+                meta.company = filename.stem
+                meta.month_from = month
+                meta.month_until = month
+        # !if
+        System.__publish(events.BookOpened(str(filename)))
 
-            rmb = FFDB.db.Currency(
-                name='人民币',
-                is_local=True
-            )
+    @staticmethod
+    def __template(standard: str) -> pathlib.Path:
+        """
+        The template book of ``standard``: the chart, the local currency and the
+        balance sheet template. It is rebuilt when the standard's data, BOOK_VERSION
+        or TEMPLATE_VERSION change, and the templates it supersedes are deleted.
+        """
+        if TEMPLATE_DIR is None:
+            from simpleaccounting.app.iniconfig import SIMPLEACCOUNTING_DIR
+            directory = pathlib.Path(SIMPLEACCOUNTING_DIR) / 'templates'
+        else:
+            directory = pathlib.Path(TEMPLATE_DIR)
+        digest = hashlib.sha1(f"{BOOK_VERSION}/{TEMPLATE_VERSION}/{standards.fingerprint(standard)}".encode())
+        stem = pathlib.Path(standards.STANDARD_FILES[standard][0]).stem
+        template = directory / f"{stem}-{digest.hexdigest()[:12]}.db"
+        if template.exists():
+            return template
+        directory.mkdir(parents=True, exist_ok=True)
+        for superseded in directory.glob(f"{stem}-*.db"):
+            if re.fullmatch(rf"{re.escape(stem)}-[0-9a-f]{{12}}\.db", superseded.name):
+                with contextlib.suppress(OSError):
+                    superseded.unlink()
+        # 1for
+        # built aside and renamed, a concurrent build or reader never sees a partial template
+        fd, building = tempfile.mkstemp(suffix='.db', dir=directory)
+        os.close(fd)
+        os.remove(building)
+        try:
+            System.__bindDatabase(pathlib.Path(building))
+            with FFDB.db_session:
+                # placeholders, set by new
+                FFDB.db.Meta(version=BOOK_VERSION, standard=standard, company=standard,
+                             month_from=datetime.date(1970, 1, 1), month_until=datetime.date(1970, 1, 1))
+                System.__populate(standard)
+            # !with
+            FFDB.db.disconnect()
+            os.replace(building, template)
+        finally:
+            if os.path.exists(building):
+                os.remove(building)
+        return template
 
-            FFDB.db.ExchangeRate(
-                currency=rmb,
-                rate=1.0,
-                effective_date=datetime.date(1970, 1, 1)
+    @staticmethod
+    def __populate(standard: str):
+        """Adds the local currency, the chart of accounts and the balance sheet template of ``standard``"""
+        chart = standards.standard(standard)
+
+        rmb = FFDB.db.Currency(
+            name='人民币',
+            is_local=True
+        )
+
+        FFDB.db.ExchangeRate(
+            currency=rmb,
+            rate=1.0,
+            effective_date=datetime.date(1970, 1, 1)
+        )
+
+        created = {}
+        for account in chart.accounts:
+            parent = created.get(account.parent_code)
+            created[account.code] = FFDB.db.Account(
+                name=account.name,
+                qualname=account.qualname if parent else account.name,
+                code=account.code,
+                major_category=account.major_category,
+                direction=account.direction,
+                parent=parent,
+                depth=account.code.count('.'),
+                is_leaf=not chart.childrenOf(account.code),
+                is_custom=False
             )
+        # 1for
 
-            for major_category, accounts in standard_accounts.items():
-                for account in accounts:
-                    code_parent = '.'.join(account['科目代码'].split('.')[:-1])
-                    parent = FFDB.db.Account.get(code=code_parent) if code_parent else None
-                    FFDB.db.Account(
-                        name=account['科目名称'],
-                        qualname=System.__account_qualname(parent) + '/' + account['科目名称'] if parent else account['科目名称'] ,
-                        code=account['科目代码'],
-                        major_category=major_category,
-                        direction=account['余额方向'],
-                        parent=parent,
-                        is_custom=False
-                    )
-
-            # 月末结转，年末结转，汇兑损益
-            if standard == '一般企业会计准则（2018）':
-                annual_profit = FFDB.db.Account.get(name='本年利润')
-                annual_profit.currency = rmb
-                undistributed_profit = FFDB.db.Account.get(name='未分配利润')
-                undistributed_profit.currency = rmb
-                exchange_difference = FFDB.db.Account.get(name='汇兑差额')
-                exchange_difference.currency = rmb
-            elif standard == '小企业会计准则（2013）':
-                annual_profit = FFDB.db.Account.get(name='本年利润')
-                annual_profit.currency = rmb
-                undistributed_profit = FFDB.db.Account.get(name='未分配利润')
-                undistributed_profit.currency = rmb
-                exchange_difference = FFDB.db.Account.get(name='汇兑损益')
-                exchange_difference.currency = rmb
-                prior_year_profit_loss_adjustments = FFDB.db.Account.get(name='以前年度损益调整')
-                prior_year_profit_loss_adjustments.currency = rmb
+        # 月末结转，年末结转，汇兑损益
+        if standard == '一般企业会计准则（2018）':
+            annual_profit = FFDB.db.Account.get(name='本年利润')
+            annual_profit.currency = rmb
+            undistributed_profit = FFDB.db.Account.get(name='未分配利润')
+            undistributed_profit.currency = rmb
+            exchange_difference = FFDB.db.Account.get(name='汇兑差额')
+            exchange_difference.currency = rmb
+        elif standard == '小企业会计准则（2013）':
+            annual_profit = FFDB.db.Account.get(name='本年利润')
+            annual_profit.currency = rmb
+            undistributed_profit = FFDB.db.Account.get(name='未分配利润')
+            undistributed_profit.currency = rmb
+            exchange_difference = FFDB.db.Account.get(name='汇兑损益')
+            exchange_difference.currency = rmb
+            prior_year_profit_loss_adjustments = FFDB.db.Account.get(name='以前年度损益调整')
+            prior_year_profit_loss_adjustments.currency = rmb
 
-            #
-            template = FFDB.db.BalanceSheetTemplate(name='默认')
-            for category, entries in balance_entries.items():
-                for entry in entries:
-                    item, lineno, formula = entry
-                    se = FFDB.db.BalanceSheetEntry(
-                        template=template,
-                        category=category,
-                        item=item,
-                        line_number = lineno,
-                        formula=formula or ''
-                    )
+        #
+        template = FFDB.db.BalanceSheetTemplate(name='默认')
+        for category, entries in chart.balance_sheet.items():
+            for entry in entries:
+                item, lineno, formula = entry
+                se = FFDB.db.BalanceSheetEntry(
+                    template=template,
+                    category=category,
+                    item=item,
+                    line_number = lineno,
+                    formula=formula or ''
+                )
 
     @staticmethod
+    @mutating
     def bindDatabase(filename: pathlib.Path):
+        System.__bindDatabase(filename)
+        System.__publish(events.BookOpened(str(filename)))
+
+    @staticmethod
+    def __bindDatabase(filename: pathlib.Path):
+        if FFDB.db:
+            System.flushMRUAccounts()
+        state = System.__state()
+        state.mru = None
+        state.mru_accounts = {}
+        state.balance_index.drop()
         FFDB.bindDatabase(filename)
 
+    @staticmethod
+    def dataVersion() -> int:
+        """Increases with every write to the book, results computed at the same version are still valid"""
+        return System.__state().data_version
+
+    @staticmethod
+    def bumpDataVersion():
+        System.__state().data_version += 1
+
+    @staticmethod
+    def bookLock() -> BookLock:
+        return System.__state().lock
+
+    @staticmethod
+    def consistentRead(func: typing.Callable[[], typing.Any]):
+        """
+        The result of the report ``func`` as of one state of the book: ``func`` runs
+        again when a write overlapped it, see :class:`BookLock`. The reports cached
+        by System are kept in step with the writes of this process only.
+        """
+        return System.__state().lock.read(func)
+
+    @staticmethod
+    def subscribe(callback: typing.Callable[[typing.Any], None], *types: type):
+        """
+        Calls ``callback(event)`` after every successful write, see :mod:`simpleaccounting.app.events`.
+        The callback runs on the writing thread, ``types`` limits the events it receives.
+        """
+        System.__state().events.subscribe(callback, *types)
+
+    @staticmethod
+    def unsubscribe(callback: typing.Callable[[typing.Any], None]):
+        System.__state().events.unsubscribe(callback)
+
+    @staticmethod
+    def __publish(event):
+        System.bumpDataVersion()
+        System.__invalidateReports(event)
+        state = System.__state()
+        if isinstance(event, (events.AccountCreated, events.AccountDeleted, events.BookOpened)):
+            state.pinyin = None
+        if isinstance(event, (events.AccountDeleted, events.AccountCurrencySet)):
+            state.balance_index.drop(event.code)
+        # the cached MRU accounts are snapshots, of the account and of a parent that is no longer a leaf
+        if isinstance(event, (events.AccountCreated, events.AccountDeleted, events.AccountCurrencySet)):
+            state.mru_accounts.pop(event.code, None)
+        if isinstance(event, events.AccountCreated):
+            state.mru_accounts.pop(event.parent_code, None)
+        state.events.publish(event)
+
+    @staticmethod
+    def __invalidateReports(event):
+        """Drops the cached reports the write of ``event`` may have changed"""
+        if isinstance(event, (events.VoucherChanged, events.VoucherDeleted)):
+            if not event.accounts:
+                return
+            since = min(event.dates)
+
+            def affected(key):
+                if key[0] == 'balanceSheet':
+                    return key[2] >= since
+                return key[3] >= since and any(is_related_account(key[1], code) for code in event.accounts)
+        elif isinstance(event, events.VoucherRenumbered):
+            def affected(key):
+                return key[0] == 'ledgerEntries' and key[3] >= event.date
+        elif isinstance(event, (events.AccountCreated, events.AccountDeleted, events.AccountCurrencySet)):
+            def affected(key):
+                return key[0] == 'balanceSheet' or is_related_account(key[1], event.code)
+        elif isinstance(event, events.BookOpened):
+            affected = None
+        else:
+            # currencies, exchange rates, empty vouchers and templates are not part of a cached result,
+            # templates are keyed by their formulas
+            return
+        System.__state().report_cache.invalidate(affected)
+
     @staticmethod
     def meta() -> Meta:
         with FFDB.db_session:
             return Meta(FFDB.db.Meta.get())
 
     @staticmethod
+    @mutating
     def forwardToNextMonth():
         with FFDB.db_session:
             meta = FFDB.db.Meta.select().first()
             meta.month_until = month_of_date(first_day_of_next_month(meta.month_until))
+            month_until = meta.month_until
+        # !with
+        System.__publish(events.MonthForwarded(month_until))
 
     @staticmethod
+    @mutating
     def createAccount(parent_code: str,
                       code: str,
                       name: str,
@@ -363,12 +615,17 @@ class System:
                 major_category=parent.major_category,
                 direction=parent.direction,
                 parent=parent,
+                depth=parent.depth + 1,
+                is_leaf=True,
                 is_custom=True
             )
+            parent.is_leaf = False
         # !with
+        System.__publish(events.AccountCreated(code, parent_code))
         return Account(account)
 
     @staticmethod
+    @mutating
     def deleteAccount(code: str):
         with FFDB.db_session:
             account = FFDB.db.Account.get(code=code)
@@ -378,14 +635,26 @@ class System:
                 raise IllegalOperation("A1.2.1/5")
             elif not account.is_custom:
                 raise IllegalOperation("A1.1/5")
-            elif account.children:
+            elif not account.is_leaf:
                 raise IllegalOperation("A1.2.1/6")
             elif account.debit_entries:
                 raise IllegalOperation("A1.2.1/5")
             elif account.credit_entries:
                 raise IllegalOperation("A1.2.1/5")
             else:
+                parent = account.parent
+                parent_code = parent.code if parent is not None else None
                 account.delete()
+                if parent is not None and parent.children.is_empty():
+                    parent.is_leaf = True
+                if mru := FFDB.db.MRU_Account.get(account_code=code):
+                    mru.delete()
+        # !with
+        if (mru := System.__state().mru) is not None:
+            mru.discard(code)
+        # the parent may have become a leaf
+        System.__state().mru_accounts.pop(parent_code, None)
+        System.__publish(events.AccountDeleted(code))
 
     @staticmethod
     def account(code: str) -> Optional[Account]:
@@ -409,6 +678,7 @@ class System:
             return list((Account(a) for a in FFDB.db.Account.select().order_by(FFDB.db.Account.code)))
 
     @staticmethod
+    @mutating
     def setAccountCurrency(account_code: str, currency_name: str, need_exchange_gains_losses: bool=False):
         with FFDB.db_session:
             account = FFDB.db.Account.get(code=account_code)
@@ -416,12 +686,12 @@ class System:
                 raise EntryNotFound(account_code)
             if account.currency:
                 raise IllegalOperation('A2.1/1')
-            elif account.children:
+            elif not account.is_leaf:
                 raise IllegalOperation('A2.1/4')
             elif need_exchange_gains_losses:
                 if currency_name == '人民币':
                     raise IllegalOperation('A5.1/1')
-                elif account.children:
+                elif not account.is_leaf:
                     raise IllegalOperation('A5.1/2')
 
             currency = FFDB.db.Currency.get(name=currency_name)
@@ -429,8 +699,11 @@ class System:
                 raise EntryNotFound(currency_name)
             account.currency = currency
             account.need_exchange_gains_losses = need_exchange_gains_losses
+        # !with
+        System.__publish(events.AccountCurrencySet(account_code, currency_name))
 
     @staticmethod
+    @mutating
     def createCurrency(name: str) -> Currency:
         with FFDB.db_session:
             if FFDB.db.Currency.get(name=name):
@@ -439,7 +712,10 @@ class System:
             FFDB.db.ExchangeRate(currency=currency,
                                  rate=1.0,
                                  effective_date=datetime.date(1970, 1, 1))
-            return Currency(currency)
+            currency = Currency(currency)
+        # !with
+        System.__publish(events.CurrencyCreated(name))
+        return currency
 
     @staticmethod
     def currencies() -> list[Currency]:
@@ -455,6 +731,7 @@ class System:
             return Currency(currency)
 
     @staticmethod
+    @mutating
     def deleteCurrency(name: str):
         if name == '人民币':
             raise IllegalOperation('A2.2/1')
@@ -467,8 +744,11 @@ class System:
             if currency.accounts:
                 raise IllegalOperation('A2.1/2')
             currency.delete()
+        # !with
+        System.__publish(events.CurrencyDeleted(name))
 
     @staticmethod
+    @mutating
     def createExchangeRate(currency_name: str, rate: float, effective_date: datetime.date):
         if currency_name == '人民币':
             raise IllegalOperation('A2.2/1')
@@ -484,9 +764,13 @@ class System:
             exchange_rate = FFDB.db.ExchangeRate(currency=currency,
                                                  rate=rate,
                                                  effective_date=effective_date)
-            return ExchangeRate(exchange_rate)
+            exchange_rate = ExchangeRate(exchange_rate)
+        # !with
+        System.__publish(events.ExchangeRatesChanged(currency_name))
+        return exchange_rate
 
     @staticmethod
+    @mutating
     def deleteExchangeRate(currency_name: str, effective_date: datetime.date):
         if currency_name == '人民币':
             raise IllegalOperation('A2.2/1')
@@ -503,6 +787,8 @@ class System:
                 raise EntryNotFound(currency_name, effective_date)
 
             er.delete()
+        # !with
+        System.__publish(events.ExchangeRatesChanged(currency_name))
 
     @staticmethod
     def exchangeRates(currency_name: str) -> list[ExchangeRate]:
@@ -539,21 +825,84 @@ class System:
 
     @staticmethod
     def vouchers(filter):
+        """
+        Vouchers matching the Pony lambda ``filter``, with their entries. Prefer the
+        typed queries below, their SQL is fixed and only the parameters change.
+        """
         with FFDB.db_session:
             return [Voucher(v) for v in FFDB.db.Voucher.select(filter)]
 
+    # The typed voucher queries run constant SQL text with bound parameters, so sqlite
+    # prepares each statement once per connection and Pony has no lambda to translate.
+    # A None category matches every category.
+
+    @staticmethod
+    def voucherHeaders(date_from: datetime.date, date_until: datetime.date, category: str = None) -> list[VoucherHeader]:
+        """Vouchers dated within [date_from, date_until] ordered by number, entries are not loaded"""
+        with FFDB.db_session:
+            rows = FFDB.db.select(
+                'SELECT "number", "category", "date" FROM "Voucher" '
+                'WHERE "date" >= $date_from AND "date" <= $date_until AND ($category IS NULL OR "category" = $category) '
+                'ORDER BY "number"',
+                globals={}, locals={'date_from': date_from.isoformat(), 'date_until': date_until.isoformat(),
+                                    'category': category}
+            )
+        return [VoucherHeader.fromRow(*row) for row in rows]
+
+    @staticmethod
+    def voucherHeadersOfMonth(month: datetime.date, category: str = None) -> list[VoucherHeader]:
+        """Vouchers dated within the month of ``month`` ordered by number"""
+        return System.voucherHeaders(first_day_of_month(month), last_day_of_month(month), category)
+
+    @staticmethod
+    def voucherHeadersOfAccount(account_code: str, date_from: datetime.date, date_until: datetime.date,
+                                category: str = None) -> list[VoucherHeader]:
+        """Vouchers dated within [date_from, date_until] with entries of the account or its sub-accounts"""
+        sql_subtree = '("a"."code" = $code OR ("a"."code" > $code_from AND "a"."code" < $code_until))'
+        with FFDB.db_session:
+            rows = FFDB.db.select(
+                f'SELECT "v"."number", "v"."category", "v"."date" FROM "Voucher" AS "v" '
+                f'WHERE "v"."date" >= $date_from AND "v"."date" <= $date_until '
+                f'AND ($category IS NULL OR "v"."category" = $category) AND ('
+                f'EXISTS (SELECT 1 FROM "DebitEntry" AS "e" JOIN "Account" AS "a" ON "a"."id" = "e"."account" '
+                f'WHERE "e"."voucher" = "v"."id" AND {sql_subtree}) OR '
+                f'EXISTS (SELECT 1 FROM "CreditEntry" AS "e" JOIN "Account" AS "a" ON "a"."id" = "e"."account" '
+                f'WHERE "e"."voucher" = "v"."id" AND {sql_subtree})) '
+                f'ORDER BY "v"."number"',
+                globals={}, locals={'code': account_code, 'code_from': account_code + '.', 'code_until': account_code + '/',
+                                    'date_from': date_from.isoformat(), 'date_until': date_until.isoformat(),
+                                    'category': category}
+            )
+        return [VoucherHeader.fromRow(*row) for row in rows]
+
+    @staticmethod
+    def voucherCounts(date_from: datetime.date, date_until: datetime.date) -> dict[str, int]:
+        """Number of vouchers dated within [date_from, date_until] by category, categories without any are left out"""
+        with FFDB.db_session:
+            rows = FFDB.db.select(
+                'SELECT "category", COUNT(*) FROM "Voucher" '
+                'WHERE "date" >= $date_from AND "date" <= $date_until GROUP BY "category"',
+                globals={}, locals={'date_from': date_from.isoformat(), 'date_until': date_until.isoformat()}
+            )
+        return dict(rows)
+
     @staticmethod
+    @mutating
     def createVoucher(number: str, date: datetime.date, category='记账') -> 'FFDB.db.Voucher':
         with FFDB.db_session:
             if FFDB.db.Voucher.get(number=number):
                 raise IllegalOperation('A3.2/4')
 
             voucher = FFDB.db.Voucher(number=number, date=date, category=category)
-            return Voucher(voucher)
+            voucher = Voucher(voucher)
+        # !with
+        System.__publish(events.VoucherCreated(number, date))
+        return voucher
 
     @staticmethod
+    @mutating
     def setVoucherDate(voucher_number: str, date: datetime.date):
-        with FFDB.db_session:
+        with System.__state().balance_index.writing() as write, FFDB.db_session:
             voucher = FFDB.db.Voucher.get(number=voucher_number)
             if voucher is None:
                 raise EntryNotFound(voucher_number)
@@ -562,34 +911,101 @@ class System:
                 last_day_of_month(voucher.date) < date):
                 raise IllegalOperation("Can't set date outside voucher's month")
             #
+            changed = events.VoucherChanged(voucher_number, System.__voucherAccounts(voucher),
+                                            frozenset((voucher.date, date)))
+            write.remove(System.__postings(voucher))
             voucher.date = date
+            write.add(System.__postings(voucher))
+        # !with
+        System.__publish(changed)
 
     @staticmethod
+    @mutating
     def changeVoucherNumber(old_voucher_number: str, new_voucher_number: str):
         with FFDB.db_session:
             voucher = FFDB.db.Voucher.get(number=old_voucher_number)
             if voucher is None:
                 raise EntryNotFound(old_voucher_number)
             voucher.number = new_voucher_number
+            renumbered = events.VoucherRenumbered(old_voucher_number, new_voucher_number, voucher.date)
+        # !with
+        System.__publish(renumbered)
 
     @staticmethod
+    @mutating
     def deleteVoucher(number: str):
-        with FFDB.db_session:
+        with System.__state().balance_index.writing() as write, FFDB.db_session:
             voucher = FFDB.db.Voucher.get(number=number)
             if voucher is None:
                 raise EntryNotFound(number)
+            deleted = events.VoucherDeleted(number, System.__voucherAccounts(voucher), frozenset((voucher.date,)))
+            write.remove(System.__postings(voucher))
             voucher.delete()
+        # !with
+        System.__publish(deleted)
+
+    @staticmethod
+    def __postings(voucher: 'FFDB.db.Voucher') -> list[Posting]:
+        """The entries of ``voucher`` as they count towards the balance index"""
+        postings = []
+        for side, entries in ((0, voucher.debit_entries), (1, voucher.credit_entries)):
+            for e in entries:
+                account = e.account
+                postings.append(System.__posting(account.code, voucher.date, side, e.amount, e.exchange_rate,
+                                                 account.currency is not None and e.currency == account.currency.name))
+            # 1for
+        # 1for
+        return postings
 
     @staticmethod
+    def __posting(account_code: str, date: datetime.date, side: int, amount: float, exchange_rate: float,
+                  in_account_currency: bool) -> Posting:
+        """An entry of ``side`` 0 for debit and 1 for credit as it counts towards the balance index"""
+        amount_cents, exact = cents(amount) if in_account_currency else (0, True)
+        local_cents, local_exact = cents(amount, exchange_rate)
+        if side == 0:
+            return Posting(account_code, date, amount_cents, 0, local_cents, 0, exact and local_exact)
+        return Posting(account_code, date, 0, amount_cents, 0, local_cents, exact and local_exact)
+
+    @staticmethod
+    def __accountPostings(account_code: str) -> list[Posting]:
+        """Every entry of the leaf ``account_code`` as it counts towards the balance index"""
+        with FFDB.db_session:
+            account = FFDB.db.Account.get(code=account_code)
+            account_currency = account.currency.name if account.currency else None
+            rows = FFDB.db.select(
+                'SELECT "v"."date", "e"."currency", "e"."amount", "e"."exchange_rate", "e"."side" FROM ('
+                'SELECT "voucher", "currency", "amount", "exchange_rate", 0 AS "side" FROM "DebitEntry" '
+                'WHERE "account" = $id '
+                'UNION ALL '
+                'SELECT "voucher", "currency", "amount", "exchange_rate", 1 AS "side" FROM "CreditEntry" '
+                'WHERE "account" = $id'
+                ') AS "e" JOIN "Voucher" AS "v" ON "v"."id" = "e"."voucher"',
+                globals={}, locals={'id': account.id}
+            )
+        # !with
+        return [System.__posting(account_code, datetime.date.fromisoformat(date), side, amount, exchange_rate,
+                                 currency == account_currency)
+                for date, currency, amount, exchange_rate, side in rows]
+
+    @staticmethod
+    def __voucherAccounts(voucher: 'FFDB.db.Voucher') -> frozenset[str]:
+        return frozenset(e.account.code for e in voucher.debit_entries) | \
+               frozenset(e.account.code for e in voucher.credit_entries)
+
+    @staticmethod
+    @mutating
     def updateDebitCreditEntries(voucher_number: str,
                                  debitEntries: list[VoucherEntry],
                                  creditEntries: list[VoucherEntry]):
 
-        with FFDB.db_session:
+        with System.__state().balance_index.writing() as write, FFDB.db_session:
             voucher = FFDB.db.Voucher.get(number=voucher_number)
             if voucher is None:
                 raise EntryNotFound(voucher_number)
 
+            accounts = System.__voucherAccounts(voucher)
+            write.remove(System.__postings(voucher))
             voucher.debit_entries.clear()
             voucher.credit_entries.clear()
 
@@ -636,24 +1052,89 @@ class System:
 
             if sum_debit != sum_credit:
                 raise IllegalOperation('A3.2/2')
+            write.add(System.__postings(voucher))
+
+            accounts |= {e.account_code for e in debitEntries} | {e.account_code for e in creditEntries}
+            changed = events.VoucherChanged(voucher_number, frozenset(accounts), frozenset((voucher.date,)))
+        # !with
+        System.__publish(changed)
+
+    @staticmethod
+    def __mruTracker() -> MRUTracker:
+        """Returns the in-memory MRU tracker, seeded from ``MRU_Account`` on first use"""
+        state = System.__state()
+        if state.mru is None:
+            tracker = MRUTracker()
+            with FFDB.db_session:
+                tracker.load({m.account_code: m.hits for m in FFDB.db.MRU_Account.select()})
+            state.mru = tracker
+        return state.mru
 
     @staticmethod
     def increaseMRUAccount(account_code: str):
-        with FFDB.db_session:
-            mru = FFDB.db.MRU_Account.get(account_code=account_code)
-            if mru is None:
-                mru = FFDB.db.MRU_Account(
-                    account_code=account_code
-                )
-            mru.hits += 1
+        """Counts one use of the account in memory, see :meth:`flushMRUAccounts`"""
+        System.__mruTracker().hit(account_code)
 
     @staticmethod
-    def topMRUAccounts(N: int):
-        with FFDB.db_session:
-            return [
-                Account(FFDB.db.Account.get(code=mru_account.account_code)) for mru_account in FFDB.db.MRU_Account.select().sort_by(
-                FFDB.db.MRU_Account.hits.desc()).limit(N)
-            ]
+    def topMRUAccounts(N: int, decayed: bool = False) -> list[Account]:
+        """
+        Returns the N most used accounts, served from memory.
+
+        :param decayed: rank by recency-decayed hits instead of total hits
+        """
+        codes = System.__mruTracker().top(N, decayed)
+        mru_accounts = System.__state().mru_accounts
+        missing = [code for code in codes if code not in mru_accounts]
+        if missing:
+            with FFDB.db_session:
+                for a in FFDB.db.Account.select(lambda a: a.code in missing):
+                    mru_accounts[a.code] = Account(a)
+        # accounts deleted outside of the tracker are skipped
+        return [mru_accounts[code] for code in codes if code in mru_accounts]
+
+    @staticmethod
+    def accountPinyin() -> PinyinTable:
+        """
+        Pinyin of the account names and qualnames for :class:`SearchIndex`.
+
+        The table is kept next to the book, see :class:`PinyinTable`, and brought up
+        to date with the accounts on the first call after they changed.
+        """
+        state = System.__state()
+        if state.pinyin is None:
+            filename = pathlib.Path(FFDB.db.provider.pool.filename)
+            filename = filename.with_name(filename.name + '.pinyin.json')
+            table = PinyinTable.load(filename)
+            with FFDB.db_session:
+                texts = [a.qualname for a in FFDB.db.Account.select()]
+            if table.update(texts):
+                try:
+                    table.save(filename)
+                except OSError:
+                    pass    # a read-only book converts again next time
+            state.pinyin = table
+        return state.pinyin
+
+    @staticmethod
+    def flushMRUAccounts():
+        """Writes the hits accumulated in memory to ``MRU_Account`` in one transaction"""
+        if (mru := System.__state().mru) is None:
+            return
+        pending = mru.takePending()
+        if not pending:
+            return
+        try:
+            with FFDB.db_session:
+                codes = list(pending.keys())
+                existing = {m.account_code: m for m in FFDB.db.MRU_Account.select(lambda m: m.account_code in codes)}
+                for code, hits in pending.items():
+                    if mru := existing.get(code):
+                        mru.hits += hits
+                    else:
+                        FFDB.db.MRU_Account(account_code=code, hits=hits)
+        except Exception:
+            mru.restorePending(pending)
+            raise
 
     @staticmethod
     def previewMonthEndCarryForwardVoucherEntries(month: datetime.date):
@@ -673,11 +1154,11 @@ class System:
             # 获取所有成本及损益大类细分科目
             cost_categories = [
                 acc.code for acc in FFDB.db.Account.select(
-                    lambda a: not a.children and a.code.startswith(number_cost_category))]
+                    lambda a: a.is_leaf and a.code.startswith(number_cost_category))]
 
             income_and_expense_categories = [
                 acc.code for acc in FFDB.db.Account.select(
-                    lambda a: not a.children and a.code.startswith(number_income_and_expense_category))]
+                    lambda a: a.is_leaf and a.code.startswith(number_income_and_expense_category))]
 
             # 获取本月度成本及损益大类细分科目的记账凭证条目
             debit_entries = []
@@ -771,83 +1252,57 @@ class System:
             # !if
             return debit_entries, credit_entries
 
+    @staticmethod
+    def __leaves(account_code: str) -> list['FFDB.db.Account']:
+        """The leaf accounts under ``account_code``, read by a range on the (is_leaf, code) index"""
+        # '/' sorts right after '.', so [code., code/) holds every descendant code
+        code_from, code_until = account_code + '.', account_code + '/'
+        # compared to True, a bare column is not matched against the index
+        return list(FFDB.db.Account.select(lambda a: a.is_leaf == True and a.code > code_from and a.code < code_until))
+
     @staticmethod
     def incurredBalances(account_code: str, date_from: datetime.date, date_until: datetime.date) -> tuple[
+        FloatWithPrecision|None, FloatWithPrecision|None,
+        FloatWithPrecision|None, FloatWithPrecision|None,
+        FloatWithPrecision|None, FloatWithPrecision|None,
+        FloatWithPrecision|None, FloatWithPrecision|None]:
+        return System.__state().report_cache.getOrCompute(
+            ('incurredBalances', account_code, date_from, date_until),
+            lambda: System.__incurredBalances(account_code, date_from, date_until)
+        )
+
+    @staticmethod
+    def __incurredBalances(account_code: str, date_from: datetime.date, date_until: datetime.date) -> tuple[
         FloatWithPrecision|None, FloatWithPrecision|None,
         FloatWithPrecision|None, FloatWithPrecision|None,
         FloatWithPrecision|None, FloatWithPrecision|None,
         FloatWithPrecision|None, FloatWithPrecision|None]:
         with (((FFDB.db_session))):
             account = FFDB.db.Account.get(code=account_code)
-            if not account.children:
+            if account.is_leaf:
                 if account.currency is None:
                     return None, FloatWithPrecision(0.0), \
                     None, FloatWithPrecision(0.0), \
                     None, FloatWithPrecision(0.0), \
                     None, FloatWithPrecision(0.0)
                 #
-                account_currency: str = account.currency.name
-                debit_entries = account.debit_entries.select(lambda e: e.voucher.date <= date_until)
-                credit_entries = account.credit_entries.select(lambda e: e.voucher.date <= date_until)
-
-                begin_amount = FloatWithPrecision(0.0)
-                begin_local_amount = FloatWithPrecision(0.0)
-                incurred_debit_amount = FloatWithPrecision(0.0)
-                incurred_debit_local_amount = FloatWithPrecision(0.0)
-                incurred_credit_amount = FloatWithPrecision(0.0)
-                incurred_credit_local_amount = FloatWithPrecision(0.0)
-                currency_amount = FloatWithPrecision(0.0)
-                currency_local_amount = FloatWithPrecision(0.0)
-                for entry in debit_entries:
-                    # there are exchange gains and losses vouchers that use local currency
-                    if account_currency == entry.currency:
-                        currency_amount += entry.amount
-                        if entry.voucher.date < date_from:
-                            begin_amount += entry.amount
-                        else:
-                            incurred_debit_amount += entry.amount
-                    # 1if
-                    local_amount = entry.amount * entry.exchange_rate
-                    currency_local_amount += local_amount
-                    if entry.voucher.date < date_from:
-                        begin_local_amount += local_amount
-                    else:
-                        incurred_debit_local_amount += local_amount
-                    #
-                for entry in credit_entries:
-                    # there are exchange gains and losses vouchers that use local currency
-                    if account_currency == entry.currency:
-                        currency_amount -= entry.amount
-                        if entry.voucher.date < date_from:
-                            begin_amount -= entry.amount
-                        else:
-                            incurred_credit_amount += entry.amount
-                    # 1if
-                    local_amount = entry.amount * entry.exchange_rate
-                    currency_local_amount -= local_amount
-                    if entry.voucher.date < date_from:
-                        begin_local_amount -= local_amount
-                    else:
-                        incurred_credit_local_amount += local_amount
-                #
-                return (begin_amount, begin_local_amount,
-                        incurred_debit_amount, incurred_debit_local_amount,
-                        incurred_credit_amount, incurred_credit_local_amount,
-                        currency_amount, currency_local_amount)
+                before = min(date_from - datetime.timedelta(days=1), date_until)
+                balances = System.__state().balance_index.query(
+                    account_code, (before, date_until), lambda: System.__accountPostings(account_code))
+                if balances is None:
+                    return System.__scannedBalances(account, date_from, date_until)
+                ((debit_before, credit_before, debit_local_before, credit_local_before),
+                 (debit, credit, debit_local, credit_local)) = balances
+                return (FloatWithPrecision((debit_before - credit_before) / 100),
+                        FloatWithPrecision((debit_local_before - credit_local_before) / 100),
+                        FloatWithPrecision((debit - debit_before) / 100),
+                        FloatWithPrecision((debit_local - debit_local_before) / 100),
+                        FloatWithPrecision((credit - credit_before) / 100),
+                        FloatWithPrecision((credit_local - credit_local_before) / 100),
+                        FloatWithPrecision((debit - credit) / 100),
+                        FloatWithPrecision((debit_local - credit_local) / 100))
             else:
-                stack = deque()
-                stack.append(account)
-                leafs = []
-                while stack:
-                    account = stack.pop()
-                    if account.children:
-                        for a in account.children:
-                            stack.append(a)
-                        # 1for
-                    else:
-                        leafs.append(account)
-                    # 1if
-                # 1while
+                leafs = System.__leaves(account.code)
                 begin_sum_local = FloatWithPrecision(0.0)
                 end_sum_local = FloatWithPrecision(0.0)
                 incurred_debit_sum_local = FloatWithPrecision(0.0)
@@ -863,54 +1318,168 @@ class System:
                     incurred_credit_sum_local += incurred_credit
                 return None, begin_sum_local, None, incurred_debit_sum_local, None, incurred_credit_sum_local, None, end_sum_local
 
+    @staticmethod
+    def __scannedBalances(account: 'FFDB.db.Account', date_from: datetime.date, date_until: datetime.date) -> tuple[
+        FloatWithPrecision, FloatWithPrecision,
+        FloatWithPrecision, FloatWithPrecision,
+        FloatWithPrecision, FloatWithPrecision,
+        FloatWithPrecision, FloatWithPrecision]:
+        """
+        The incurred balances of the leaf ``account`` summed over its entries, for
+        the accounts the balance index does not answer. The entries are added in the
+        order they were written, the totals are rounded after every one of them.
+        """
+        account_currency: str = account.currency.name
+        debit_entries = account.debit_entries.select(lambda e: e.voucher.date <= date_until).order_by(
+            FFDB.db.DebitEntry.id)
+        credit_entries = account.credit_entries.select(lambda e: e.voucher.date <= date_until).order_by(
+            FFDB.db.CreditEntry.id)
+
+        begin_amount = FloatWithPrecision(0.0)
+        begin_local_amount = FloatWithPrecision(0.0)
+        incurred_debit_amount = FloatWithPrecision(0.0)
+        incurred_debit_local_amount = FloatWithPrecision(0.0)
+        incurred_credit_amount = FloatWithPrecision(0.0)
+        incurred_credit_local_amount = FloatWithPrecision(0.0)
+        currency_amount = FloatWithPrecision(0.0)
+        currency_local_amount = FloatWithPrecision(0.0)
+        for entry in debit_entries:
+            # there are exchange gains and losses vouchers that use local currency
+            if account_currency == entry.currency:
+                currency_amount += entry.amount
+                if entry.voucher.date < date_from:
+                    begin_amount += entry.amount
+                else:
+                    incurred_debit_amount += entry.amount
+            # 1if
+            local_amount = entry.amount * entry.exchange_rate
+            currency_local_amount += local_amount
+            if entry.voucher.date < date_from:
+                begin_local_amount += local_amount
+            else:
+                incurred_debit_local_amount += local_amount
+        #
+        for entry in credit_entries:
+            # there are exchange gains and losses vouchers that use local currency
+            if account_currency == entry.currency:
+                currency_amount -= entry.amount
+                if entry.voucher.date < date_from:
+                    begin_amount -= entry.amount
+                else:
+                    incurred_credit_amount += entry.amount
+            # 1if
+            local_amount = entry.amount * entry.exchange_rate
+            currency_local_amount -= local_amount
+            if entry.voucher.date < date_from:
+                begin_local_amount -= local_amount
+            else:
+                incurred_credit_local_amount += local_amount
+        #
+        return (begin_amount, begin_local_amount,
+                incurred_debit_amount, incurred_debit_local_amount,
+                incurred_credit_amount, incurred_credit_local_amount,
+                currency_amount, currency_local_amount)
+
     @staticmethod
     def endingBalance(account_code: str, date_until: datetime.date) -> tuple[FloatWithPrecision|None, FloatWithPrecision]:
         with FFDB.db_session:
             account = FFDB.db.Account.get(code=account_code)
-            if not account.children:
+            if account.is_leaf:
                 if account.currency is None:
                     return FloatWithPrecision(0.0), FloatWithPrecision(0.0)
                 #
-                account_currency: str = account.currency.name
-                debit_entries = account.debit_entries.select(lambda e: e.voucher.date <= date_until)
-                credit_entries = account.credit_entries.select(lambda e: e.voucher.date <= date_until)
-
-                currency_amount = FloatWithPrecision(0.0)
-                currency_local_amount = FloatWithPrecision(0.0)
-                for entry in debit_entries:
-                    # there are exchange gains and losses vouchers that use local currency
-                    if account_currency == entry.currency:
-                        currency_amount += entry.amount
-                    # 1if
-                    currency_local_amount += entry.amount * entry.exchange_rate
-                for entry in credit_entries:
-                    # there are exchange gains and losses vouchers that use local currency
-                    if account_currency == entry.currency:
-                        currency_amount -= entry.amount
-                    # 1if
-                    currency_local_amount -= entry.amount * entry.exchange_rate
-                #
-                return currency_amount, currency_local_amount
+                balances = System.__state().balance_index.query(
+                    account_code, (date_until,), lambda: System.__accountPostings(account_code))
+                if balances is None:
+                    return System.__scannedBalances(account, date_until, date_until)[6:]
+                [(debit, credit, debit_local, credit_local)] = balances
+                return FloatWithPrecision((debit - credit) / 100), FloatWithPrecision((debit_local - credit_local) / 100)
             else:
-                stack = deque()
-                stack.append(account)
-                leafs = []
-                while stack:
-                    account = stack.pop()
-                    if account.children:
-                        for a in account.children:
-                            stack.append(a)
-                        # 1for
-                    else:
-                        leafs.append(account)
-                    # 1if
-                # 1while
+                leafs = System.__leaves(account.code)
                 local_amount = FloatWithPrecision(0.0)
                 for account in leafs:
                     _, ending_balance = System.endingBalance(account.code, date_until)
                     local_amount += ending_balance
                 return None, local_amount
 
+    @staticmethod
+    def ledgerEntries(account_code: str, date_from: datetime.date, date_until: datetime.date) -> tuple[
+        FloatWithPrecision, list[LedgerEntry]]:
+        opening_balance, entries = System.__state().report_cache.getOrCompute(
+            ('ledgerEntries', account_code, date_from, date_until),
+            # the opening balance and the entries are read apart, from one state of the book
+            lambda: System.consistentRead(lambda: System.__ledgerEntries(account_code, date_from, date_until))
+        )
+        return opening_balance, list(entries)
+
+    @staticmethod
+    def __ledgerEntries(account_code: str, date_from: datetime.date, date_until: datetime.date) -> tuple[
+        FloatWithPrecision, list[LedgerEntry]]:
+        """
+        Entries of the account and all its sub-accounts dated within [date_from, date_until], ordered by
+        date and voucher number, together with the local balance at the beginning of date_from.
+
+        Sub-accounts are matched by a code range on the unique code index, so only the entries of the
+        subtree are read and no wrapper objects are built.
+        """
+        # debit entries come before credit entries of the same voucher
+        sql_entries = (
+            'SELECT "voucher", "account", "id", "brief", "currency", "exchange_rate", "amount", 0 AS "side" FROM "DebitEntry" '
+            'UNION ALL '
+            'SELECT "voucher", "account", "id", "brief", "currency", "exchange_rate", "amount", 1 AS "side" FROM "CreditEntry"'
+        )
+        sql_subtree = '("a"."code" = $code OR ("a"."code" > $code_from AND "a"."code" < $code_until))'
+        params = {
+            'code': account_code,
+            # '/' sorts right after '.', so [code., code/) holds every descendant code
+            'code_from': account_code + '.',
+            'code_until': account_code + '/',
+            'date_from': date_from.isoformat(),
+            'date_until': date_until.isoformat(),
+        }
+        with FFDB.db_session:
+            if FFDB.db.Account.get(code=account_code) is None:
+                raise EntryNotFound(account_code)
+
+            opening = FFDB.db.select(
+                f'SELECT COALESCE(SUM(ROUND("e"."amount" * "e"."exchange_rate", 2) * (1 - 2 * "e"."side")), 0) '
+                f'FROM ({sql_entries}) AS "e" '
+                f'JOIN "Account" AS "a" ON "a"."id" = "e"."account" '
+                f'JOIN "Voucher" AS "v" ON "v"."id" = "e"."voucher" '
+                f'WHERE {sql_subtree} AND "v"."date" < $date_from',
+                globals={}, locals=params
+            )[0]
+            rows = FFDB.db.select(
+                f'SELECT "v"."date", "v"."number", "e"."brief", "a"."qualname", "e"."currency", '
+                f'"e"."exchange_rate", "e"."amount", "e"."side" '
+                f'FROM ({sql_entries}) AS "e" '
+                f'JOIN "Account" AS "a" ON "a"."id" = "e"."account" '
+                f'JOIN "Voucher" AS "v" ON "v"."id" = "e"."voucher" '
+                f'WHERE {sql_subtree} AND "v"."date" >= $date_from AND "v"."date" <= $date_until '
+                f'ORDER BY "v"."date", "v"."number", "e"."side", "e"."id"',
+                globals={}, locals=params
+            )
+
+        opening_balance = FloatWithPrecision(opening)
+        balance = opening_balance
+        entries = []
+        for date, number, brief, qualname, currency, exchange_rate, amount, side in rows:
+            local_amount = FloatWithPrecision(amount * exchange_rate)
+            if side == 0:
+                balance += local_amount
+                entries.append(LedgerEntry(
+                    datetime.date.fromisoformat(date), number, brief, qualname, currency, exchange_rate,
+                    amount, None, local_amount, None, balance
+                ))
+            else:
+                balance -= local_amount
+                entries.append(LedgerEntry(
+                    datetime.date.fromisoformat(date), number, brief, qualname, currency, exchange_rate,
+                    None, amount, None, local_amount, balance
+                ))
+        # 1for
+        return opening_balance, entries
+
     @staticmethod
     def previewExchangeGainsAndLosses(month: datetime.date):
 
@@ -1010,31 +1579,50 @@ class System:
             return BalanceSheetTemplate(bste)
 
     @staticmethod
+    @mutating
     def createBalanceSheetTemplate(name: str):
         with FFDB.db_session:
             bste = FFDB.db.BalanceSheetTemplate(name=name)
             if bste is None:
                 raise EntryNotFound(name)
-            return BalanceSheetTemplate(bste)
+            bste = BalanceSheetTemplate(bste)
+        # !with
+        System.__publish(events.BalanceSheetTemplateCreated(name))
+        return bste
 
     @staticmethod
+    @mutating
     def deleteBalanceSheetTemplate(name: str):
         with FFDB.db_session:
             bste = FFDB.db.BalanceSheetTemplate.get(name=name)
             if bste is None:
                 raise EntryNotFound(name)
             bste.delete()
+        # !with
+        System.__publish(events.BalanceSheetTemplateDeleted(name))
 
     @staticmethod
+    @mutating
     def changeBalanceSheetTemplateName(old_name: str, new_name: str):
         with FFDB.db_session:
             bste = FFDB.db.BalanceSheetTemplate.get(name=old_name)
             if bste is None:
                 raise EntryNotFound(old_name)
             bste.name = new_name
+        # !with
+        System.__publish(events.BalanceSheetTemplateRenamed(old_name, new_name))
 
     @staticmethod
     def balanceSheet(template: BalanceSheetTemplate, date_until: datetime.date):
+        """"""
+        beginnings, endings = System.__state().report_cache.getOrCompute(
+            ('balanceSheet', tuple((e.line_number, e.formula) for e in template.entries), date_until),
+            lambda: System.__balanceSheet(template, date_until)
+        )
+        return beginnings.copy(), endings.copy()
+
+    @staticmethod
+    def __balanceSheet(template: BalanceSheetTemplate, date_until: datetime.date):
         """"""
         date_from = first_day_of_year(date_until)
 
@@ -1068,6 +1656,7 @@ class System:
         return beginnings, endings
 
     @staticmethod
+    @mutating
     def updateBalanceSheetTemplate(name: str, asset_entries, liability_entries):
         with FFDB.db_session:
             bste = FFDB.db.BalanceSheetTemplate.get(name=name)
@@ -1095,3 +1684,5 @@ class System:
                     line_number = lineno,
                     formula = formula or ''
                 )
+        # !with
+        System.__publish(events.BalanceSheetTemplateUpdated(name))
@@ -14,24 +14,117 @@
     limitations under the License.
 """
 
-from pony.orm import Database, Required, Optional, Set, PrimaryKey, db_session
+from pony.orm import Database, Required, Optional, Set, PrimaryKey, composite_index, db_session
+import contextvars
 import datetime
 import pathlib
+import sqlite3
+import typing
 
 
-class FFDB:
+# books written before Account kept its place in the hierarchy, the indices are created by the mapping
+MIGRATE_ACCOUNT_HIERARCHY = '''
+BEGIN;
+ALTER TABLE "Account" ADD COLUMN "depth" INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE "Account" ADD COLUMN "is_leaf" BOOLEAN NOT NULL DEFAULT 1;
+UPDATE "Account" SET
+    "depth" = LENGTH("code") - LENGTH(REPLACE("code", '.', '')),
+    "is_leaf" = NOT EXISTS (SELECT 1 FROM "Account" AS "c" WHERE "c"."parent" = "Account"."id");
+COMMIT;
+'''
+
+
+# the open book of the current context, any object with a ``db`` attribute, None for the default book
+ACTIVE_BOOK: contextvars.ContextVar = contextvars.ContextVar('ACTIVE_BOOK', default=None)
+
+
+class _FFDBType(type):
+
+    @property
+    def db(cls) -> typing.Optional[Database]:
+        book = ACTIVE_BOOK.get()
+        return cls._default_db if book is None else book.db
+
+    @db.setter
+    def db(cls, db: typing.Optional[Database]):
+        book = ACTIVE_BOOK.get()
+        if book is None:
+            cls._default_db = db
+        else:
+            book.db = db
+
+
+class FFDB(metaclass=_FFDBType):
+    """
+    The Pony database of the active book. Pony keeps a connection per thread, each
+    one set up by :meth:`setupConnection`: the book is in WAL mode so that readers
+    never wait for the writer, and a writer waits up to BUSY_TIMEOUT_MS for another
+    writer, e.g. another process, instead of failing with SQLITE_BUSY.
+    """
 
     db_session = db_session
-    db = None
+    BUSY_TIMEOUT_MS = 10000
+    _default_db: typing.Optional[Database] = None
 
     @staticmethod
     def bindDatabase(filename: pathlib.Path):
-
-        if FFDB.db:
+        """
+        Binds the database of the active book to ``filename``. The entities are
+        defined and mapped once per database, on its first bind. Later binds only
+        close the connection and point the connection pool to ``filename``,
+        creating the tables of a new book. A book of an earlier version is migrated
+        first, see migrate.
+
+        Only the connection of the calling thread is closed. A connection another
+        thread still holds, e.g. of a prefetch or a report job, stays open on the
+        previous book until that thread disconnects or the pool is collected, so
+        bind while no other thread uses the database, see System.
+        """
+        if FFDB.db is None:
+            FFDB.db = FFDB.openDatabase(filename)
+        else:
             FFDB.db.disconnect()
-        #
+            FFDB.migrate(filename)
+            # provider.pool and provider.get_pool are not public, as of Pony 0.7.20
+            FFDB.db.provider.pool = FFDB.db.provider.get_pool(False, str(pathlib.Path(filename).absolute()),
+                                                              create_db=True)
+            FFDB.db.create_tables(check_tables=True)
+
+    @staticmethod
+    def openDatabase(filename: pathlib.Path) -> Database:
+        """A new database with its own entities, bound to ``filename``"""
+        FFDB.migrate(filename)
         db = Database()
+        db.on_connect(provider='sqlite')(FFDB.setupConnection)
+        FFDB.defineEntities(db)
+        db.bind(provider='sqlite', filename=str(pathlib.Path(filename).absolute()), create_db=True)
+        db.generate_mapping(create_tables=True)
+        return db
+
+    @staticmethod
+    def setupConnection(db: Database, connection):
+        connection.execute(f'PRAGMA busy_timeout = {FFDB.BUSY_TIMEOUT_MS}')
+        connection.execute('PRAGMA journal_mode = WAL')
+
+    @staticmethod
+    def migrate(filename: pathlib.Path):
+        """
+        Upgrades the book ``filename`` written by an earlier version in place, before
+        the entities are mapped to it. A new or current book is left as it is.
+        """
+        filename = pathlib.Path(filename)
+        if not filename.is_file():
+            return
+        connection = sqlite3.connect(str(filename))
+        try:
+            columns = {row[1] for row in connection.execute('PRAGMA table_info("Account")')}
+            if columns and 'depth' not in columns:
+                connection.executescript(MIGRATE_ACCOUNT_HIERARCHY)
+        finally:
+            connection.close()
 
+    @staticmethod
+    def defineEntities(db: Database):
 
         class Meta(db.Entity):
             id = PrimaryKey(int, auto=True)
@@ -66,8 +159,12 @@ class FFDB:
             is_custom = Required(bool, default=True)                          # 是否为用户自定义科目
             parent = Optional('Account')                                      # 父科目，可以为 None，表示顶级科目
             children = Set('Account', reverse='parent')               # 子科目集合，reverse='parent' 表示从子科目反向查找父科目
+            depth = Required(int, default=0)                          # 层级，顶级科目为 0
+            is_leaf = Required(bool, default=True)                    # 是否为末级科目
             debit_entries = Set('DebitEntry', reverse='account')      # 借方条目集合
             credit_entries = Set('CreditEntry', reverse='account')    # 贷方条目集合
+            # the leaves of a subtree are a range of codes, see System.__leaves
+            composite_index(is_leaf, code)
 
         # 定义 DebitEntry 实体，表示借方的具体条目
         class DebitEntry(db.Entity):
@@ -117,8 +214,3 @@ class FFDB:
             id = PrimaryKey(int, auto=True)
             account_code = Required(str, unique=True)
             hits = Required(int, default=0)
-
-        db.bind(provider='sqlite', filename=str(filename), create_db=True)
-        db.generate_mapping(create_tables=True)
-
-        FFDB.db = db
\ No newline at end of file
@@ -1,618 +0,0 @@
-"""
-    Copyright 2024- ZiJian Jiang @ https://github.com/CallmeNezha
-
-    Licensed under the Apache License, Version 2.0 (the "License");
-    you may not use this file except in compliance with the License.
-    You may obtain a copy of the License at
-
-       http://www.apache.org/licenses/LICENSE-2.0
-
-    Unless required by applicable law or agreed to in writing, software
-    distributed under the License is distributed on an "AS IS" BASIS,
-    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
-    See the License for the specific language governing permissions and
-    limitations under the License.
-"""
-
-
-# https://www.jdy.com/new-tools/1572853334828711937.html
-ACCOUNTS_GENERAL_STANDARD_2018 = {
-    '资产类': [
-        {'科目代码': '1001', '科目名称': '库存现金', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1002', '科目名称': '银行存款', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1002.01', '科目名称': '基本存款账户', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1002.02', '科目名称': '一般存款账户', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1004', '科目名称': '备用金', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1012', '科目名称': '其他货币资金', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1012.01', '科目名称': '外埠存款', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1012.02', '科目名称': '银行汇票', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1012.03', '科目名称': '银行本票', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1012.04', '科目名称': '信用卡', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1012.05', '科目名称': '信用证保证金', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1012.06', '科目名称': '存出投资款', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1101', '科目名称': '交易性金融资产', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1101.01', '科目名称': '本金', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1101.02', '科目名称': '公允价值变动', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1121', '科目名称': '应收票据', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1122', '科目名称': '应收账款', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1123', '科目名称': '预付账款', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1123.01', '科目名称': '预付货款', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1131', '科目名称': '应收股利', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1132', '科目名称': '应收利息', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1221', '科目名称': '其他应收款', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1221.01', '科目名称': '应收单位款', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1221.02', '科目名称': '应收个人款', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1231', '科目名称': '坏账准备', '余额方向': '贷', '科目类别': '流动资产'},
-        {'科目代码': '1321', '科目名称': '代理业务资产', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1401', '科目名称': '材料采购', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1402', '科目名称': '在途物资', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1403', '科目名称': '原材料', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1404', '科目名称': '材料成本差异', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1405', '科目名称': '库存商品', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1406', '科目名称': '发出商品', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1407', '科目名称': '商品进销差价', '余额方向': '贷', '科目类别': '流动资产'},
-        {'科目代码': '1408', '科目名称': '委托加工物资', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1411', '科目名称': '周转材料', '余额方向': '借', '科目类别': '流动资产'},
-        {'科目代码': '1471', '科目名称': '存货跌价准备', '余额方向': '贷', '科目类别': '流动资产'},
-        {'科目代码': '1501', '科目名称': '持有至到期投资', '余额方向': '借', '科目类别': '长期资产'},
-        {'科目代码': '1501.01', '科目名称': '投资成本', '余额方向': '借', '科目类别': '长期资产'},
-        {'科目代码': '1501.02', '科目名称': '损益调整', '余额方向': '借', '科目类别': '长期资产'},
-        {'科目代码': '1501.03', '科目名称': '所有者权益其他变动', '余额方向': '借',
-         '科目类别': '长期资产'},
-        {'科目代码': '1502', '科目名称': '持有至到期投资减值准备', '余额方向': '贷',
-         '科目类别': '长期资产'},
-        {'科目代码': '1503', '科目名称': '可供出售金融资产', '余额方向': '借', '科目类别': '长期资产'},
-        {'科目代码': '1503.01', '科目名称': '成本', '余额方向': '借', '科目类别': '长期资产'},
-        {'科目代码': '1503.02', '科目名称': '公允价值变动', '余额方向': '借', '科目类别': '长期资产'},
-        {'科目代码': '1503.03', '科目名称': '减值准备', '余额方向': '借', '科目类别': '长期资产'},
-        {'科目代码': '1511', '科目名称': '长期股权投资', '余额方向': '借', '科目类别': '长期资产'},
-        {'科目代码': '1511.01', '科目名称': '投资成本', '余额方向': '借', '科目类别': '长期资产'},
-        {'科目代码': '1511.02', '科目名称': '损益调整', '余额方向': '借', '科目类别': '长期资产'},
-        {'科目代码': '1511.03', '科目名称': '所有者权益其他变动', '余额方向': '借',
-         '科目类别': '长期资产'},
-        {'科目代码': '1512', '科目名称': '长期股权投资减值准备', '余额方向': '贷',
-         '科目类别': '长期资产'},
-        {'科目代码': '1521', '科目名称': '投资性房地产', '余额方向': '借', '科目类别': '长期资产'},
-        {'科目代码': '1521.01', '科目名称': '成本', '余额方向': '借', '科目类别': '长期资产'},
-        {'科目代码': '1521.02', '科目名称': '公允价值变动', '余额方向': '借', '科目类别': '长期资产'},
-        {'科目代码': '1531', '科目名称': '长期应收款', '余额方向': '借', '科目类别': '长期资产'},
-        {'科目代码': '1532', '科目名称': '未实现融资收益', '余额方向': '贷', '科目类别': '长期资产'},
-        {'科目代码': '1601', '科目名称': '固定资产', '余额方向': '借', '科目类别': '长期资产'},
-        {'科目代码': '1602', '科目名称': '累计折旧', '余额方向': '贷', '科目类别': '长期资产'},
-        {'科目代码': '1603', '科目名称': '固定资产减值准备', '余额方向': '贷', '科目类别': '长期资产'},
-        {'科目代码': '1604', '科目名称': '在建工程', '余额方向': '借', '科目类别': '长期资产'},
-        {'科目代码': '1605', '科目名称': '工程物资', '余额方向': '借', '科目类别': '长期资产'},
-        {'科目代码': '1605.01', '科目名称': '专用材料', '余额方向': '借', '科目类别': '长期资产'},
-        {'科目代码': '1605.02', '科目名称': '专用设备', '余额方向': '借', '科目类别': '长期资产'},
-        {'科目代码': '1605.03', '科目名称': '预付大型设备款', '余额方向': '借', '科目类别': '长期资产'},
-        {'科目代码': '1605.04', '科目名称': '为生产准备的工具及器具', '余额方向': '借', '科目类别': '长期资产'},
-        {'科目代码': '1606', '科目名称': '固定资产清理', '余额方向': '借', '科目类别': '长期资产'},
-        {'科目代码': '1701', '科目名称': '无形资产', '余额方向': '借', '科目类别': '长期资产'},
-        {'科目代码': '1702', '科目名称': '累计摊销', '余额方向': '贷', '科目类别': '长期资产'},
-        {'科目代码': '1703', '科目名称': '无形资产减值准备', '余额方向': '贷', '科目类别': '长期资产'},
-        {'科目代码': '1711', '科目名称': '商誉', '余额方向': '借', '科目类别': '长期资产'},
-        {'科目代码': '1801', '科目名称': '长期待摊费用', '余额方向': '借', '科目类别': '长期资产'},
-        {'科目代码': '1811', '科目名称': '递延所得税资产', '余额方向': '借', '科目类别': '长期资产'},
-        {'科目代码': '1901', '科目名称': '待处理财产损溢', '余额方向': '借', '科目类别': '流动资产'}
-    ],
-    '负债类': [
-        {'科目代码': '2001', '科目名称': '短期借款', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2101', '科目名称': '交易性金融负债', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2101.01', '科目名称': '本金', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2101.02', '科目名称': '公允价值变动', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2201', '科目名称': '应付票据', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2202', '科目名称': '应付账款', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2203', '科目名称': '预收账款', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2211', '科目名称': '应付职工薪酬', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2211.01', '科目名称': '工资', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2211.02', '科目名称': '职工福利', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2211.03', '科目名称': '社会保险费', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2211.04', '科目名称': '住房公积金', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2211.05', '科目名称': '工会经费', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2211.06', '科目名称': '职工教育经费', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2211.07', '科目名称': '解除职工劳动关系补偿', '余额方向': '贷',
-         '科目类别': '流动负债'},
-        {'科目代码': '2221', '科目名称': '应交税费', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2221.01', '科目名称': '增值税', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2221.01.01', '科目名称': '进项税额', '余额方向': '借', '科目类别': '流动负债'},
-        {'科目代码': '2221.01.02', '科目名称': '销项税额', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2221.01.03', '科目名称': '出口抵减内销产品应纳税额', '余额方向': '借',
-         '科目类别': '流动负债'},
-        {'科目代码': '2221.01.04', '科目名称': '进项税额转出', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2221.01.05', '科目名称': '出口退税', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2221.01.06', '科目名称': '已交税金', '余额方向': '借', '科目类别': '流动负债'},
-        {'科目代码': '2221.01.07', '科目名称': '转出未交增值税', '余额方向': '借',
-         '科目类别': '流动负债'},
-        {'科目代码': '2221.01.08', '科目名称': '销项税额抵减', '余额方向': '借', '科目类别': '流动负债'},
-        {'科目代码': '2221.01.09', '科目名称': '减免税款', '余额方向': '借', '科目类别': '流动负债'},
-        {'科目代码': '2221.01.10', '科目名称': '转出多交增值税', '余额方向': '贷',
-         '科目类别': '流动负债'},
-        {'科目代码': '2221.02', '科目名称': '未交增值税', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2221.03', '科目名称': '消费税', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2221.04', '科目名称': '企业所得税', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2221.05', '科目名称': '城市维护建设税', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2221.06', '科目名称': '资源税', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2221.07', '科目名称': '土地增值税', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2221.08', '科目名称': '城镇土地使用税', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2221.09', '科目名称': '房产税', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2221.10', '科目名称': '教育费附加', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2221.11', '科目名称': '车船税', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2221.12', '科目名称': '矿产资源补偿费', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2221.13', '科目名称': '排污费', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2221.14', '科目名称': '个人所得税', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2221.15', '科目名称': '预交增值税', '余额方向': '借', '科目类别': '流动负债'},
-        {'科目代码': '2221.16', '科目名称': '待抵扣进项税', '余额方向': '借', '科目类别': '流动负债'},
-        {'科目代码': '2221.17', '科目名称': '待认证进项税', '余额方向': '借', '科目类别': '流动负债'},
-        {'科目代码': '2221.18', '科目名称': '待转销项税额', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2221.19', '科目名称': '增值税留抵税额', '余额方向': '借', '科目类别': '流动负债'},
-        {'科目代码': '2221.20', '科目名称': '简易计税', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2221.21', '科目名称': '转让金融商品应交增值税', '余额方向': '贷',
-         '科目类别': '流动负债'},
-        {'科目代码': '2221.22', '科目名称': '代扣代交增值税', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2231', '科目名称': '应付利息', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2232', '科目名称': '应付股利', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2241', '科目名称': '其他应付款', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2241.01', '科目名称': '个人', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2241.02', '科目名称': '客户', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2314', '科目名称': '代理业务负债', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2401', '科目名称': '递延收益', '余额方向': '贷', '科目类别': '长期负债'},
-        {'科目代码': '2501', '科目名称': '长期借款', '余额方向': '贷', '科目类别': '长期负债'},
-        {'科目代码': '2501.01', '科目名称': '本金', '余额方向': '贷', '科目类别': '长期负债'},
-        {'科目代码': '2501.02', '科目名称': '利息调整', '余额方向': '贷', '科目类别': '长期负债'},
-        {'科目代码': '2502', '科目名称': '应付债券', '余额方向': '贷', '科目类别': '长期负债'},
-        {'科目代码': '2502.01', '科目名称': '面值', '余额方向': '贷', '科目类别': '长期负债'},
-        {'科目代码': '2502.02', '科目名称': '利息调整', '余额方向': '贷', '科目类别': '长期负债'},
-        {'科目代码': '2502.03', '科目名称': '应计利息', '余额方向': '贷', '科目类别': '长期负债'},
-        {'科目代码': '2701', '科目名称': '长期应付款', '余额方向': '贷', '科目类别': '长期负债'},
-        {'科目代码': '2702', '科目名称': '未确认融资费用', '余额方向': '借', '科目类别': '长期负债'},
-        {'科目代码': '2711', '科目名称': '专项应付款', '余额方向': '贷', '科目类别': '长期负债'},
-        {'科目代码': '2801', '科目名称': '预计负债', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2801.01', '科目名称': '对外提供担保', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2801.02', '科目名称': '未决诉讼', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2801.03', '科目名称': '产品质量保证', '余额方向': '贷', '科目类别': '流动负债'},
-        {'科目代码': '2901', '科目名称': '递延所得税负债', '余额方向': '贷', '科目类别': '长期负债'}
-    ],
-    '共同类': [
-        {'科目代码': '3101', '科目名称': '衍生工具', '余额方向': '借', '科目类别': '共同类'},
-        {'科目代码': '3201', '科目名称': '套期工具', '余额方向': '借', '科目类别': '共同类'},
-        {'科目代码': '3202', '科目名称': '被套期项目', '余额方向': '借', '科目类别': '共同类'}
-    ],
-    '权益类': [
-        {'科目代码': '4001', '科目名称': '实收资本', '余额方向': '贷', '科目类别': '所有者权益'},
-        {'科目代码': '4002', '科目名称': '资本公积', '余额方向': '贷', '科目类别': '所有者权益'},
-        {'科目代码': '4002.01', '科目名称': '资本溢价', '余额方向': '贷', '科目类别': '所有者权益'},
-        {'科目代码': '4002.02', '科目名称': '股本溢价', '余额方向': '贷', '科目类别': '所有者权益'},
-        {'科目代码': '4002.03', '科目名称': '其他资本公积', '余额方向': '贷', '科目类别': '所有者权益'},
-        {'科目代码': '4101', '科目名称': '盈余公积', '余额方向': '贷', '科目类别': '所有者权益'},
-        {'科目代码': '4101.01', '科目名称': '法定盈余公积', '余额方向': '贷', '科目类别': '所有者权益'},
-        {'科目代码': '4101.02', '科目名称': '任意盈余公积', '余额方向': '贷', '科目类别': '所有者权益'},
-        {'科目代码': '4101.03', '科目名称': '储备基金', '余额方向': '贷', '科目类别': '所有者权益'},
-        {'科目代码': '4101.04', '科目名称': '企业发展基金', '余额方向': '贷', '科目类别': '所有者权益'},
-        {'科目代码': '4101.05', '科目名称': '利润归还投资', '余额方向': '贷', '科目类别': '所有者权益'},
-        {'科目代码': '4103', '科目名称': '本年利润', '余额方向': '贷', '科目类别': '所有者权益'},
-        {'科目代码': '4104', '科目名称': '利润分配', '余额方向': '贷', '科目类别': '所有者权益'},
-        {'科目代码': '4104.01', '科目名称': '提取法定盈余公积', '余额方向': '贷',
-         '科目类别': '所有者权益'},
-        {'科目代码': '4104.02', '科目名称': '提取任意盈余公积', '余额方向': '贷',
-         '科目类别': '所有者权益'},
-        {'科目代码': '4104.03', '科目名称': '应付普通股股利', '余额方向': '贷',
-         '科目类别': '所有者权益'},
-        {'科目代码': '4104.04', '科目名称': '转作股本的股利', '余额方向': '贷',
-         '科目类别': '所有者权益'},
-        {'科目代码': '4104.05', '科目名称': '盈余公积补亏', '余额方向': '贷', '科目类别': '所有者权益'},
-        {'科目代码': '4104.06', '科目名称': '未分配利润', '余额方向': '贷', '科目类别': '所有者权益'},
-        {'科目代码': '4104.07', '科目名称': '提取储备基金', '余额方向': '贷', '科目类别': '所有者权益'},
-        {'科目代码': '4104.08', '科目名称': '提取企业发展基金', '余额方向': '贷',
-         '科目类别': '所有者权益'},
-        {'科目代码': '4104.09', '科目名称': '提取职工奖励及福利基金', '余额方向': '贷',
-         '科目类别': '所有者权益'},
-        {'科目代码': '4104.10', '科目名称': '利润归还投资', '余额方向': '贷', '科目类别': '所有者权益'},
-        {'科目代码': '4201', '科目名称': '库存股', '余额方向': '借', '科目类别': '所有者权益'}
-    ],
-    '成本类': [
-        {'科目代码': '5001', '科目名称': '生产成本', '余额方向': '借', '科目类别': '成本'},
-        {'科目代码': '5101', '科目名称': '制造费用', '余额方向': '借', '科目类别': '成本'},
-        {'科目代码': '5201', '科目名称': '劳务成本', '余额方向': '借', '科目类别': '成本'},
-        {'科目代码': '5301', '科目名称': '研发支出', '余额方向': '借', '科目类别': '成本'},
-        {'科目代码': '5301.01', '科目名称': '费用化支出', '余额方向': '借', '科目类别': '成本'},
-        {'科目代码': '5301.02', '科目名称': '资本化支出', '余额方向': '借', '科目类别': '成本'}
-    ],
-    '损益类': [
-        {'科目代码': '6001', '科目名称': '主营业务收入', '余额方向': '贷', '科目类别': '营业收入'},
-        {'科目代码': '6001.01', '科目名称': '销售商品收入', '余额方向': '贷', '科目类别': '营业收入'},
-        {'科目代码': '6001.01.01', '科目名称': '一般商品销售收入', '余额方向': '贷', '科目类别': '营业收入'},
-        {'科目代码': '6001.01.02', '科目名称': '非货币性资产交换收入', '余额方向': '贷', '科目类别': '营业收入'},
-        {'科目代码': '6001.02', '科目名称': '提供劳务收入', '余额方向': '贷', '科目类别': '营业收入'},
-        {'科目代码': '6001.03', '科目名称': '造合同收入', '余额方向': '贷', '科目类别': '营业收入'},
-        {'科目代码': '6001.04', '科目名称': '让渡资产使用权收入', '余额方向': '贷',
-         '科目类别': '营业收入'},
-        {'科目代码': '6051', '科目名称': '其他业务收入', '余额方向': '贷', '科目类别': '其他收益'},
-        {'科目代码': '6051.01', '科目名称': '销售材料收入', '余额方向': '贷', '科目类别': '其他收益'},
-        {'科目代码': '6051.01.01', '科目名称': '一般销售材料收入', '余额方向': '贷',
-         '科目类别': '其他收益'},
-        {'科目代码': '6051.01.02', '科目名称': '非货币性资产交换收入', '余额方向': '贷',
-         '科目类别': '其他收益'},
-        {'科目代码': '6051.02', '科目名称': '出租固定资产收入', '余额方向': '贷',
-         '科目类别': '其他收益'},
-        {'科目代码': '6051.03', '科目名称': '出租无形资产收入', '余额方向': '贷',
-         '科目类别': '其他收益'},
-        {'科目代码': '6051.04', '科目名称': '出租包装物和商品收入', '余额方向': '贷',
-         '科目类别': '其他收益'},
-        {'科目代码': '6101', '科目名称': '公允价值变动损益', '余额方向': '贷', '科目类别': '其他收益'},
-        {'科目代码': '6111', '科目名称': '投资收益', '余额方向': '贷', '科目类别': '其他收益'},
-        {'科目代码': '6301', '科目名称': '营业外收入', '余额方向': '贷', '科目类别': '其他收益'},
-        {'科目代码': '6301.01', '科目名称': '处置非流动资产利得', '余额方向': '贷',
-         '科目类别': '其他收益'},
-        {'科目代码': '6301.02', '科目名称': '非货币性资产交换利得', '余额方向': '贷',
-         '科目类别': '其他收益'},
-        {'科目代码': '6301.03', '科目名称': '债务重组利得', '余额方向': '贷', '科目类别': '其他收益'},
-        {'科目代码': '6301.04', '科目名称': '罚没利得', '余额方向': '贷', '科目类别': '其他收益'},
-        {'科目代码': '6301.05', '科目名称': '政府补助利得', '余额方向': '贷', '科目类别': '其他收益'},
-        {'科目代码': '6301.06', '科目名称': '确实无法偿付的应付款项', '余额方向': '贷',
-         '科目类别': '其他收益'},
-        {'科目代码': '6301.07', '科目名称': '捐赠利得', '余额方向': '贷', '科目类别': '其他收益'},
-        {'科目代码': '6301.08', '科目名称': '汇兑收益', '余额方向': '贷', '科目类别': '其他收益'},
-        {'科目代码': '6401', '科目名称': '主营业务成本', '余额方向': '借', '科目类别': '营业成本及税金'},
-        {'科目代码': '6401.01', '科目名称': '销售商品成本', '余额方向': '借',
-         '科目类别': '营业成本及税金'},
-        {'科目代码': '6401.01.01', '科目名称': '一般商品销售成本', '余额方向': '借',
-         '科目类别': '营业成本及税金'},
-        {'科目代码': '6401.01.02', '科目名称': '非货币性资产交换成本', '余额方向': '借',
-         '科目类别': '营业成本及税金'},
-        {'科目代码': '6401.02', '科目名称': '提供劳务成本', '余额方向': '借',
-         '科目类别': '营业成本及税金'},
-        {'科目代码': '6401.03', '科目名称': '建造合同成本', '余额方向': '借',
-         '科目类别': '营业成本及税金'},
-        {'科目代码': '6401.04', '科目名称': '让渡资产使用权成本', '余额方向': '借',
-         '科目类别': '营业成本及税金'},
-        {'科目代码': '6401.05', '科目名称': '其他', '余额方向': '借', '科目类别': '营业成本及税金'},
-        {'科目代码': '6402', '科目名称': '其他业务成本', '余额方向': '借', '科目类别': '其他损失'},
-        {'科目代码': '6402.01', '科目名称': '材料销售成本', '余额方向': '借', '科目类别': '其他损失'},
-        {'科目代码': '6402.01.01', '科目名称': '一般材料销售成本', '余额方向': '借',
-         '科目类别': '其他损失'},
-        {'科目代码': '6402.01.02', '科目名称': '非货币性资产交换成本', '余额方向': '借',
-         '科目类别': '其他损失'},
-        {'科目代码': '6402.02', '科目名称': '出租固定资产成本', '余额方向': '借',
-         '科目类别': '其他损失'},
-        {'科目代码': '6402.03', '科目名称': '出租无形资产成本', '余额方向': '借',
-         '科目类别': '其他损失'},
-        {'科目代码': '6402.04', '科目名称': '包装物出租成本', '余额方向': '借', '科目类别': '其他损失'},
-        {'科目代码': '6402.05', '科目名称': '其他', '余额方向': '借', '科目类别': '其他损失'},
-        {'科目代码': '6403', '科目名称': '税金及附加', '余额方向': '借', '科目类别': '营业成本及税金'},
-        {'科目代码': '6601', '科目名称': '销售费用', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6601.01', '科目名称': '职工薪酬', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6601.02', '科目名称': '业务费', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6601.03', '科目名称': '折旧费', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6601.04', '科目名称': '差旅费', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6601.05', '科目名称': '保险费', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6601.06', '科目名称': '包装费', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6601.07', '科目名称': '展览费和广告费', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6601.08', '科目名称': '商品维修费', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6601.09', '科目名称': '预计产品质量保证损失', '余额方向': '借',
-         '科目类别': '期间费用'},
-        {'科目代码': '6601.10', '科目名称': '运输费', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6601.11', '科目名称': '装卸费', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6602', '科目名称': '管理费用', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6602.01', '科目名称': '职工薪酬', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6602.02', '科目名称': '折旧', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6602.03', '科目名称': '办公费', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6602.04', '科目名称': '差旅费', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6602.05', '科目名称': '工会经费', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6602.06', '科目名称': '董事会费', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6602.07', '科目名称': '业务招待费', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6602.08', '科目名称': '租赁费', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6602.09', '科目名称': '水电费', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6602.10', '科目名称': '房产税', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6602.11', '科目名称': '车船使用税', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6602.12', '科目名称': '土地使用税', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6602.13', '科目名称': '印花税', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6602.14', '科目名称': '矿产资源补偿费', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6602.15', '科目名称': '排污费', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6602.16', '科目名称': '无形资产摊销', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6602.17', '科目名称': '长期待摊费用摊销', '余额方向': '借',
-         '科目类别': '期间费用'},
-        {'科目代码': '6603', '科目名称': '财务费用', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6603.01', '科目名称': '利息支出', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6603.02', '科目名称': '利息收入', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6603.03', '科目名称': '汇兑差额', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6603.04', '科目名称': '手续费', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6603.05', '科目名称': '现金折扣', '余额方向': '借', '科目类别': '期间费用'},
-        {'科目代码': '6701', '科目名称': '资产减值损失', '余额方向': '借', '科目类别': '其他损失'},
-        {'科目代码': '6711', '科目名称': '营业外支出', '余额方向': '借', '科目类别': '其他损失'},
-        {'科目代码': '6711.01', '科目名称': '处置非流动资产损失', '余额方向': '借',
-         '科目类别': '其他损失'},
-        {'科目代码': '6711.02', '科目名称': '非货币性资产交换损失', '余额方向': '借',
-         '科目类别': '其他损失'},
-        {'科目代码': '6711.03', '科目名称': '债务重组损失', '余额方向': '借', '科目类别': '其他损失'},
-        {'科目代码': '6711.04', '科目名称': '罚款支出', '余额方向': '借', '科目类别': '其他损失'},
-        {'科目代码': '6711.05', '科目名称': '捐赠支出', '余额方向': '借', '科目类别': '其他损失'},
-        {'科目代码': '6711.06', '科目名称': '非常损失', '余额方向': '借', '科目类别': '其他损失'},
-        {'科目代码': '6711.07', '科目名称': '赞助支出', '余额方向': '借', '科目类别': '其他损失'},
-        {'科目代码': '6711.08', '科目名称': '罚没支出', '余额方向': '借', '科目类别': '其他损失'},
-        {'科目代码': '6711.09', '科目名称': '坏账损失', '余额方向': '借', '科目类别': '其他损失'},
-        {'科目代码': '6711.10', '科目名称': '无法收回的债券股权投资损失', '余额方向': '借',
-         '科目类别': '其他损失'},
-        {'科目代码': '6801', '科目名称': '所得税费用', '余额方向': '借', '科目类别': '所得税'},
-        {'科目代码': '6801.01', '科目名称': '当期所得税费用', '余额方向': '借', '科目类别': '所得税'},
-        {'科目代码': '6801.02', '科目名称': '递延所得税费用', '余额方向': '借', '科目类别': '所得税'},
-        {'科目代码': '6901', '科目名称': '以前年度损益调整', '余额方向': '贷', '科目类别': '以前年度损益调整'}
-    ]
-}
-
-
-# https://www.jdy.com/new-tools/1572858155572985857.html
-ACCOUNTS_SMALL_STANDARD_2013 = {
-    '资产类': [
-        {'科目代码': '1001', '科目名称': '库存现金', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1002', '科目名称': '银行存款', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1012', '科目名称': '其他货币资金', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1101', '科目名称': '短期投资', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1101.01', '科目名称': '股票', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1101.02', '科目名称': '债券', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1101.03', '科目名称': '基金', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1101.10', '科目名称': '其他', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1121', '科目名称': '应收票据', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1122', '科目名称': '应收账款', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1123', '科目名称': '预付账款', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1131', '科目名称': '应收股利', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1132', '科目名称': '应收利息', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1221', '科目名称': '其他应收款', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1401', '科目名称': '材料采购', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1402', '科目名称': '在途物资', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1403', '科目名称': '原材料', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1404', '科目名称': '材料成本差异', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1405', '科目名称': '库存商品', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1407', '科目名称': '商品进销差价', '余额方向': '贷', '科目类别': ''},
-        {'科目代码': '1408', '科目名称': '委托加工物资', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1411', '科目名称': '周转材料', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1421', '科目名称': '消耗性生物资产', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1501', '科目名称': '长期债券投资', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1501.01', '科目名称': '债券投资', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1501.02', '科目名称': '其他债权投资', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1511', '科目名称': '长期股权投资', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1511.01', '科目名称': '股票投资', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1511.02', '科目名称': '其他股权投资', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1601', '科目名称': '固定资产', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1602', '科目名称': '累计折旧', '余额方向': '贷', '科目类别': ''},
-        {'科目代码': '1604', '科目名称': '在建工程', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1604.01', '科目名称': '建筑工程', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1604.02', '科目名称': '安装工程', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1604.03', '科目名称': '技术改造工程', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1604.04', '科目名称': '其他支出', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1605', '科目名称': '工程物资', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1606', '科目名称': '固定资产清理', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1621', '科目名称': '生产性生物资产', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1622', '科目名称': '生产性生物资产累计折旧', '余额方向': '贷', '科目类别': ''},
-        {'科目代码': '1701', '科目名称': '无形资产', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1702', '科目名称': '累计摊销', '余额方向': '贷', '科目类别': ''},
-        {'科目代码': '1801', '科目名称': '长期待摊费用', '余额方向': '借', '科目类别': ''},
-        {'科目代码': '1901', '科目名称': '待处理财产损溢', '余额方向': '借', '科目类别': ''}
-    ],
-    '负债类': [
-        {'科目代码': '2001', '科目名称': '短期借款', '余额方向': '贷'},
-        {'科目代码': '2201', '科目名称': '应付票据', '余额方向': '贷'},
-        {'科目代码': '2202', '科目名称': '应付账款', '余额方向': '贷'},
-        {'科目代码': '2203', '科目名称': '预收账款', '余额方向': '贷'},
-        {'科目代码': '2211', '科目名称': '应付职工薪酬', '余额方向': '贷'},
-        {'科目代码': '2221', '科目名称': '应交税费', '余额方向': '贷'},
-        {'科目代码': '2221.01', '科目名称': '应交增值税', '余额方向': '贷'},
-        {'科目代码': '2221.01.01', '科目名称': '进项税额', '余额方向': '借'},
-        {'科目代码': '2221.01.02', '科目名称': '销项税额的抵减', '余额方向': '借'},
-        {'科目代码': '2221.01.03', '科目名称': '已交税金', '余额方向': '借'},
-        {'科目代码': '2221.01.04', '科目名称': '转出未交增值税', '余额方向': '借'},
-        {'科目代码': '2221.01.05', '科目名称': '减免税款', '余额方向': '借'},
-        {'科目代码': '2221.01.06', '科目名称': '出口抵减内销产品应纳税额', '余额方向': '借'},
-        {'科目代码': '2221.01.07', '科目名称': '销项税额', '余额方向': '贷'},
-        {'科目代码': '2221.01.08', '科目名称': '出口退税', '余额方向': '贷'},
-        {'科目代码': '2221.01.09', '科目名称': '进项税额转出', '余额方向': '贷'},
-        {'科目代码': '2221.01.10', '科目名称': '转出多交增值税', '余额方向': '贷'},
-        {'科目代码': '2221.02', '科目名称': '未交增值税', '余额方向': '贷'},
-        {'科目代码': '2221.03', '科目名称': '预交增值税', '余额方向': '借'},
-        {'科目代码': '2221.04', '科目名称': '待抵扣进项税额', '余额方向': '借'},
-        {'科目代码': '2221.05', '科目名称': '待认证进项税额', '余额方向': '借'},
-        {'科目代码': '2221.06', '科目名称': '待转销项税额', '余额方向': '贷'},
-        {'科目代码': '2221.07', '科目名称': '增值税留抵税额', '余额方向': '借'},
-        {'科目代码': '2221.08', '科目名称': '简易计税', '余额方向': '贷'},
-        {'科目代码': '2221.09', '科目名称': '转让金融商品应交增值税', '余额方向': '贷'},
-        {'科目代码': '2221.10', '科目名称': '代扣代交增值税', '余额方向': '贷'},
-        {'科目代码': '2221.11', '科目名称': '应交所得税', '余额方向': '贷'},
-        {'科目代码': '2221.12', '科目名称': '应交个人所得税', '余额方向': '贷'},
-        {'科目代码': '2221.13', '科目名称': '教育费附加', '余额方向': '贷'},
-        {'科目代码': '2221.14', '科目名称': '地方教育费附加', '余额方向': '贷'},
-        {'科目代码': '2221.15', '科目名称': '应交资源税', '余额方向': '贷'},
-        {'科目代码': '2221.16', '科目名称': '应交土地增值税', '余额方向': '贷'},
-        {'科目代码': '2221.17', '科目名称': '应交城市维护建设税', '余额方向': '贷'},
-        {'科目代码': '2221.18', '科目名称': '应交房产税', '余额方向': '贷'},
-        {'科目代码': '2221.19', '科目名称': '应交土地使用税', '余额方向': '贷'},
-        {'科目代码': '2221.20', '科目名称': '应交车船使用税', '余额方向': '贷'},
-        {'科目代码': '2221.21', '科目名称': '应交消费税', '余额方向': '贷'},
-        {'科目代码': '2231', '科目名称': '应付利息', '余额方向': '贷'},
-        {'科目代码': '2232', '科目名称': '应付利润', '余额方向': '贷'},
-        {'科目代码': '2241', '科目名称': '其他应付款', '余额方向': '贷'},
-        {'科目代码': '2401', '科目名称': '递延收益', '余额方向': '贷'},
-        {'科目代码': '2501', '科目名称': '长期借款', '余额方向': '贷'},
-        {'科目代码': '2701', '科目名称': '长期应付款', '余额方向': '贷'},
-    ],
-    '所有者权益类': [
-        {'科目代码': '3001', '科目名称': '实收资本', '余额方向': '贷'},
-        {'科目代码': '3002', '科目名称': '资本公积', '余额方向': '贷'},
-        {'科目代码': '3002.01', '科目名称': '资本溢价', '余额方向': '贷'},
-        {'科目代码': '3002.02', '科目名称': '接受捐赠非现金资产准备', '余额方向': '贷'},
-        {'科目代码': '3002.06', '科目名称': '外币资本折算差额', '余额方向': '贷'},
-        {'科目代码': '3002.07', '科目名称': '其他资本公积', '余额方向': '贷'},
-        {'科目代码': '3101', '科目名称': '盈余公积', '余额方向': '借'},
-        {'科目代码': '3101.01', '科目名称': '法定盈余公积', '余额方向': '借'},
-        {'科目代码': '3101.02', '科目名称': '任意盈余公积', '余额方向': '借'},
-        {'科目代码': '3101.03', '科目名称': '法定公益金', '余额方向': '借'},
-        {'科目代码': '3103', '科目名称': '本年利润', '余额方向': '借'},
-        {'科目代码': '3104', '科目名称': '利润分配', '余额方向': '借'},
-        {'科目代码': '3104.01', '科目名称': '其他转入', '余额方向': '借'},
-        {'科目代码': '3104.02', '科目名称': '提取法定盈余公积', '余额方向': '借'},
-        {'科目代码': '3104.03', '科目名称': '提取法定公益金', '余额方向': '借'},
-        {'科目代码': '3104.09', '科目名称': '提取任意盈余公积', '余额方向': '借'},
-        {'科目代码': '3104.10', '科目名称': '应付利润', '余额方向': '借'},
-        {'科目代码': '3104.11', '科目名称': '转作资本的利润', '余额方向': '借'},
-        {'科目代码': '3104.15', '科目名称': '未分配利润', '余额方向': '贷'}
-    ],
-    '成本类': [
-        {'科目代码': '4001', '科目名称': '生产成本', '余额方向': '借'},
-        {'科目代码': '4001.01', '科目名称': '基本生产成本', '余额方向': '借'},
-        {'科目代码': '4001.02', '科目名称': '辅助生产成本', '余额方向': '借'},
-        {'科目代码': '4101', '科目名称': '制造费用', '余额方向': '借'},
-        {'科目代码': '4301', '科目名称': '研发支出', '余额方向': '借'},
-        {'科目代码': '4401', '科目名称': '工程施工', '余额方向': '借'},
-        {'科目代码': '4403', '科目名称': '机械作业', '余额方向': '借'}
-    ],
-    '损益类': [
-        {'科目代码': '5001', '科目名称': '主营业务收入', '余额方向': '贷'},
-        {'科目代码': '5051', '科目名称': '其他业务收入', '余额方向': '贷'},
-        {'科目代码': '5111', '科目名称': '投资收益', '余额方向': '贷'},
-        {'科目代码': '5301', '科目名称': '营业外收入', '余额方向': '贷'},
-        {'科目代码': '5301.01', '科目名称': '非流动资产处置净收益', '余额方向': '贷'},
-        {'科目代码': '5301.02', '科目名称': '政府补助', '余额方向': '贷'},
-        {'科目代码': '5301.03', '科目名称': '捐赠收益', '余额方向': '贷'},
-        {'科目代码': '5301.04', '科目名称': '盘盈收益', '余额方向': '贷'},
-        {'科目代码': '5301.05', '科目名称': '其他', '余额方向': '贷'},
-        {'科目代码': '5401', '科目名称': '主营业务成本', '余额方向': '借'},
-        {'科目代码': '5402', '科目名称': '其他业务成本', '余额方向': '借'},
-        {'科目代码': '5403', '科目名称': '税金及附加', '余额方向': '借'},
-        {'科目代码': '5403.01', '科目名称': '消费税', '余额方向': '借'},
-        {'科目代码': '5403.03', '科目名称': '城市维护建设税', '余额方向': '借'},
-        {'科目代码': '5403.04', '科目名称': '资源税', '余额方向': '借'},
-        {'科目代码': '5403.05', '科目名称': '土地增值税', '余额方向': '借'},
-        {'科目代码': '5403.06', '科目名称': '房产税', '余额方向': '借'},
-        {'科目代码': '5403.08', '科目名称': '车船税', '余额方向': '借'},
-        {'科目代码': '5403.09', '科目名称': '印花税', '余额方向': '借'},
-        {'科目代码': '5403.10', '科目名称': '教育费附加', '余额方向': '借'},
-        {'科目代码': '5403.11', '科目名称': '矿产资源补偿费', '余额方向': '借'},
-        {'科目代码': '5403.12', '科目名称': '排污费', '余额方向': '借'},
-        {'科目代码': '5403.13', '科目名称': '地方教育费附加', '余额方向': '借'},
-        {'科目代码': '5601', '科目名称': '销售费用', '余额方向': '借'},
-        {'科目代码': '5601.01', '科目名称': '办公用品', '余额方向': '借'},
-        {'科目代码': '5601.02', '科目名称': '房租', '余额方向': '借'},
-        {'科目代码': '5601.03', '科目名称': '物业管理费', '余额方向': '借'},
-        {'科目代码': '5601.04', '科目名称': '水电费', '余额方向': '借'},
-        {'科目代码': '5601.05', '科目名称': '交际应酬费', '余额方向': '借'},
-        {'科目代码': '5601.06', '科目名称': '市内交通费', '余额方向': '借'},
-        {'科目代码': '5601.07', '科目名称': '差旅费', '余额方向': '借'},
-        {'科目代码': '5601.08', '科目名称': '补助', '余额方向': '借'},
-        {'科目代码': '5601.09', '科目名称': '通讯费', '余额方向': '借'},
-        {'科目代码': '5601.10', '科目名称': '工资', '余额方向': '借'},
-        {'科目代码': '5601.11', '科目名称': '佣金', '余额方向': '借'},
-        {'科目代码': '5601.12', '科目名称': '保险金', '余额方向': '借'},
-        {'科目代码': '5601.13', '科目名称': '福利费', '余额方向': '借'},
-        {'科目代码': '5601.14', '科目名称': '累计折旧', '余额方向': '借'},
-        {'科目代码': '5601.15', '科目名称': '商品维修费', '余额方向': '借'},
-        {'科目代码': '5601.16', '科目名称': '广告和业务宣传费', '余额方向': '借'},
-        {'科目代码': '5601.99', '科目名称': '其他', '余额方向': '借'},
-        {'科目代码': '5602', '科目名称': '管理费用', '余额方向': '借'},
-        {'科目代码': '5602.01', '科目名称': '办公用品', '余额方向': '借'},
-        {'科目代码': '5602.02', '科目名称': '房租', '余额方向': '借'},
-        {'科目代码': '5602.03', '科目名称': '物业管理费', '余额方向': '借'},
-        {'科目代码': '5602.04', '科目名称': '水电费', '余额方向': '借'},
-        {'科目代码': '5602.05', '科目名称': '交际应酬费', '余额方向': '借'},
-        {'科目代码': '5602.06', '科目名称': '市内交通费', '余额方向': '借'},
-        {'科目代码': '5602.07', '科目名称': '差旅费', '余额方向': '借'},
-        {'科目代码': '5602.08', '科目名称': '通讯费', '余额方向': '借'},
-        {'科目代码': '5602.09', '科目名称': '工资', '余额方向': '借'},
-        {'科目代码': '5602.10', '科目名称': '保险金', '余额方向': '借'},
-        {'科目代码': '5602.11', '科目名称': '福利费', '余额方向': '借'},
-        {'科目代码': '5602.12', '科目名称': '累计折旧', '余额方向': '借'},
-        {'科目代码': '5602.13', '科目名称': '开办费', '余额方向': '借'},
-        {'科目代码': '5602.14', '科目名称': '职工教育经费', '余额方向': '借'},
-        {'科目代码': '5602.15', '科目名称': '研究费用', '余额方向': '借'},
-        {'科目代码': '5602.99', '科目名称': '其他', '余额方向': '借'},
-        {'科目代码': '5603', '科目名称': '财务费用', '余额方向': '借'},
-        {'科目代码': '5603.01', '科目名称': '汇兑损益', '余额方向': '借'},
-        {'科目代码': '5603.02', '科目名称': '利息', '余额方向': '借'},
-        {'科目代码': '5603.03', '科目名称': '手续费', '余额方向': '借'},
-        {'科目代码': '5603.99', '科目名称': '其他', '余额方向': '借'},
-        {'科目代码': '5711', '科目名称': '营业外支出', '余额方向': '借'},
-        {'科目代码': '5711.01', '科目名称': '存货盘亏毁损', '余额方向': '借'},
-        {'科目代码': '5711.02', '科目名称': '非流动资产处置净损失', '余额方向': '借'},
-        {'科目代码': '5711.03', '科目名称': '坏账损失', '余额方向': '借'},
-        {'科目代码': '5711.04', '科目名称': '无法收回的长期债券投资损失', '余额方向': '借'},
-        {'科目代码': '5711.05', '科目名称': '无法收回的长期股权投资损失', '余额方向': '借'},
-        {'科目代码': '5711.06', '科目名称': '自然灾害等不可抗力造成的损失', '余额方向': '借'},
-        {'科目代码': '5711.07', '科目名称': '税收滞纳金', '余额方向': '借'},
-        {'科目代码': '5711.08', '科目名称': '罚金、罚款', '余额方向': '借'},
-        {'科目代码': '5711.09', '科目名称': '捐赠支出', '余额方向': '借'},
-        {'科目代码': '5711.10', '科目名称': '其他', '余额方向': '借'},
-        {'科目代码': '5801', '科目名称': '所得税费用', '余额方向': '借'},
-        {'科目代码': '6000', '科目名称': '以前年度损益调整', '余额方向': '借'}
-    ]
-}
-
-
-BALANCE_SHEET_SMALL_STANDARD_2013 = {
-    '资产': [
-        ('流动资产：', None, None),
-        ('货币资金', 1, '库存现金+银行存款+其他货币资金'),
-        ('短期投资', 2, '短期投资'),
-        ('应收票据', 3, None),
-        ('应收账款', 4, '应收账款-坏账准备'),
-        ('预付账款', 5, '预付账款'),
-        ('应收股利', 6, '应收股利'),
-        ('应收利息', 7, '应收利息'),
-        ('其他应收款', 8, '其他应收款'),
-        ('存货', 9, '材料采购+在途物资+原材料+材料成本差异+库存商品+商品进销差价+委托加工物资+周转材料+消耗性生物资产'),
-        ('其中：原材料', 10, '原材料'),
-        ('在产品', 11, None),
-        ('库存商品', 12, '库存商品'),
-        ('周转材料', 13, None),
-        ('其他流动资产', 14, None),
-        ('流动资产合计', 15, '1+2+3+4+5+6+7+8+9+10+11+12+13+14'),
-        ('非流动资产：', None, None),
-        ('长期债券投资', 16, '长期债券投资'),
-        ('长期股权投资', 17, '长期股权投资'),
-        ('固定资产原价', 18, '固定资产'),
-        ('减：累计折旧', 19, '累计折旧'),
-        ('固定资产账面价值', 20, '18-19'),
-        ('在建工程', 21, '在建工程'),
-        ('工程物资', 22, '工程物资'),
-        ('固定资产清理', 23, '固定资产清理'),
-        ('生物性生物资产', 24, None),
-        ('无形资产', 25, '无形资产'),
-        ('开发支出', 26, None),
-        ('长期待摊费用', 27, '长期待摊费用'),
-        ('其他非流动资产', 28, None),
-        ('非流动资产合计', 29, '16+17+18+19+20+21+22+23+24+25+26+27+28'),
-        ('资产总计', 30, '15+29')
-    ],
-    '负债和所有者权益': [
-        ('流动负债：', None, None),
-        ('短期借款', 31, '短期借款'),
-        ('应付票据', 32, '应付票据'),
-        ('应付账款', 33, '应付账款'),
-        ('预收账款', 34, '预收账款'),
-        ('应付职工薪酬', 35, '应付职工薪酬'),
-        ('应交税费', 36, '应交税费'),
-        ('应付利息', 37, '应付利息'),
-        ('应付利润', 38, '应付利润'),
-        ('其他应付款', 39, '其他应付款'),
-        ('其他流动负债', 40, None),
-        ('流动负债合计', 41, '31+32+33+34+35+36+37+38+39+40'),
-        ('非流动负债：', None, None),
-        ('长期借款：', 42, '长期借款'),
-        ('长期应付款', 43, '长期应付款'),
-        ('递延收益', 44, '递延收益'),
-        ('其他非流动负债', 45, None),
-        ('非流动负债合计', 46, '42+43+44+45'),
-        ('负债合计', 47, '41+46'),
-        ('', None, None),
-        ('', None, None),
-        ('', None, None),
-        ('', None, None),
-        ('', None, None),
-        ('', None, None),
-        ('所有者权益（或股东权益）：', None, None),
-        ('实收资本（或股本）', 48, '实收资本'),
-        ('资本公积', 49, '资本公积'),
-        ('盈余公积', 50, '盈余公积'),
-        ('未分配利润', 51, '利润分配/未分配利润'),
-        ('所有者权益（或股东权益）合计', 52, '48+49+50+51'),
-        ('负债和所有者权益（或股东权益）总计', 53, '47+52')
-    ]
-}
-
-BALANCE_SHEET_GENERAL_STANDARD_2018 = BALANCE_SHEET_SMALL_STANDARD_2013
@@ -0,0 +1,154 @@
+"""
+    Copyright 2024- ZiJian Jiang @ https://github.com/CallmeNezha
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+"""
+Charts of accounts and balance sheet templates of the accounting standards.
+
+The data of every standard is kept in JSON files next to this module, parsed on
+first use and cached together with its indices, see :func:`standard`.
+"""
+
+import functools
+import hashlib
+import json
+import pathlib
+import typing
+
+DATA_DIR = pathlib.Path(__file__).parent
+DATA_VERSION = 1
+
+# standard -> (chart of accounts, balance sheet template)
+# https://www.jdy.com/new-tools/1572853334828711937.html
+# https://www.jdy.com/new-tools/1572858155572985857.html
+STANDARD_FILES = {
+    '一般企业会计准则（2018）': ('accounts_general_2018.json', 'balance_sheet_2013.json'),
+    '小企业会计准则（2013）': ('accounts_small_2013.json', 'balance_sheet_2013.json'),
+}
+
+
+class StandardAccount(typing.NamedTuple):
+    code: str
+    name: str
+    qualname: str
+    direction: str                      # 借 / 贷
+    major_category: str                 # 资产类, 负债类 ...
+    category: typing.Optional[str]      # 流动资产 ..., None if the standard has none
+    parent_code: str                    # '' for a top level account
+
+
+class BalanceSheetLine(typing.NamedTuple):
+    item: str
+    line_number: typing.Optional[int]
+    formula: typing.Optional[str]
+
+
+class Standard:
+    """The accounts of a standard in chart order, indexed by code, parent and major category"""
+
+    def __init__(self, name: str, accounts: list[StandardAccount], balance_sheet: dict[str, list[BalanceSheetLine]]):
+        self.name = name
+        self.accounts: tuple[StandardAccount, ...] = tuple(accounts)
+        self.balance_sheet: dict[str, tuple[BalanceSheetLine, ...]] = {c: tuple(lines) for c, lines in balance_sheet.items()}
+        self.by_code: dict[str, StandardAccount] = {a.code: a for a in self.accounts}
+        children: dict[str, list[StandardAccount]] = {}
+        major_categories: dict[str, list[StandardAccount]] = {}
+        for a in self.accounts:
+            children.setdefault(a.parent_code, []).append(a)
+            major_categories.setdefault(a.major_category, []).append(a)
+        # 1for
+        self.children: dict[str, tuple[StandardAccount, ...]] = {k: tuple(v) for k, v in children.items()}
+        self.by_major_category: dict[str, tuple[StandardAccount, ...]] = {k: tuple(v) for k, v in major_categories.items()}
+
+    def __repr__(self):
+        return f"Standard({self.name!r}, {len(self.accounts)} accounts)"
+
+    def account(self, code: str) -> typing.Optional[StandardAccount]:
+        return self.by_code.get(code)
+
+    def childrenOf(self, code: str) -> tuple[StandardAccount, ...]:
+        """The direct children of ``code``, of '' for the top level accounts"""
+        return self.children.get(code, ())
+
+
+def names() -> list[str]:
+    return list(STANDARD_FILES)
+
+
+def _load(filename: str) -> dict:
+    data = json.loads((DATA_DIR / filename).read_text(encoding='utf-8'))
+    if data.get('version') != DATA_VERSION:
+        raise ValueError(f"{filename}: unsupported version {data.get('version')}")
+    return data
+
+
+@functools.lru_cache(maxsize=None)
+def _balanceSheet(filename: str) -> dict[str, list[BalanceSheetLine]]:
+    return {category: [BalanceSheetLine(*line) for line in lines]
+            for category, lines in _load(filename)['balance_sheet'].items()}
+
+
+@functools.lru_cache(maxsize=None)
+def standard(name: str) -> Standard:
+    """The standard ``name``, loaded on the first call"""
+    if name not in STANDARD_FILES:
+        raise ValueError(f"unknown standard: {name}")
+    accounts_file, balance_sheet_file = STANDARD_FILES[name]
+    accounts = []
+    qualnames = {}
+    for major_category, code, account_name, direction, category in _load(accounts_file)['accounts']:
+        parent_code = code.rpartition('.')[0]
+        parent_qualname = qualnames.get(parent_code)
+        qualname = qualnames[code] = parent_qualname + '/' + account_name if parent_qualname else account_name
+        accounts.append(StandardAccount(code, account_name, qualname, direction, major_category, category, parent_code))
+    # 1for
+    return Standard(name, accounts, _balanceSheet(balance_sheet_file))
+
+
+@functools.lru_cache(maxsize=None)
+def fingerprint(name: str) -> str:
+    """A digest of the data files of the standard ``name``, it changes whenever they do"""
+    if name not in STANDARD_FILES:
+        raise ValueError(f"unknown standard: {name}")
+    digest = hashlib.sha1(f"{DATA_VERSION}".encode())
+    for filename in STANDARD_FILES[name]:
+        digest.update((DATA_DIR / filename).read_bytes())
+    # 1for
+    return digest.hexdigest()
+
+
+# the chart and template dicts of earlier versions, built on first access
+_LEGACY_NAMES = {
+    'ACCOUNTS_GENERAL_STANDARD_2018': ('一般企业会计准则（2018）', 'accounts'),
+    'ACCOUNTS_SMALL_STANDARD_2013': ('小企业会计准则（2013）', 'accounts'),
+    'BALANCE_SHEET_GENERAL_STANDARD_2018': ('一般企业会计准则（2018）', 'balance_sheet'),
+    'BALANCE_SHEET_SMALL_STANDARD_2013': ('小企业会计准则（2013）', 'balance_sheet'),
+}
+
+
+def __getattr__(name: str):
+    if name not in _LEGACY_NAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    s = standard(_LEGACY_NAMES[name][0])
+    if _LEGACY_NAMES[name][1] == 'balance_sheet':
+        return {category: [tuple(line) for line in lines] for category, lines in s.balance_sheet.items()}
+    accounts = {}
+    for a in s.accounts:
+        account = {'科目代码': a.code, '科目名称': a.name, '余额方向': a.direction}
+        if a.category is not None:
+            account['科目类别'] = a.category
+        accounts.setdefault(a.major_category, []).append(account)
+    # 1for
+    return accounts
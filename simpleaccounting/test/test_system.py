@@ -13,11 +13,69 @@
     See the License for the specific language governing permissions and
     limitations under the License.
 """
+import os
 import pytest
+import random
+import sqlite3
 import datetime
 import pathlib
-
-from simpleaccounting.app.system import System, IllegalOperation, VoucherEntry
+import subprocess
+import sys
+import concurrent.futures
+
+from simpleaccounting import standards
+from simpleaccounting.ffdb import FFDB
+from simpleaccounting.app import cli, consolidation, events, startuptrace, system
+from simpleaccounting.app.book import Book, BookRegistry
+from simpleaccounting.app.balanceindex import FenwickTree
+from simpleaccounting.app.catalog import BookCatalog
+from simpleaccounting.app.mru import MRUTracker
+from simpleaccounting.app.prefetch import Prefetcher
+from simpleaccounting.app.reportjob import ReportJob
+from simpleaccounting.app.reportcache import ReportCache
+from simpleaccounting.app.system import System, IllegalOperation, EntryNotFound, VoucherEntry
+from simpleaccounting.tools import stringscores
+from simpleaccounting.tools.mymath import FloatWithPrecision
+from simpleaccounting.tools.pinyin import PinyinTable
+from simpleaccounting.tools.searchindex import SearchIndex
+
+
+# the domain layer, importable without Qt
+CORE_MODULES = ['simpleaccounting.app.system', 'simpleaccounting.ffdb', 'simpleaccounting.tools.mymath',
+                'simpleaccounting.tools.dateutil', 'simpleaccounting.standards']
+# the headless entry points built on it
+HEADLESS_MODULES = ['simpleaccounting.app.cli', 'simpleaccounting.app.book', 'simpleaccounting.app.catalog',
+                    'simpleaccounting.app.consolidation']
+QT_BINDINGS = {'qtpy', 'PyQt5', 'PyQt6', 'PySide2', 'PySide6'}
+CORE_IMPORT_BUDGET_MS = float(os.environ.get('SIMPLEACCOUNTING_IMPORT_BUDGET_MS', 1000))
+
+
+def import_times(modules: list[str]) -> tuple[dict[str, int], int]:
+    """
+    Cumulative import time in microseconds of every module imported by a fresh
+    interpreter importing ``modules``, and the time spent importing ``modules``
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import ' + ', '.join(modules)],
+                            cwd=pathlib.Path(__file__).parents[2], capture_output=True, text=True, check=True)
+    times = {}
+    total = 0
+    for line in result.stderr.splitlines():
+        _, cumulative, name = line.split('|') if line.count('|') == 2 else ('', '', '')
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+            # the modules imported directly by the -c statement are not indented
+            if name.startswith(' ') and not name.startswith('  ') and name.strip().startswith('simpleaccounting'):
+                total += int(cumulative)
+    # 1for
+    return times, total
+
+
+@pytest.fixture(scope='session', autouse=True)
+def template_dir(tmp_path_factory):
+    """The template books of the session, kept apart from SIMPLEACCOUNTING_DIR"""
+    system.TEMPLATE_DIR = tmp_path_factory.mktemp('templates')
+    yield system.TEMPLATE_DIR
+    system.TEMPLATE_DIR = None
 
 
 class TestSystem:
@@ -273,3 +331,592 @@ class TestSystem:
             [VoucherEntry(account_code='1002.01.05', amount=100.0, currency='美元', exchange_rate=7.0)],
             [VoucherEntry(account_code='1002.02', amount=700.0, currency='人民币', exchange_rate=1.0)]
         )
+
+    def test_mru_accounts(self):
+        System.increaseMRUAccount('1002.01')
+        System.increaseMRUAccount('1001')
+        System.increaseMRUAccount('1001')
+        assert [a.code for a in System.topMRUAccounts(20)] == ['1001', '1002.01']
+        assert [a.code for a in System.topMRUAccounts(1)] == ['1001']
+
+        # hits are kept in memory until flushed, then survive a rebind
+        filename = pathlib.Path(FFDB.db.provider.pool.filename)
+        System.flushMRUAccounts()
+        System.increaseMRUAccount('1002.01')
+        System.bindDatabase(filename)
+        System.increaseMRUAccount('1002.01')
+        assert [a.code for a in System.topMRUAccounts(20)] == ['1002.01', '1001']
+
+        # the accounts returned follow the writes to them and to their children
+        System.increaseMRUAccount('1122')
+        assert not {a.code: a for a in System.topMRUAccounts(20)}['1122'].need_exchange_gains_losses
+        System.createCurrency('美元')
+        System.setAccountCurrency('1122', '美元', need_exchange_gains_losses=True)
+        assert {a.code: a for a in System.topMRUAccounts(20)}['1122'].need_exchange_gains_losses
+        System.createAccount('1002.01', '1002.01.05', 'xxx')
+        assert not {a.code: a for a in System.topMRUAccounts(20)}['1002.01'].is_leaf
+        System.deleteAccount('1002.01.05')
+        assert {a.code: a for a in System.topMRUAccounts(20)}['1002.01'].is_leaf
+
+    def test_mru_tracker_decayed(self):
+        tracker = MRUTracker(half_life=10.0)
+        tracker.load({'1001': 8}, now=0.0)
+        tracker.hit('1002', now=40.0)
+        assert tracker.top(2, now=40.0) == ['1001', '1002']
+        assert tracker.top(2, decayed=True, now=40.0) == ['1002', '1001']
+        assert tracker.takePending() == {'1002': 1}
+        assert tracker.takePending() == {}
+
+    def test_voucher_headers(self):
+        System.createVoucher('test/002', datetime.date(2000, 1, 20))
+        System.createVoucher('test/001', datetime.date(2000, 1, 10), category='月末结转')
+        System.createVoucher('test/003', datetime.date(2000, 2, 1))
+        headers = System.voucherHeaders(datetime.date(2000, 1, 1), datetime.date(2000, 1, 31))
+        assert [h.number for h in headers] == ['test/001', 'test/002']
+        assert [h.number for h in System.voucherHeaders(datetime.date(2000, 1, 1), datetime.date(2000, 1, 31), '记账')] == ['test/002']
+        assert headers[0].date == datetime.date(2000, 1, 10) and headers[0].category == '月末结转'
+        assert [h.number for h in System.voucherHeadersOfMonth(datetime.date(2000, 2, 15))] == ['test/003']
+        assert System.voucherCounts(datetime.date(2000, 1, 1), datetime.date(2000, 2, 29)) == {'记账': 2, '月末结转': 1}
+        System.createAccount('1002.01', '1002.01.05', 'xxx')
+        System.setAccountCurrency('1002.01.05', '人民币')
+        System.setAccountCurrency('1001', '人民币')
+        System.updateDebitCreditEntries('test/003',
+            [VoucherEntry(account_code='1002.01.05', amount=1.0, currency='人民币', exchange_rate=1.0)],
+            [VoucherEntry(account_code='1001', amount=1.0, currency='人民币', exchange_rate=1.0)])
+        dates = datetime.date(2000, 1, 1), datetime.date(2000, 12, 31)
+        assert [h.number for h in System.voucherHeadersOfAccount('1002', *dates)] == ['test/003']
+        assert [h.number for h in System.voucherHeadersOfAccount('1001', *dates)] == ['test/003']
+        assert System.voucherHeadersOfAccount('1002.02', *dates) == []
+        assert System.voucherHeadersOfAccount('1002', *dates, category='月末结转') == []
+
+    def test_voucher_prefetcher(self):
+        System.createVoucher('test/001', datetime.date(2000, 1, 10))
+        System.createVoucher('test/002', datetime.date(2000, 1, 20))
+        cache = Prefetcher(System.voucher, capacity=2)
+        cache.prefetch('test/002')
+        assert cache.get('test/001').date == datetime.date(2000, 1, 10)
+        assert cache.get('test/002').date == datetime.date(2000, 1, 20)
+        System.setVoucherDate('test/002', datetime.date(2000, 1, 21))
+        cache.invalidate('test/002')
+        assert cache.get('test/002').date == datetime.date(2000, 1, 21)
+        # least recently used is evicted
+        cache.prefetch('test/003')
+        assert 'test/001' not in cache
+        with pytest.raises(EntryNotFound):
+            cache.get('test/003')
+        assert 'test/003' not in cache
+        cache.shutdown()
+
+    def test_ledger_entries(self):
+        System.createAccount('1002.01', '1002.01.05', 'xxx')
+        System.createAccount('1002', '1002.10', 'yyy')
+        System.createAccount('1002', '1002.1', 'zzz')
+        System.setAccountCurrency('1002.01.05', '人民币')
+        System.setAccountCurrency('1002.10', '人民币')
+        System.setAccountCurrency('1001', '人民币')
+        for number, date, code, amount in [('test/001', datetime.date(2000, 1, 1), '1002.01.05', 100.0),
+                                           ('test/002', datetime.date(2000, 1, 15), '1002.10', 50.0),
+                                           ('test/003', datetime.date(2000, 1, 20), '1001', 30.0)]:
+            System.createVoucher(number, date)
+            System.updateDebitCreditEntries(
+                number,
+                [VoucherEntry(account_code=code, amount=amount, currency='人民币', exchange_rate=1.0)],
+                [VoucherEntry(account_code='1001' if code != '1001' else '1002.10', amount=amount, currency='人民币', exchange_rate=1.0)]
+            )
+        opening, entries = System.ledgerEntries('1002', datetime.date(2000, 1, 10), datetime.date(2000, 1, 31))
+        assert opening == 100.0
+        assert [(e.voucher_number, e.debit_amount, e.credit_amount) for e in entries] == [
+            ('test/002', 50.0, None), ('test/003', None, 30.0)]
+        assert [e.balance for e in entries] == [150.0, 120.0]
+        # sibling codes sharing the prefix are not part of the subtree
+        opening, entries = System.ledgerEntries('1002.1', datetime.date(2000, 1, 1), datetime.date(2000, 1, 31))
+        assert opening == 0.0 and entries == []
+
+    def test_report_job(self):
+        def pull(job):
+            for i in range(3):
+                job.reportPartial(System.account('1001').code)
+                job.reportProgress(i + 1, 3)
+            return 'done'
+
+        # run in this thread, the signals are delivered directly
+        job = ReportJob(pull)
+        events = []
+        job.signals.partial.connect(lambda chunk: events.append(chunk))
+        job.signals.progress.connect(lambda done, total: events.append((done, total)))
+        job.signals.finished.connect(lambda result: events.append(result))
+        job.run()
+        assert events == ['1001', (1, 3), '1001', (2, 3), '1001', (3, 3), 'done']
+
+        job = ReportJob(lambda job: (job.cancel(), job.reportPartial('late')))
+        job.signals.partial.connect(lambda chunk: events.append(chunk))
+        job.signals.finished.connect(lambda result: events.append(result))
+        job.run()
+        assert events[-1] == 'done'
+
+    def test_data_version(self):
+        System.createAccount('1002.01', '1002.01.05', 'xxx')
+        System.setAccountCurrency('1002.01.05', '人民币')
+        System.setAccountCurrency('1002.02', '人民币')
+        version = System.dataVersion()
+        balances = System.incurredBalances('1002.01.05', datetime.date(2000, 1, 1), datetime.date(2000, 1, 31))
+        # reads don't change the version and are served from the cache
+        assert System.dataVersion() == version
+        assert System.incurredBalances('1002.01.05', datetime.date(2000, 1, 1), datetime.date(2000, 1, 31)) is balances
+
+        System.createVoucher('test/001', datetime.date(2000, 1, 1))
+        System.updateDebitCreditEntries(
+            'test/001',
+            [VoucherEntry(account_code='1002.01.05', amount=100.0, currency='人民币', exchange_rate=1.0)],
+            [VoucherEntry(account_code='1002.02', amount=100.0, currency='人民币', exchange_rate=1.0)]
+        )
+        assert System.dataVersion() > version
+        assert System.incurredBalances('1002.01.05', datetime.date(2000, 1, 1), datetime.date(2000, 1, 31))[3] == 100.0
+
+    def test_report_cache(self):
+        cache = ReportCache(max_bytes=1000)
+        cache.put('a', 'x' * 100)
+        cache.put('b', 'y' * 100)
+        assert cache.get('a') == 'x' * 100
+        assert cache.invalidate(lambda key: key == 'a') == 1
+        assert cache.get('a') is ReportCache.MISSING
+        assert len(cache) == 1
+        # a result computed across an invalidation is not kept
+        epoch = cache.epoch
+        cache.invalidate(lambda key: False)
+        cache.put('a', 'x' * 100, epoch=epoch)
+        assert 'a' not in cache
+        # least recently used entries make room, values larger than the bound are not kept
+        cache.put('c', 'z' * 900)
+        assert cache.get('b') is ReportCache.MISSING
+        cache.put('d', 'w' * 2000)
+        assert cache.get('d') is ReportCache.MISSING
+        assert cache.bytes <= 1000
+
+    def test_change_events(self):
+        received = []
+        System.subscribe(received.append)
+        try:
+            System.createAccount('1002.01', '1002.01.05', 'xxx')
+            System.setAccountCurrency('1002.01.05', '人民币')
+            System.setAccountCurrency('1002.02', '人民币')
+            System.createVoucher('test/001', datetime.date(2000, 1, 5))
+            System.updateDebitCreditEntries(
+                'test/001',
+                [VoucherEntry(account_code='1002.01.05', amount=100.0, currency='人民币', exchange_rate=1.0)],
+                [VoucherEntry(account_code='1002.02', amount=100.0, currency='人民币', exchange_rate=1.0)]
+            )
+            with pytest.raises(IllegalOperation):
+                System.deleteAccount('1001')
+            System.deleteVoucher('test/001')
+        finally:
+            System.unsubscribe(received.append)
+        # failed writes publish nothing
+        assert received == [
+            events.AccountCreated('1002.01.05', '1002.01'),
+            events.AccountCurrencySet('1002.01.05', '人民币'),
+            events.AccountCurrencySet('1002.02', '人民币'),
+            events.VoucherCreated('test/001', datetime.date(2000, 1, 5)),
+            events.VoucherChanged('test/001', frozenset(('1002.01.05', '1002.02')),
+                                  frozenset((datetime.date(2000, 1, 5),))),
+            events.VoucherDeleted('test/001', frozenset(('1002.01.05', '1002.02')),
+                                  frozenset((datetime.date(2000, 1, 5),))),
+        ]
+        System.createCurrency('美元')
+        assert len(received) == 6
+
+    def test_scoped_report_invalidation(self):
+        System.createAccount('1002.01', '1002.01.05', 'xxx')
+        System.setAccountCurrency('1002.01.05', '人民币')
+        System.setAccountCurrency('1002.02', '人民币')
+        System.setAccountCurrency('1122', '人民币')
+        january = datetime.date(2000, 1, 1), datetime.date(2000, 1, 31)
+        march = datetime.date(2000, 3, 1), datetime.date(2000, 3, 31)
+        other = System.incurredBalances('1122', *march)
+        before = System.incurredBalances('1002.01.05', *january)
+        parent = System.incurredBalances('1002', *march)
+
+        System.createVoucher('test/001', datetime.date(2000, 2, 1))
+        System.updateDebitCreditEntries(
+            'test/001',
+            [VoucherEntry(account_code='1002.01.05', amount=100.0, currency='人民币', exchange_rate=1.0)],
+            [VoucherEntry(account_code='1002.02', amount=100.0, currency='人民币', exchange_rate=1.0)]
+        )
+        # unrelated accounts and periods ending before the voucher keep their cached results
+        assert System.incurredBalances('1122', *march) is other
+        assert System.incurredBalances('1002.01.05', *january) is before
+        assert System.incurredBalances('1002', *march) is not parent
+        assert System.incurredBalances('1002.01.05', *march)[1] == 100.0
+
+    def test_search_index(self):
+        choices = [f"{a.code} {a.name}" for a in System.accounts()] + ['Bank deposit', 'bank loan', 'cash']
+        index = SearchIndex(choices)
+        # typed one character at a time, then edited
+        for query in ['1', '10', '100', '1002', 'b', 'ba', 'ban', 'bank', 'bankd', 'bnk', '', '银行', '应付', 'zz']:
+            expected = stringscores.findMatchingChoices(query, choices, template='<b>{0}</b>', valid_only=True, sort=True)
+            results = index.search(query, template='<b>{0}</b>')
+            assert [(r.choice, r.enriched, r.score) for r in results] == expected
+            assert all(choices[r.index] == r.choice for r in results)
+        # 1for
+        assert index.candidates('bankd') == [len(choices) - 3]
+
+    def test_pinyin_search_index(self, tmp_path):
+        table = PinyinTable({'银行存款': ['yin', 'hang', 'cun', 'kuan'], '库存现金': ['ku', 'cun', 'xian', 'jin']})
+        table.save(tmp_path / 'pinyin.json')
+        table = PinyinTable.load(tmp_path / 'pinyin.json')
+        assert '银行存款' in table and len(table) == 2
+        index = SearchIndex(['1001 库存现金', '1002 银行存款', '1012 其他货币资金', 'yhck'], pinyin=table)
+        # pinyin and literal matches are scored by the same rules
+        assert [(r.choice, r.score) for r in index.search('yhck')] == [('1002 银行存款', 800001), ('yhck', 800001)]
+        assert index.search('yinhangc', template='<b>{0}</b>')[0].enriched == '1002&nbsp;<b>银</b><b>行</b><b>存</b>款'
+        assert [r.choice for r in index.search('cun')] == []
+        assert [r.choice for r in index.search('kcx')] == ['1001 库存现金']
+
+    def test_account_pinyin(self):
+        table = System.accountPinyin()
+        assert System.accountPinyin() is table
+        System.createAccount('1002.01', '1002.01.05', 'xxx')
+        assert System.accountPinyin() is not table
+        pytest.importorskip('pypinyin')
+        index = SearchIndex([f"{a.code} {a.name}" for a in System.accounts()], pinyin=System.accountPinyin())
+        assert index.search('yhck')[0].choice == '1002 银行存款'
+
+    def test_startup_trace(self):
+        startuptrace.reset()
+        startuptrace.enable(False)
+        with startuptrace.phase('imports'):
+            pass
+        assert startuptrace.phases() == []
+        startuptrace.enable()
+        try:
+            with startuptrace.phase('imports'):
+                pass
+            startuptrace.begin('login')
+            startuptrace.end('first paint')     # never begun
+            startuptrace.end('login')
+            assert [name for name, _ in startuptrace.phases()] == ['imports', 'login']
+            assert 'login' in startuptrace.report()
+        finally:
+            startuptrace.enable(False)
+            startuptrace.reset()
+
+    def test_book_catalog(self, tmp_path):
+        System.new(tmp_path / 'a.db', '小企业会计准则（2013）', datetime.date(2024, 3, 1))
+        (tmp_path / 'broken.db').write_bytes(b'not a book')
+        catalog = BookCatalog(tmp_path)
+        assert catalog.books() == ['a.db', 'broken.db']
+        info = catalog.info('a.db')
+        assert info.company == System.meta().company
+        assert (info.standard, info.month_from, info.month_until) == \
+               ('小企业会计准则（2013）', datetime.date(2024, 3, 1), datetime.date(2024, 3, 1))
+        assert catalog.info('a.db') is info
+        assert catalog.info('broken.db') is None
+        assert catalog.info('missing.db') is None
+        System.forwardToNextMonth()
+        assert catalog.info('a.db').month_until == datetime.date(2024, 4, 1)
+
+    def test_rebind_reuses_mapping(self, tmp_path):
+        db = FFDB.db
+        first = pathlib.Path(FFDB.db.provider.pool.filename)
+        System.createAccount('1002.01', '1002.01.05', 'xxx')
+        System.new(tmp_path / 'b.db', '小企业会计准则（2013）', datetime.date(2024, 3, 1))
+        assert FFDB.db is db
+        assert System.meta().standard == '小企业会计准则（2013）'
+        assert '1002.01.05' not in {a.code for a in System.accounts()}
+        System.bindDatabase(first)
+        assert System.meta().standard == '一般企业会计准则（2018）'
+        assert '1002.01.05' in {a.code for a in System.accounts()}
+
+    def test_books(self, tmp_path):
+        System.createAccount('1002.01', '1002.01.05', 'xxx')
+        default = pathlib.Path(FFDB.db.provider.pool.filename)
+        registry = BookRegistry()
+        a = Book.create(tmp_path / 'a.db', '小企业会计准则（2013）', datetime.date(2024, 3, 1))
+        a.close()
+        a = registry.open(tmp_path / 'a.db')
+        b = Book.create(tmp_path / 'b.db', '一般企业会计准则（2018）', datetime.date(2023, 1, 1))
+        assert registry.open(tmp_path / 'a.db') is a and tmp_path / 'a.db' in registry
+        received = []
+        a.subscribe(received.append)
+        a.createVoucher('2024-03/0001', datetime.date(2024, 3, 5))
+        b.forwardToNextMonth()
+        assert [type(e) for e in received] == [events.VoucherCreated]
+        # the books and the default book are independent of each other
+        assert pathlib.Path(FFDB.db.provider.pool.filename) == default
+        assert '1002.01.05' in {x.code for x in System.accounts()}
+        assert '1002.01.05' not in {x.code for x in a.accounts()}
+        dates = datetime.date(1970, 1, 1), datetime.date(2099, 1, 1)
+        assert [v.number for v in a.voucherHeaders(*dates)] == ['2024-03/0001'] and b.voucherHeaders(*dates) == []
+        assert b.meta().month_until == datetime.date(2023, 2, 1)
+        assert System.meta().month_until == datetime.date(1999, 12, 1)
+        with concurrent.futures.ThreadPoolExecutor(2) as pool:
+            standards = list(pool.map(lambda book: book.meta().standard, [a, b, a, b]))
+        assert standards == ['小企业会计准则（2013）', '一般企业会计准则（2018）'] * 2
+        registry.closeAll()
+        assert len(registry) == 0
+
+    def test_consolidation(self, tmp_path):
+        for i, standard in enumerate(['一般企业会计准则（2018）', '小企业会计准则（2013）'], 1):
+            book = Book.create(tmp_path / f'c{i}.db', standard, datetime.date(2024, 3, 1))
+            book.setAccountCurrency('1122', '人民币')
+            book.setAccountCurrency('1001', '人民币')
+            book.createVoucher('2024-03/0001', datetime.date(2024, 3, 5))
+            book.updateDebitCreditEntries('2024-03/0001',
+                [VoucherEntry(account_code='1122', amount=100.0 * i, currency='人民币', exchange_rate=1.0)],
+                [VoucherEntry(account_code='1001', amount=100.0 * i, currency='人民币', exchange_rate=1.0)])
+            book.close()
+        (tmp_path / 'broken.db').write_bytes(b'not a book')
+        result = consolidation.consolidate(sorted(tmp_path.glob('*.db')), datetime.date(2024, 3, 1), max_workers=2)
+        assert len(result.books) == 3 and result.books == sorted(result.books, key=lambda r: -r.seconds)
+        assert [r.error is None for r in sorted(result.books)] == [False, True, True]
+        rows = {row.code: row for row in result.trial_balance}
+        assert rows['1122'].balances == (0.0, 300.0, 0.0, 300.0)
+        assert rows['1001'].balances == (0.0, 0.0, 300.0, -300.0)
+        assert {row.item: row.ending for row in result.balance_sheet}['应收账款'] == 300.0
+        assert '应收账款' in consolidation.format_consolidation(result)
+
+    def test_cli(self, tmp_path, capsys):
+        filename = str(FFDB.db.provider.pool.filename)
+        System.createAccount('1002.01', '1002.01.05', 'xxx')
+        assert cli.main(['trial-balance', filename, '-o', str(tmp_path / 'tb.csv')]) == 0
+        rows = (tmp_path / 'tb.csv').read_text(encoding='utf-8-sig').splitlines()
+        assert rows[0] == ','.join(cli.TRIAL_BALANCE_HEADER)
+        assert any(row.startswith('1002.01.05,') for row in rows)
+        assert cli.main(['export', filename, str(tmp_path / 'out')]) == 0
+        assert sorted(p.name for p in (tmp_path / 'out').iterdir()) == \
+               ['test_balance_sheet_1999-12.csv', 'test_trial_balance_1999-12.csv']
+        assert cli.main(['close', filename, '--forward']) == 0
+        assert 'forwarded to 2000-01' in capsys.readouterr().out
+        assert cli.main(['ledger', filename, '9999']) == 1
+        assert cli.main(['ledger', str(tmp_path / 'missing.db'), '1002']) == 1
+
+    def test_core_import_budget(self):
+        import_times(CORE_MODULES)     # bytecode compiled by the first run
+        times, total = import_times(CORE_MODULES)
+        assert not {name.split('.')[0] for name in times} & QT_BINDINGS
+        assert 'simpleaccounting.app.system' in times
+        assert total / 1000 < CORE_IMPORT_BUDGET_MS
+        times, _ = import_times(HEADLESS_MODULES)
+        assert not {name.split('.')[0] for name in times} & QT_BINDINGS
+
+    def test_standards(self):
+        general = standards.standard('一般企业会计准则（2018）')
+        assert standards.standard('一般企业会计准则（2018）') is general
+        assert set(standards.names()) == {'一般企业会计准则（2018）', '小企业会计准则（2013）'}
+        assert general.account('1002').qualname == '银行存款'
+        assert [a.code for a in general.childrenOf('1002')] == [a.code for a in general.accounts
+                                                                if a.parent_code == '1002']
+        assert general.by_major_category['资产类'][0].code == '1001'
+        # the legacy tables are built from the same data
+        assert [a['科目代码'] for accounts in standards.ACCOUNTS_GENERAL_STANDARD_2018.values() for a in accounts] == \
+               [a.code for a in general.accounts]
+        with pytest.raises(ValueError):
+            standards.standard('不存在')
+        assert sorted((a.code, a.qualname, a.major_category, a.direction) for a in System.accounts()) == \
+               sorted((a.code, a.qualname, a.major_category, a.direction) for a in general.accounts)
+        assert [e.item for e in System.balanceSheetTemplate('默认').entries if e.item] == \
+               [line.item for lines in general.balance_sheet.values() for line in lines if line.item]
+
+    def test_new_from_template(self, tmp_path, template_dir, monkeypatch):
+        templates = sorted(template_dir.glob('accounts_general_2018-*.db'))
+        assert len(templates) == 1
+        stamps = [t.stat().st_mtime_ns for t in templates]
+        chart = sorted((a.code, a.qualname, a.direction) for a in System.accounts())
+        System.new(tmp_path / '公司.db', '一般企业会计准则（2018）', datetime.date(2024, 3, 15))
+        meta = System.meta()
+        assert (meta.company, meta.month_from, meta.month_until) == \
+               ('公司', datetime.date(2024, 3, 1), datetime.date(2024, 3, 1))
+        assert sorted((a.code, a.qualname, a.direction) for a in System.accounts()) == chart
+        assert [t.stat().st_mtime_ns for t in templates] == stamps
+        System.new(tmp_path / 'small.db', '小企业会计准则（2013）', datetime.date(2024, 3, 1))
+        assert System.meta().standard == '小企业会计准则（2013）'
+        assert System.account('6000').currency.name == '人民币'
+        assert System.currency('人民币').is_local
+        # a new template version builds the template again and deletes the one it supersedes
+        monkeypatch.setattr(system, 'TEMPLATE_VERSION', system.TEMPLATE_VERSION + 1)
+        System.new(tmp_path / '新公司.db', '一般企业会计准则（2018）', datetime.date(2024, 3, 1))
+        rebuilt = sorted(template_dir.glob('accounts_general_2018-*.db'))
+        assert len(rebuilt) == 1 and rebuilt != templates
+        assert sorted((a.code, a.qualname, a.direction) for a in System.accounts()) == chart
+
+    def test_account_hierarchy(self, tmp_path):
+        assert (System.account('1002').depth, System.account('1002').is_leaf) == (0, False)
+        assert (System.account('1002.01').depth, System.account('1002.01').is_leaf) == (1, True)
+        System.createAccount('1002.01', '1002.01.05', 'xxx')
+        assert not System.account('1002.01').is_leaf
+        assert (System.account('1002.01.05').depth, System.account('1002.01.05').is_leaf) == (2, True)
+        with pytest.raises(IllegalOperation):
+            System.deleteAccount('1002.01')
+        System.deleteAccount('1002.01.05')
+        assert System.account('1002.01').is_leaf
+        System.createAccount('1002.01', '1002.01.05', 'xxx')
+
+        # a book of an earlier version gets the columns on its next bind
+        filename = str(FFDB.db.provider.pool.filename)
+        expected = sorted((a.code, a.depth, a.is_leaf) for a in System.accounts())
+        FFDB.bindDatabase(tmp_path / 'other.db')
+        connection = sqlite3.connect(filename)
+        for (name,) in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND sql LIKE '%is_leaf%'"):
+            connection.execute(f'DROP INDEX "{name}"')
+        connection.execute('ALTER TABLE "Account" DROP COLUMN "depth"')
+        connection.execute('ALTER TABLE "Account" DROP COLUMN "is_leaf"')
+        connection.commit()
+        connection.close()
+        System.bindDatabase(pathlib.Path(filename))
+        assert sorted((a.code, a.depth, a.is_leaf) for a in System.accounts()) == expected
+
+    def test_balance_index(self):
+        rng = random.Random(48)
+        values = [rng.randint(-1000, 1000) for _ in range(100)]
+        tree = FenwickTree(values)
+        for i in range(-1, 120, 7):
+            assert tree.prefix(i) == sum(values[:i + 1])
+        tree.add(5, 3)
+        assert tree.prefix(99) == sum(values) + 3
+
+        System.createCurrency('美元')
+        System.setAccountCurrency('1122', '美元')
+        System.setAccountCurrency('1001', '人民币')
+        vouchers = {}   # number -> date, side of 1122, currency, amount, exchange_rate, in the order of their entries
+
+        def post(number, date, currency, amount, exchange_rate, side='debit'):
+            if number not in vouchers:
+                System.createVoucher(number, date)
+            local_amount = FloatWithPrecision(amount * exchange_rate).value
+            entries = ([VoucherEntry(account_code='1122', amount=amount, currency=currency, exchange_rate=exchange_rate)],
+                       [VoucherEntry(account_code='1001', amount=local_amount, currency='人民币', exchange_rate=1.0)])
+            System.updateDebitCreditEntries(number, *(entries if side == 'debit' else entries[::-1]))
+            # the entries are written again, after those of the other vouchers
+            vouchers.pop(number, None)
+            vouchers[number] = (date, side, currency, amount, exchange_rate)
+
+        def scanned(date_from, date_until):
+            """incurredBalances of 1122 the way the entries were scanned before the index, rounding every sum"""
+            begin, begin_local, debit, debit_local, credit, credit_local = [FloatWithPrecision(0.0) for _ in range(6)]
+            total, total_local = FloatWithPrecision(0.0), FloatWithPrecision(0.0)
+            for side in ('debit', 'credit'):
+                sign = 1 if side == 'debit' else -1
+                for date, entry_side, currency, amount, exchange_rate in vouchers.values():
+                    if date > date_until or entry_side != side:
+                        continue
+                    if currency == '美元':
+                        total += sign * amount
+                        if date < date_from:
+                            begin += sign * amount
+                        elif side == 'debit':
+                            debit += amount
+                        else:
+                            credit += amount
+                    local_amount = amount * exchange_rate
+                    total_local += sign * local_amount
+                    if date < date_from:
+                        begin_local += sign * local_amount
+                    elif side == 'debit':
+                        debit_local += local_amount
+                    else:
+                        credit_local += local_amount
+                # 1for
+            # 1for
+            return begin, begin_local, debit, debit_local, credit, credit_local, total, total_local
+
+        def check():
+            for _ in range(20):
+                date_from = datetime.date(2000, 1, 1) + datetime.timedelta(days=rng.randint(0, 400))
+                date_until = date_from + datetime.timedelta(days=rng.randint(-10, 200))
+                balances = System.incurredBalances('1122', date_from, date_until)
+                assert [b.value for b in balances] == [b.value for b in scanned(date_from, date_until)]
+                assert [b.value for b in System.endingBalance('1122', date_until)] == \
+                       [b.value for b in scanned(date_from, date_until)[6:]]
+            # 1for
+
+        # whole cents, answered by the index
+        for i in range(60):
+            date = datetime.date(2000, 1, 1) + datetime.timedelta(days=rng.randint(0, 365))
+            currency, exchange_rate = rng.choice([('美元', round(rng.uniform(6.5, 7.5), 2)), ('人民币', 1.0)])
+            post(f'{date:%Y-%m}/{i:04d}', date, currency, float(rng.randint(1, 10000)), exchange_rate,
+                 rng.choice(['debit', 'debit', 'credit']))
+        # 1for
+        check()
+        # the writes after the balances are indexed update them in place
+        for number in rng.sample(sorted(vouchers), 10):
+            date, side, currency, amount, exchange_rate = vouchers[number]
+            post(number, date, currency, amount * 2, exchange_rate, side)
+        # 1for
+        for number in rng.sample(sorted(vouchers), 10):
+            date = vouchers[number][0].replace(day=1)
+            System.setVoucherDate(number, date)
+            vouchers[number] = (date,) + vouchers[number][1:]
+        # 1for
+        for number in rng.sample(sorted(vouchers), 10):
+            System.deleteVoucher(number)
+            del vouchers[number]
+        # 1for
+        post('2003-06/0001', datetime.date(2003, 6, 1), '美元', 1.0, 7.0)    # outside of the indexed days
+        check()
+
+        # local amounts in fractions of a cent, a half cent credited after a debit rounds differently
+        # than the two rounded apart: 100.00 - 0.005 is 100.00, not 99.99
+        post('2000-01/9001', datetime.date(2000, 1, 2), '美元', 10000.0, 0.01)
+        post('2000-01/9002', datetime.date(2000, 1, 3), '美元', 0.5, 0.01, 'credit')
+        for i in range(20):
+            date = datetime.date(2000, 1, 1) + datetime.timedelta(days=rng.randint(0, 365))
+            post(f'{date:%Y-%m}/9{i:03d}x', date, '美元', round(rng.uniform(0.01, 100), 2),
+                 rng.choice([0.01, 0.03, round(rng.uniform(6.5, 7.5), 4)]), rng.choice(['debit', 'credit']))
+        # 1for
+        check()
+        # and back to whole cents
+        for number in [n for n, v in vouchers.items() if n.startswith('2000-01/900') or n.endswith('x')]:
+            System.deleteVoucher(number)
+            del vouchers[number]
+        # 1for
+        check()
+
+    def test_concurrent_writes_and_reports(self):
+        System.setAccountCurrency('1122', '人民币')
+        System.setAccountCurrency('1001', '人民币')
+        totals = []
+
+        def write(worker):
+            try:
+                for i in range(40):
+                    number = f'2000-01/{worker}{i:03d}'
+                    System.createVoucher(number, datetime.date(2000, 1, 1) + datetime.timedelta(days=i))
+                    System.updateDebitCreditEntries(number,
+                        [VoucherEntry(account_code='1122', amount=1.0 + i, currency='人民币', exchange_rate=1.0)],
+                        [VoucherEntry(account_code='1001', amount=1.0 + i, currency='人民币', exchange_rate=1.0)])
+                # 1for
+            finally:
+                FFDB.db.disconnect()
+
+        def total():
+            until = datetime.date(2000, 12, 31)
+            return (System.endingBalance('1122', until)[1] + System.endingBalance('1001', until)[1]).value
+
+        def read(_):
+            try:
+                for _ in range(60):
+                    # the two balances are read apart, only a read overlapping no write sees them balance
+                    totals.append(System.consistentRead(total))
+                # 1for
+            finally:
+                FFDB.db.disconnect()
+
+        with concurrent.futures.ThreadPoolExecutor(4) as pool:
+            futures = [pool.submit(write, 'a'), pool.submit(write, 'b'), pool.submit(read, 0), pool.submit(read, 1)]
+            for future in futures:
+                future.result()     # raises what the thread raised, e.g. database is locked
+        # !with
+        assert len(totals) == 120 and set(totals) == {0.0}
+        assert System.endingBalance('1122', datetime.date(2000, 12, 31))[1].value == sum(1.0 + i for i in range(40)) * 2
+        with FFDB.db_session:
+            assert FFDB.db.select('select * from pragma_journal_mode') == ['wal']
+            # a ledger read within an open session leaves no transaction behind
+            opening, entries = System.ledgerEntries('1122', datetime.date(2000, 1, 1), datetime.date(2000, 12, 31))
+            assert len(entries) == 80
+        # !with
+        System.createVoucher('2000-02/0001', datetime.date(2000, 2, 1))
+        with concurrent.futures.ThreadPoolExecutor(1) as pool:
+            pool.submit(write, 'c').result(timeout=30)
+        opening, entries = System.ledgerEntries('1122', datetime.date(2000, 1, 1), datetime.date(2000, 12, 31))
+        assert len(entries) == 120
+        System.deleteVoucher('2000-02/0001')
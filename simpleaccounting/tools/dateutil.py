@@ -16,8 +16,11 @@
 
 import datetime
 import calendar
+import typing
 from dateutil.relativedelta import relativedelta
-from qtpy import QtCore
+
+if typing.TYPE_CHECKING:
+    from qtpy import QtCore
 
 
 def months_between(start_date: datetime.date, end_date: datetime.date) -> int:
@@ -105,5 +108,5 @@ def last_day_of_previous_year(date: datetime.date) -> datetime.date:
     return datetime.date(date.year - 1, 12, 31)
 
 
-def qdate_to_date(qdate: QtCore.QDate) -> datetime.date:
+def qdate_to_date(qdate: 'QtCore.QDate') -> datetime.date:
     return datetime.date(qdate.year(), qdate.month(), qdate.day())
\ No newline at end of file
@@ -0,0 +1,103 @@
+"""
+    Copyright 2024- ZiJian Jiang @ https://github.com/CallmeNezha
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+import json
+import pathlib
+import re
+import typing
+
+try:
+    import pypinyin
+except ImportError:  # pinyin search is optional
+    pypinyin = None
+
+HAN_RUN = re.compile(r'[\u4E00-\u9FFF]+')
+FORMAT_VERSION = 1
+
+
+def available() -> bool:
+    return pypinyin is not None
+
+
+def han_runs(text: str) -> list[tuple[int, str]]:
+    """(start, run) of the runs of Chinese characters in ``text``"""
+    return [(m.start(), m.group()) for m in HAN_RUN.finditer(text)]
+
+
+def to_syllables(run: str) -> typing.Optional[list[str]]:
+    """One lower case pinyin syllable without tone per character of ``run``, None without pypinyin"""
+    if pypinyin is None:
+        return None
+    # converted as a whole so that phrases pick the right reading, e.g. 银行 yin hang
+    syllables = pypinyin.lazy_pinyin(run, errors=lambda chars: list(chars))
+    if len(syllables) != len(run):
+        syllables = [pypinyin.lazy_pinyin(c, errors=lambda chars: list(chars))[0] for c in run]
+    return [s.lower() for s in syllables]
+
+
+class PinyinTable:
+    """
+    Pinyin syllables of the runs of Chinese characters of a set of texts.
+
+    Converting with pypinyin is slow, the table is therefore saved next to the
+    book and only texts that are new since are converted. A saved table can be
+    used without pypinyin, texts that are not in it then have no pinyin.
+    """
+
+    def __init__(self, syllables: dict[str, list[str]] = None):
+        self._syllables: dict[str, list[str]] = dict(syllables or {})
+
+    def __len__(self) -> int:
+        return len(self._syllables)
+
+    def __contains__(self, run: str) -> bool:
+        return run in self._syllables
+
+    def syllables(self, run: str) -> typing.Optional[list[str]]:
+        """Syllables of a run of Chinese characters, converted and kept if missing"""
+        if (syllables := self._syllables.get(run)) is None:
+            if (syllables := to_syllables(run)) is not None:
+                self._syllables[run] = syllables
+        return syllables
+
+    def update(self, texts: typing.Iterable[str]) -> bool:
+        """Covers exactly the runs of ``texts``, returns whether the table changed"""
+        runs = {run for text in texts for _, run in han_runs(text)}
+        changed = False
+        for run in set(self._syllables) - runs:
+            del self._syllables[run]
+            changed = True
+        # 1for
+        for run in runs:
+            if run not in self._syllables and self.syllables(run) is not None:
+                changed = True
+        # 1for
+        return changed
+
+    @staticmethod
+    def load(filename: pathlib.Path) -> 'PinyinTable':
+        """The table saved in ``filename``, an empty one if there is none or it can't be read"""
+        try:
+            data = json.loads(pathlib.Path(filename).read_text(encoding='utf-8'))
+            if data.get('version') == FORMAT_VERSION:
+                return PinyinTable(data['syllables'])
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+        return PinyinTable()
+
+    def save(self, filename: pathlib.Path):
+        data = {'version': FORMAT_VERSION, 'syllables': self._syllables}
+        pathlib.Path(filename).write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
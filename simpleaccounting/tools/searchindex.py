@@ -0,0 +1,187 @@
+"""
+    Copyright 2024- ZiJian Jiang @ https://github.com/CallmeNezha
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+import typing
+
+from collections import defaultdict
+
+from simpleaccounting.tools import stringscores
+from simpleaccounting.tools.pinyin import PinyinTable, han_runs
+
+MAX_PINYIN_PREFIX = 12
+
+
+def char_mask(text: str) -> int:
+    """64 bit set of the characters of ``text``, characters sharing a bit only make the filter looser"""
+    mask = 0
+    for c in set(text):
+        mask |= 1 << (ord(c) & 63)
+    return mask
+
+
+def bit_indices(bits: int) -> list[int]:
+    """Positions of the set bits of ``bits``, ascending"""
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+    return [i * 8 + k for i, byte in enumerate(data) if byte for k in range(8) if byte >> k & 1]
+
+
+def is_subsequence(query: str, text: str) -> bool:
+    """True if the characters of ``query`` appear in ``text`` in order"""
+    pos = 0
+    for c in query:
+        pos = text.find(c, pos) + 1
+        if not pos:
+            return False
+    # 1for
+    return True
+
+
+class SearchResult(typing.NamedTuple):
+    index: int          # position of the choice in the index
+    choice: str
+    enriched: str       # the choice with the matched letters wrapped in the template
+    score: int          # lower is better, see stringscores.matchingScore
+
+
+class SearchIndex:
+    """
+    Fuzzy search over a fixed list of choices with the results and scores of
+    :func:`stringscores.findMatchingChoices`.
+
+    Every choice keeps the bitmap of its characters, a choice whose bitmap does not
+    cover the query's cannot match and is skipped before the subsequence test. The
+    bitmaps are also kept transposed, so that the choices covering the query are
+    found with a few big integer ANDs instead of a pass over all choices. Only the
+    remaining candidates are scored. The candidates of the last query are kept:
+    when the new query contains the last one in order, e.g. when the user types one
+    more character, only those candidates are looked at again.
+
+    With a :class:`PinyinTable` a query of latin letters also finds the choices
+    having a run of Chinese characters whose pinyin initials or full pinyin start
+    with the query, e.g. ``yhck`` or ``yinhang`` find 银行存款. These are looked up
+    in a dict of prefixes and scored against the pinyin by the same rules.
+
+    Build one index per list of choices and build it again when the list changes.
+    """
+
+    def __init__(self, choices: typing.Iterable[str], ignore_case: bool = True, pinyin: PinyinTable = None):
+        self.choices: list[str] = list(choices)
+        self.ignore_case = ignore_case
+        self._folded = [c.lower() for c in self.choices] if ignore_case else self.choices
+        self._masks = [char_mask(c) for c in self._folded]
+        # bit -> the choices having a character on that bit, as the bits of an int
+        columns = [bytearray((len(self.choices) + 7) // 8) for _ in range(64)]
+        for i, mask in enumerate(self._masks):
+            while mask:
+                low = mask & -mask
+                columns[low.bit_length() - 1][i >> 3] |= 1 << (i & 7)
+                mask ^= low
+            # 1while
+        # 1for
+        self._choices_of_bit = [int.from_bytes(c, 'little') for c in columns]
+        self._last_query: typing.Optional[str] = None
+        self._last_candidates: list[int] = []
+        # pinyin prefix -> (choice index, pinyin, position in the choice of every pinyin letter)
+        self._pinyin: dict[str, list[tuple[int, str, tuple[int, ...]]]] = defaultdict(list)
+        if pinyin is not None:
+            for i, choice in enumerate(self.choices):
+                for start, run in han_runs(choice):
+                    if syllables := pinyin.syllables(run):
+                        self.__addPinyin(i, ''.join(s[:1] for s in syllables), tuple(range(start, start + len(run))))
+                        self.__addPinyin(i, ''.join(syllables),
+                                         tuple(start + k for k, s in enumerate(syllables) for _ in s))
+                # 1for
+            # 1for
+        # !if
+        self._pinyin = dict(self._pinyin)
+
+    def __len__(self) -> int:
+        return len(self.choices)
+
+    def candidates(self, query: str) -> list[int]:
+        """Indices of the choices containing the letters of ``query`` in order"""
+        query = self.__fold(query)
+        if not query:
+            return list(range(len(self.choices)))
+
+        mask = char_mask(query)
+        masks, folded = self._masks, self._folded
+        if self._last_query is not None and is_subsequence(self._last_query, query):
+            pool = [i for i in self._last_candidates if masks[i] & mask == mask]
+        else:
+            covering = (1 << len(self.choices)) - 1
+            for bit in bit_indices(mask):
+                covering &= self._choices_of_bit[bit]
+            pool = bit_indices(covering)
+        # !if
+        candidates = [i for i in pool if is_subsequence(query, folded[i])]
+        self._last_query, self._last_candidates = query, candidates
+        return candidates
+
+    def search(self, query: str, template: str = '{}', sort: bool = True) -> list[SearchResult]:
+        """Matching choices with their enriched text and score, best first when ``sort``"""
+        query = query.replace(' ', '')
+        if not query:
+            return [SearchResult(i, c, c, stringscores.NO_SCORE) for i, c in enumerate(self.choices)]
+
+        results = []
+        for i in self.candidates(query):
+            _, enriched, score = stringscores.matchingScore(query, self.choices[i],
+                                                            ignore_case=self.ignore_case,
+                                                            apply_regex=False, template=template)
+            results.append(SearchResult(i, self.choices[i], enriched, score))
+        # 1for
+        if self._pinyin and query.isascii() and query.isalpha():
+            results = self.__mergePinyin(query.lower(), results, template)
+        if sort:
+            results.sort(key=lambda r: r.score)
+        return results
+
+    def __addPinyin(self, index: int, pinyin: str, positions: tuple[int, ...]):
+        for n in range(1, min(len(pinyin), MAX_PINYIN_PREFIX) + 1):
+            self._pinyin[pinyin[:n]].append((index, pinyin, positions))
+
+    def __mergePinyin(self, query: str, results: list[SearchResult], template: str) -> list[SearchResult]:
+        """Adds the pinyin matches to ``results``, a choice found both ways keeps its best score"""
+        best = {r.index: r for r in results}
+        scores = {}     # many choices share a run of Chinese characters
+        for i, pinyin, positions in self._pinyin.get(query[:MAX_PINYIN_PREFIX], ()):
+            if len(query) > MAX_PINYIN_PREFIX and not pinyin.startswith(query):
+                continue
+            if (score := scores.get(pinyin)) is None:
+                score = scores[pinyin] = stringscores.matchingScore(query, pinyin, apply_regex=False)[2]
+            if i in best and best[i].score <= score:
+                continue
+            best[i] = SearchResult(i, self.choices[i], self.__enrich(self.choices[i], positions[:len(query)], template), score)
+        # 1for
+        return sorted(best.values(), key=lambda r: r.index)
+
+    @staticmethod
+    def __enrich(choice: str, positions: typing.Iterable[int], template: str) -> str:
+        """``choice`` html escaped with the characters at ``positions`` wrapped in ``template``"""
+        parts = []
+        last = 0
+        for k in sorted(set(positions)):
+            parts.append(stringscores.htmlEscape(choice[last:k]))
+            parts.append(template.format(stringscores.htmlEscape(choice[k])))
+            last = k + 1
+        # 1for
+        parts.append(stringscores.htmlEscape(choice[last:]))
+        return ''.join(parts)
+
+    def __fold(self, query: str) -> str:
+        query = query.replace(' ', '')
+        return query.lower() if self.ignore_case else query
@@ -15,9 +15,12 @@
 """
 
 from qtpy import QtWidgets, QtCore, QtGui
-from simpleaccounting.widgets.qwidgets import CustomInputDialog, HorizontalSpacer
+from simpleaccounting.widgets.qwidgets import CustomInputDialog, HorizontalSpacer, insertAccountItem, \
+    removeAccountItem, updateAccountItem
+from simpleaccounting.app import events
+from simpleaccounting.app.notifier import SystemNotifier
 from simpleaccounting.app.system import System, IllegalOperation, EntryNotFound
-from simpleaccounting.tools import stringscores
+from simpleaccounting.tools.searchindex import SearchIndex
 
 
 class AccountCreateDialog(CustomInputDialog):
@@ -200,18 +203,16 @@ class AccountWidget(QtWidgets.QWidget):
         vbox.addWidget(self.toolbar)
 
         vbox.addWidget(splitter)
+        SystemNotifier.instance().changed.connect(self.on_systemChanged)
 
     def updateUI(self):
         """"""
         self.items = {}
+        self.tree.clear()
         self.tree.setHeaderLabels(["代码", "名称"])
 
         for account in System.accounts():
-            item = QtWidgets.QTreeWidgetItem()
-            item.setText(0, account.code)
-            item.setText(1, account.name)
-            item.setData(0, QtCore.Qt.UserRole, account)
-            self.items[account.code] = item
+            self.items[account.code] = self.createItem(account)
 
         for code, item in self.items.items():
             account = item.data(0, QtCore.Qt.UserRole)
@@ -221,10 +222,47 @@ class AccountWidget(QtWidgets.QWidget):
                 self.tree.addTopLevelItem(item)
 
         self.cbox_account.clear()
+        self.account_index = None       # built on first search
         for account in System.accounts():
             self.cbox_account.addItem(f"{account.code} {account.name}", account)
         # 1for
 
+    @staticmethod
+    def createItem(account) -> QtWidgets.QTreeWidgetItem:
+        item = QtWidgets.QTreeWidgetItem()
+        item.setText(0, account.code)
+        item.setText(1, account.name)
+        item.setData(0, QtCore.Qt.UserRole, account)
+        return item
+
+    def on_systemChanged(self, event):
+        """Applies the account changes to the tree and the combobox item by item"""
+        if isinstance(event, events.AccountCreated):
+            account = System.account(event.code)
+            item = self.createItem(account)
+            self.items[event.code] = item
+            if parent := self.items.get(event.parent_code):
+                parent.addChild(item)
+                # no longer a leaf
+                parent.setData(0, QtCore.Qt.UserRole, System.account(event.parent_code))
+            insertAccountItem(self.cbox_account, account)
+            self.account_index = None
+        elif isinstance(event, events.AccountDeleted):
+            if item := self.items.pop(event.code, None):
+                parent = item.parent()
+                parent.removeChild(item)
+                # a leaf again when it was the last child
+                parent.setData(0, QtCore.Qt.UserRole, System.account(parent.text(0)))
+            removeAccountItem(self.cbox_account, event.code)
+            self.account_index = None
+        elif isinstance(event, events.AccountCurrencySet):
+            account = System.account(event.code)
+            if item := self.items.get(event.code):
+                item.setData(0, QtCore.Qt.UserRole, account)
+            updateAccountItem(self.cbox_account, account)
+        elif isinstance(event, events.BookOpened):
+            self.updateUI()
+
     def on_select(self, current, previous):
         """"""
         self.action_create.setEnabled(False)
@@ -235,7 +273,7 @@ class AccountWidget(QtWidgets.QWidget):
 
         account = current.data(0, QtCore.Qt.UserRole)
 
-        if account.children:
+        if not account.is_leaf:
             self.stacked.setCurrentWidget(self.widget_branch_property)
             self.label_branch_code.setText(account.code)
             self.label_branch_name.setText(account.name)
@@ -300,14 +338,8 @@ class AccountWidget(QtWidgets.QWidget):
                                                    "错误代码 A1.1/2："
                                                    "科目应具有唯一的科目代码。")
                 return False
-
-            item_parent = self.tree.currentItem()
-            item = QtWidgets.QTreeWidgetItem()
-            item.setText(0, code)
-            item.setText(1, name)
-            item.setData(0, QtCore.Qt.UserRole, System.account(code))
-            item_parent.addChild(item)
-            self.tree.setCurrentItem(item)
+            # the item was added by on_systemChanged
+            self.tree.setCurrentItem(self.items[code])
             return True
 
         dialog = AccountCreateDialog(add)
@@ -322,6 +354,7 @@ class AccountWidget(QtWidgets.QWidget):
             return
 
         account = item.data(0, QtCore.Qt.UserRole)
+        parent = item.parent()
         try:
             System.deleteAccount(account.code)
         except EntryNotFound as e:
@@ -351,9 +384,8 @@ class AccountWidget(QtWidgets.QWidget):
                     "錯誤代碼 A1.2.1/6：分类科目不可删除。"
                 )
             return
-
-        parent = item.parent()
-        parent.removeChild(item)
+        # the item was removed by on_systemChanged
+        self.tree.setCurrentItem(parent)
         self.on_select(parent, None)
     #
     def on_activate(self):
@@ -373,8 +405,7 @@ class AccountWidget(QtWidgets.QWidget):
             # !if
             account = item.data(0, QtCore.Qt.UserRole)
             System.setAccountCurrency(account.code, currency, need_exchange_gains_losses)
-            # update item in user role
-            item.setData(0, QtCore.Qt.UserRole, System.account(account.code))
+            # the item in user role was updated by on_systemChanged
             self.on_select(item, item)
             return True
 
@@ -388,19 +419,13 @@ class AccountWidget(QtWidgets.QWidget):
             if self.cbox_account.itemData(i, QtCore.Qt.UserRole) is None:
                 self.cbox_account.removeItem(i)
         # 1To
-        accounts = [self.cbox_account.itemData(i, QtCore.Qt.UserRole) for i in range(self.cbox_account.count())]
-
-        rets = stringscores.findMatchingChoices(
-            editedText,
-            [f"{a.code} {a.name}" for a in accounts],
-            template='<b>{0}</b>',
-            valid_only=True,
-            sort=True
-        )
+        if self.account_index is None:
+            self.account_index = SearchIndex((self.cbox_account.itemText(i) for i in range(self.cbox_account.count())),
+                                             pinyin=System.accountPinyin())
+        # !if
+        rets = self.account_index.search(editedText, template='<b>{0}</b>')
         if rets:
-            name, named, _ = rets[0]
-            index = next((i for i, a in enumerate(accounts) if f"{a.code} {a.name}" == name), None)
-            self.cbox_account.setCurrentIndex(index) if index else ...
+            self.cbox_account.setCurrentIndex(rets[0].index)
         else:
             self.cbox_account.setCurrentIndex(0)
 
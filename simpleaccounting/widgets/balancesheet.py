@@ -17,8 +17,11 @@
 from qtpy import QtWidgets, QtCore, QtGui
 
 from simpleaccounting.tools.dateutil import last_day_of_month, qdate_to_date
-from simpleaccounting.widgets.qwidgets import HorizontalSpacer, CustomInputDialog
+from simpleaccounting.widgets.qwidgets import HorizontalSpacer, CustomInputDialog, ReportProgressBar
+from simpleaccounting.app import events
+from simpleaccounting.app.notifier import SystemNotifier
 from simpleaccounting.app.system import System
+from simpleaccounting.app.reportjob import ReportJobRunner
 
 import typing
 
@@ -73,6 +76,12 @@ class BalanceSheetWidget(QtWidgets.QWidget):
         self.de_until.setDate(last_day_of_month(System.meta().month_until))
         self.cb_template = QtWidgets.QComboBox()
         self.cb_template.setSizeAdjustPolicy(QtWidgets.QComboBox.SizeAdjustPolicy.AdjustToContents)
+        self.runner = ReportJobRunner(self)
+        self.runner.finished.connect(self.on_runnerFinished)
+        self.runner.failed.connect(self.on_runnerFailed)
+        self.pbar = ReportProgressBar(self.runner)
+        self.de_until.dateChanged.connect(self.runner.cancel)
+        self.cb_template.currentIndexChanged.connect(self.runner.cancel)
         # --- layout
         container = QtWidgets.QWidget()
         hbox = QtWidgets.QHBoxLayout(container)
@@ -84,6 +93,7 @@ class BalanceSheetWidget(QtWidgets.QWidget):
         self.tbar.setToolButtonStyle(QtCore.Qt.ToolButtonTextUnderIcon)
         self.tbar.addAction(self.action_edit_template)
         self.tbar.addWidget(HorizontalSpacer())
+        self.pbar.addToToolBar(self.tbar)
         self.tbar.addWidget(container)
         self.tbar.addSeparator()
         self.tbar.addAction(self.action_pull)
@@ -93,6 +103,7 @@ class BalanceSheetWidget(QtWidgets.QWidget):
         vbox = QtWidgets.QVBoxLayout(self)
         vbox.addWidget(self.tbar)
         vbox.addWidget(self.table)
+        SystemNotifier.instance().changed.connect(self.on_systemChanged)
 
     def updateUI(self):
         """"""
@@ -104,6 +115,7 @@ class BalanceSheetWidget(QtWidgets.QWidget):
 
     def clearTable(self):
         """"""
+        self.runner.cancel()
         self.table.clear()
         self.table.setHorizontalHeaderLabels(["资产", "行次",
                                               "期末余额", "上年年末余额",
@@ -161,13 +173,17 @@ class BalanceSheetWidget(QtWidgets.QWidget):
         # 1for
         date = qdate_to_date(self.de_until.date())
         self.setWindowTitle(f"{date.strftime('%Y年度')}资产负债表")
-        #!
-        bste = self.cb_template.currentData(QtCore.Qt.UserRole)
+        # the amounts are filled in by on_runnerFinished
+        self.table.resizeRowsToContents()
+        # both sides from one state of the book, a voucher saved meanwhile would unbalance them
+        self.runner.start(lambda job: (bste, System.consistentRead(lambda: System.balanceSheet(bste, date))))
+
+    def on_runnerFinished(self, result):
+        """"""
+        bste, (beginnings, endings) = result
         asset_entries = [e for e in bste.entries if e.category == '资产']
         liability_entries = [e for e in bste.entries if e.category == '负债和所有者权益']
         #!
-        beginnings, endings = System.balanceSheet(bste, date)
-        #!
         for i, (left, right) in enumerate(zip(asset_entries, liability_entries)):
             if lineno := left.line_number:
                 beginning, ending = beginnings[lineno], endings[lineno]
@@ -183,11 +199,33 @@ class BalanceSheetWidget(QtWidgets.QWidget):
         # 1for
         self.table.resizeRowsToContents()
 
+    def on_runnerFailed(self, e: Exception):
+        QtWidgets.QMessageBox.critical(None, "拉取失败", f"{e}")
+
     def on_action_editTemplateTriggered(self):
         dialog = BalanceSheetTemplateDialog()
         dialog.resize(1600, 600)
         dialog.exec_()
-        self.updateUI()
+
+    def on_systemChanged(self, event):
+        """Applies template changes to the template combobox item by item"""
+        if isinstance(event, events.BalanceSheetTemplateCreated):
+            self.cb_template.addItem(event.name, System.balanceSheetTemplate(event.name))
+        elif isinstance(event, events.BalanceSheetTemplateDeleted):
+            if (index := self.cb_template.findText(event.name)) != -1:
+                self.cb_template.removeItem(index)
+        elif isinstance(event, events.BalanceSheetTemplateRenamed):
+            if (index := self.cb_template.findText(event.old_name)) != -1:
+                self.cb_template.setItemText(index, event.new_name)
+                self.cb_template.setItemData(index, System.balanceSheetTemplate(event.new_name), QtCore.Qt.UserRole)
+        elif isinstance(event, events.BalanceSheetTemplateUpdated):
+            if (index := self.cb_template.findText(event.name)) != -1:
+                self.cb_template.setItemData(index, System.balanceSheetTemplate(event.name), QtCore.Qt.UserRole)
+                # the rows on display no longer match the template
+                if index == self.cb_template.currentIndex():
+                    self.clearTable()
+        elif isinstance(event, events.BookOpened):
+            self.updateUI()
 
     def on_action_pullTriggered(self):
         """"""
@@ -236,6 +274,7 @@ class BalanceSheetTemplateDialog(CustomInputDialog):
         self.splitter.setSizes([150, 600])
         vbox = QtWidgets.QVBoxLayout(self)
         vbox.addWidget(self.splitter)
+        SystemNotifier.instance().changed.connect(self.on_systemChanged)
         self.apply_button = self.button_box.addButton(QtWidgets.QDialogButtonBox.StandardButton.Apply)
         self.apply_button.clicked.connect(self.on_applyButtonClicked)
         self.apply_button.setEnabled(False)
@@ -253,6 +292,17 @@ class BalanceSheetTemplateDialog(CustomInputDialog):
             self.list.addItem(bste.name)
         # 1for
 
+    def on_systemChanged(self, event):
+        """"""
+        if isinstance(event, events.BalanceSheetTemplateCreated):
+            self.list.addItem(event.name)
+        elif isinstance(event, events.BalanceSheetTemplateDeleted):
+            for item in self.list.findItems(event.name, QtCore.Qt.MatchExactly):
+                self.list.takeItem(self.list.row(item))
+        elif isinstance(event, events.BalanceSheetTemplateRenamed):
+            for item in self.list.findItems(event.old_name, QtCore.Qt.MatchExactly):
+                item.setText(event.new_name)
+
     def on_applyButtonClicked(self, button):
         self.saveCurrent()
         self.apply_button.setEnabled(False)
@@ -361,7 +411,6 @@ class BalanceSheetTemplateDialog(CustomInputDialog):
                 text = ''
         # 1while
         System.changeBalanceSheetTemplateName(item.text(), text.strip())
-        self.updateUI()
 
     def on_action_copyTriggered(self):
         item = self.list.currentItem()
@@ -371,7 +420,6 @@ class BalanceSheetTemplateDialog(CustomInputDialog):
         asset_entries = [(e.item, e.line_number, e.formula) for e in bste.entries if e.category == '资产']
         liability_entries = [(e.item, e.line_number, e.formula) for e in bste.entries if e.category == '负债和所有者权益']
         System.updateBalanceSheetTemplate(new_name, asset_entries, liability_entries)
-        self.updateUI()
 
     def on_action_addTriggered(self):
         text = ''
@@ -388,9 +436,7 @@ class BalanceSheetTemplateDialog(CustomInputDialog):
                 text = ''
         # 1while
         System.createBalanceSheetTemplate(text.strip())
-        self.updateUI()
 
     def on_action_removeTriggered(self):
         item = self.list.currentItem()
         System.deleteBalanceSheetTemplate(item.text())
-        self.updateUI()
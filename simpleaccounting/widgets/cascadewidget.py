@@ -18,7 +18,8 @@ import abc
 import weakref
 import typing
 from qtpy import QtWidgets, QtCore, QtGui
-from simpleaccounting.tools import stringscores
+from simpleaccounting.tools.pinyin import PinyinTable
+from simpleaccounting.tools.searchindex import SearchIndex
 
 VALID_ACCENT_CHARS = "ÁÉÍOÚáéíúóàèìòùÀÈÌÒÙâêîôûÂÊÎÔÛäëïöüÄËÏÖÜñÑ"
 VALID_FINDER_CHARS = r"[A-Za-z\s{0}0-9]".format(VALID_ACCENT_CHARS)
@@ -54,42 +55,51 @@ class CNSearchLineEdit(QtWidgets.QLineEdit):
             super(CNSearchLineEdit, self).keyPressEvent(event)
 
 
-class CNCascadingListsWidgetItem(QtWidgets.QListWidgetItem):
+class CNCascadingListsWidgetItem:
     """CascadingListWidgetItem"""
     def __init__(self,
                  text: str,
                  icon: QtGui.QIcon=None,
-                 parent: 'CNCascadingListsWidgetItem' =None,
-                 typed=QtWidgets.QListWidgetItem.ItemType.UserType):
+                 parent: 'CNCascadingListsWidgetItem' =None):
         """"""
-        super().__init__(None, typed)
         self._text = text
         self._icon = icon or QtGui.QIcon()
+        self._data = {}
         self._children = []
-        self._parentItem = parent
-        if self._parentItem:
+        self._parentItem = None
+        if parent:
             parent.addChild(self)
 
     def parent(self):
         return self._parentItem
 
     def setParent(self, item: typing.Optional['CNCascadingListsWidgetItem']):
-        self._parentItem = item
-        self._parentItem.addChild(self)
+        if item is self._parentItem:
+            return
+        if self._parentItem:
+            self._parentItem.removeChild(self)
+        if item:
+            item.addChild(self)
 
     def addChild(self, item: 'CNCascadingListsWidgetItem'):
-        if item not in self._children:
-            self._children.append(item)
-            item.setParent(self)
+        if item._parentItem is self:
+            return
+        if item._parentItem:
+            item._parentItem.removeChild(item)
+        self._children.append(item)
+        item._parentItem = self
 
     def removeChild(self, item: 'CNCascadingListsWidgetItem'):
-        if item in self._children:
+        if item._parentItem is self:
             self._children.remove(item)
-            item.setParent(None)
+            item._parentItem = None
 
     def children(self) -> typing.List['CNCascadingListsWidgetItem']:
         return self._children.copy()
 
+    def hasChildren(self) -> bool:
+        return bool(self._children)
+
     def text(self) -> str:
         return self._text
 
@@ -102,13 +112,153 @@ class CNCascadingListsWidgetItem(QtWidgets.QListWidgetItem):
     def setIcon(self, icon: QtGui.QIcon):
         self._icon = icon
 
+    def data(self, role: int):
+        return self._data.get(role)
+
+    def setData(self, role: int, value):
+        self._data[role] = value
+
+
+class CNCascadingListsModel(QtCore.QAbstractListModel):
+    """Rows of the items listed at a time, with the label to show for each of them"""
+
+    ItemRole = QtCore.Qt.ItemDataRole.UserRole + 100
+    """The CNCascadingListsWidgetItem of a row"""
+    LabelRole = QtCore.Qt.ItemDataRole.UserRole + 101
+    """The label of a row, rich text with the matched letters highlighted while searching"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._items: typing.List[CNCascadingListsWidgetItem] = []
+        self._labels: typing.List[str] = []
+
+    def setItems(self, items: typing.List[CNCascadingListsWidgetItem], labels: typing.List[str] = None):
+        self.beginResetModel()
+        self._items = list(items)
+        self._labels = list(labels) if labels is not None else [item.text() for item in self._items]
+        self.endResetModel()
+
+    def item(self, row: int) -> typing.Optional[CNCascadingListsWidgetItem]:
+        return self._items[row] if 0 <= row < len(self._items) else None
+
+    def rowOf(self, item: CNCascadingListsWidgetItem) -> int:
+        return next((row for row, other in enumerate(self._items) if other is item), -1)
+
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._items)
+
+    def flags(self, index: QtCore.QModelIndex):
+        return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsDragEnabled
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        item = self._items[index.row()]
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return item.text()
+        elif role == QtCore.Qt.ItemDataRole.DecorationRole:
+            return item.icon()
+        elif role == self.LabelRole:
+            return self._labels[index.row()]
+        elif role == self.ItemRole:
+            return item
+        return item.data(role)
+
+
+class CNCascadingListsDelegate(QtWidgets.QStyledItemDelegate):
+    """
+    Paints a row as icon, label and, for items with children, a drill in arrow.
+    A click on the arrow emits :attr:`sigDrillIn` instead of selecting the row.
+    """
+    sigDrillIn = QtCore.Signal(QtCore.QModelIndex)
+
+    ICON_SIZE = 16
+    MARGIN = 4
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._arrow = QtWidgets.QApplication.style().standardIcon(QtWidgets.QStyle.StandardPixmap.SP_ArrowForward)
+        self._documents: typing.Dict[str, QtGui.QTextDocument] = {}
+
+    def arrowRect(self, rect: QtCore.QRect) -> QtCore.QRect:
+        return QtCore.QRect(rect.right() - self.MARGIN - self.ICON_SIZE,
+                            rect.center().y() - self.ICON_SIZE // 2 + 1,
+                            self.ICON_SIZE, self.ICON_SIZE)
+
+    def sizeHint(self, option: QtWidgets.QStyleOptionViewItem, index: QtCore.QModelIndex) -> QtCore.QSize:
+        return QtCore.QSize(option.rect.width(), max(self.ICON_SIZE, option.fontMetrics.height()) + 2 * self.MARGIN)
+
+    def paint(self, painter: QtGui.QPainter, option: QtWidgets.QStyleOptionViewItem, index: QtCore.QModelIndex):
+        # background, selection and focus as the style draws them, without text or icon
+        opt = QtWidgets.QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        opt.text = ''
+        opt.icon = QtGui.QIcon()
+        style = opt.widget.style() if opt.widget else QtWidgets.QApplication.style()
+        style.drawControl(QtWidgets.QStyle.ControlElement.CE_ItemViewItem, opt, painter, opt.widget)
+
+        rect = option.rect
+        item: CNCascadingListsWidgetItem = index.data(CNCascadingListsModel.ItemRole)
+        painter.save()
+        x = rect.left() + self.MARGIN
+        icon = item.icon()
+        if not icon.isNull():
+            icon.paint(painter, QtCore.QRect(x, rect.center().y() - self.ICON_SIZE // 2 + 1, self.ICON_SIZE, self.ICON_SIZE))
+        x += self.ICON_SIZE + self.MARGIN
+        right = rect.right() - self.MARGIN
+        if item.hasChildren():
+            self._arrow.paint(painter, self.arrowRect(rect))
+            right -= self.ICON_SIZE + self.MARGIN
+        # !if
+        selected = bool(option.state & QtWidgets.QStyle.StateFlag.State_Selected)
+        color = option.palette.color(QtGui.QPalette.ColorRole.HighlightedText if selected else QtGui.QPalette.ColorRole.Text)
+        label = index.data(CNCascadingListsModel.LabelRole)
+        text_rect = QtCore.QRect(x, rect.top(), max(0, right - x), rect.height())
+        if label == item.text():
+            painter.setPen(color)
+            painter.setFont(option.font)
+            painter.drawText(text_rect, QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter,
+                             option.fontMetrics.elidedText(label, QtCore.Qt.ElideRight, text_rect.width()))
+        else:
+            document = self.document(label, option.font)
+            painter.translate(text_rect.left(), text_rect.top() + (text_rect.height() - document.size().height()) / 2)
+            painter.setClipRect(QtCore.QRect(0, 0, text_rect.width(), text_rect.height()))
+            context = QtGui.QAbstractTextDocumentLayout.PaintContext()
+            context.palette.setColor(QtGui.QPalette.ColorRole.Text, color)
+            document.documentLayout().draw(painter, context)
+        # !if
+        painter.restore()
+
+    def document(self, label: str, font: QtGui.QFont) -> QtGui.QTextDocument:
+        """Laid out rich text of ``label``, kept for the labels of the rows on display"""
+        document = self._documents.get(label)
+        if document is None:
+            if len(self._documents) > 512:
+                self._documents.clear()
+            document = QtGui.QTextDocument()
+            document.setDocumentMargin(0)
+            document.setDefaultFont(font)
+            document.setHtml(label)
+            self._documents[label] = document
+        return document
+
+    def editorEvent(self, event: QtCore.QEvent, model, option: QtWidgets.QStyleOptionViewItem, index: QtCore.QModelIndex) -> bool:
+        if event.type() in (QtCore.QEvent.Type.MouseButtonPress, QtCore.QEvent.Type.MouseButtonRelease,
+                            QtCore.QEvent.Type.MouseButtonDblClick):
+            item = index.data(CNCascadingListsModel.ItemRole)
+            if item is not None and item.hasChildren() and self.arrowRect(option.rect).contains(event.pos()):
+                if event.type() == QtCore.QEvent.Type.MouseButtonRelease:
+                    self.sigDrillIn.emit(index)
+                return True
+        return super().editorEvent(event, model, option, index)
+
 
 class CNCascadingListsWidget(QtWidgets.QWidget):
 
-    sigItemClicked = QtCore.Signal(QtWidgets.QListWidgetItem)
-    """Emitted when item is clicked"""
-    sigItemDoubleClicked = QtCore.Signal(QtWidgets.QListWidgetItem)
-    """Emitted when item is double clicked"""
+    sigItemClicked = QtCore.Signal(object)
+    """Emitted with the CNCascadingListsWidgetItem when item is clicked"""
+    sigItemDoubleClicked = QtCore.Signal(object)
+    """Emitted with the CNCascadingListsWidgetItem when item is double clicked"""
 
     def __init__(self, parent=None, regexBase=None):
         super().__init__(parent)
@@ -142,22 +292,29 @@ class CNCascadingListsWidget(QtWidgets.QWidget):
         self.toolbar.addWidget(self.titleLabel)
         self.toolbar.addWidget(self.forwardTb)
         self.toolbar.setFixedHeight(self.titleLabel.height())
-        # list widget
-        self.listWidget = QtWidgets.QListWidget(self)
-        self.listWidget.setDragEnabled(True)
-        self.listWidget.setDragDropMode(QtWidgets.QListWidget.DragDropMode.DragOnly)
-        self.listWidget.setStyleSheet('QListWidget { border-width: 1px; border-radius: 0;}')
-        self.listWidget.itemClicked.connect(self.sigItemClicked)
-        self.listWidget.itemDoubleClicked.connect(self.sigItemDoubleClicked)
-        self.listWidget.itemDoubleClicked.connect(self.onItemDoubleClicked)
-        self.listWidget.setSelectionMode(QtWidgets.QListWidget.SingleSelection)
-        self.listWidget.setSelectionBehavior(QtWidgets.QListWidget.SelectionBehavior.SelectItems)
-        self.listWidget.startDrag = self.startDrag
+        # list view, rows are painted by the delegate so that thousands of items show at once
+        self.model = CNCascadingListsModel(self)
+        self.delegate = CNCascadingListsDelegate(self)
+        self.delegate.sigDrillIn.connect(self.onDrillIn, QtCore.Qt.ConnectionType.QueuedConnection)
+        self.listView = QtWidgets.QListView(self)
+        self.listView.setModel(self.model)
+        self.listView.setItemDelegate(self.delegate)
+        self.listView.setUniformItemSizes(True)
+        self.listView.setMouseTracking(True)
+        self.listView.setDragEnabled(True)
+        self.listView.setDragDropMode(QtWidgets.QListView.DragDropMode.DragOnly)
+        self.listView.setStyleSheet('QListView { border-width: 1px; border-radius: 0;}')
+        self.listView.clicked.connect(lambda index: self.sigItemClicked.emit(self.model.item(index.row())))
+        self.listView.doubleClicked.connect(lambda index: self.sigItemDoubleClicked.emit(self.model.item(index.row())))
+        self.listView.doubleClicked.connect(self.onItemDoubleClicked)
+        self.listView.setSelectionMode(QtWidgets.QListView.SingleSelection)
+        self.listView.setSelectionBehavior(QtWidgets.QListView.SelectionBehavior.SelectItems)
+        self.listView.startDrag = self.startDrag
         # layout widget
         vbox = QtWidgets.QVBoxLayout(self)
         vbox.addWidget(self.searchbar)
         vbox.addWidget(self.toolbar)
-        vbox.addWidget(self.listWidget)
+        vbox.addWidget(self.listView)
         vbox.setContentsMargins(0, 0, 0, 0)
         vbox.setSpacing(0)
         # widget geometry changing
@@ -167,10 +324,11 @@ class CNCascadingListsWidget(QtWidgets.QWidget):
         # install event filter
         self.titleLabel.installEventFilter(self)
         self.searchbar.installEventFilter(self)
-        self.listWidget.installEventFilter(self)
+        self.listView.installEventFilter(self)
         self.searchbar.setFocus(QtCore.Qt.FocusReason.OtherFocusReason)
         #
         self.items = {}
+        self.index = SearchIndex([])
 
     def show(self):
         """Override show method to set user frequently used edit focused"""
@@ -192,10 +350,11 @@ class CNCascadingListsWidget(QtWidgets.QWidget):
             return True
 
         if event.type() == QtCore.QEvent.Type.KeyPress:
-            if event.key() == QtCore.Qt.Key_Down:
-                self.listWidget.setCurrentRow((self.listWidget.currentRow() + 1) % self.listWidget.count())
-            elif event.key() == QtCore.Qt.Key_Up:
-                self.listWidget.setCurrentRow((self.listWidget.currentRow() - 1) % self.listWidget.count())
+            count = self.model.rowCount()
+            if event.key() == QtCore.Qt.Key_Down and count:
+                self.setCurrentRow((self.listView.currentIndex().row() + 1) % count)
+            elif event.key() == QtCore.Qt.Key_Up and count:
+                self.setCurrentRow((self.listView.currentIndex().row() - 1) % count)
             elif event.key() == QtCore.Qt.Key_Return:
                 self.onItemDoubleClicked()
             elif event.key() == QtCore.Qt.Key_Left:
@@ -217,21 +376,15 @@ class CNCascadingListsWidget(QtWidgets.QWidget):
             self.backwardTb.setIcon(QtGui.QIcon())
             self.backwardTb.setDisabled(True)
             self.titleLabel.setText(f'搜索 {partialItemText!r}')
-        rets = stringscores.findMatchingChoices(
-            partialItemText,
-            list(self.items.keys()),
-            template='<b>{0}</b>',
-            valid_only=True,
-            sort=True
-        )
+        rets = self.index.search(partialItemText, template='<b>{0}</b>')
         matchedItems = []
         labels = []
-        for name, named, _ in rets:
-            matchedItems.append(self.items[name])
-            labels.append(named)
+        for ret in rets:
+            matchedItems.append(self.items[ret.choice])
+            labels.append(ret.enriched)
         self.refresh(matchedItems, labels)
 
-    def setRoot(self, root: CNCascadingListsWidgetItem):
+    def setRoot(self, root: CNCascadingListsWidgetItem, pinyin: PinyinTable = None):
         self._rootItem = root
         self.setCurrentRoot(self._rootItem)
         self.items = {}
@@ -243,6 +396,7 @@ class CNCascadingListsWidget(QtWidgets.QWidget):
             # 1for
         #
         recursiveGet(self._rootItem)
+        self.index = SearchIndex(self.items.keys(), pinyin=pinyin)
 
     def setCurrentRoot(self, root: CNCascadingListsWidgetItem):
         self._currentRootItem = weakref.ref(root)
@@ -257,41 +411,13 @@ class CNCascadingListsWidget(QtWidgets.QWidget):
         self.refresh(self._currentRootItem().children())
 
     def refresh(self, items: typing.List[CNCascadingListsWidgetItem], labels: typing.List[str] = None):
+        self.model.setItems(items, labels)
+
+    def setCurrentRow(self, row: int):
+        self.listView.setCurrentIndex(self.model.index(row, 0))
 
-        # clear items, we don't use  :meth:`clear` because it will delete item's object in list
-        # we don't want to delete them we just want to remove them.
-        while self.listWidget.count():
-            self.listWidget.takeItem(0)
-
-        if labels is None:
-            labels = [item.text() for item in items]
-
-        for item, label in zip(items, labels):
-
-            QtWidgets.QApplication.instance().processEvents()
-            self.listWidget.addItem(item)
-            icon = QtWidgets.QLabel()
-            icon.setPixmap(item.icon().pixmap(16, 16))
-            icon.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents)
-            label = QtWidgets.QLabel(label)
-            label.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents)
-
-            widget = QtWidgets.QWidget()
-            widget.setStyleSheet('background: transparent;')
-            layout = QtWidgets.QHBoxLayout(widget)
-            layout.setContentsMargins(4, 0, 4, 0)
-            layout.setSpacing(4)
-            layout.addWidget(icon)
-            layout.addWidget(label)
-            layout.addStretch()
-            if item.children():
-                tb = QtWidgets.QToolButton()
-                tb.setFixedSize(16, 16)
-                tb.setIcon(self.style().standardIcon(QtWidgets.QStyle.StandardPixmap.SP_ArrowForward))
-                tb.setStyleSheet('border: none; background: transparent;')
-                tb.clicked.connect(lambda f, t=item: self.setCurrentRoot(t))
-                layout.addWidget(tb)
-            self.listWidget.setItemWidget(item, widget)
+    def currentItem(self) -> typing.Optional[CNCascadingListsWidgetItem]:
+        return self.model.item(self.listView.currentIndex().row())
 
     def backward(self):
         if not self._currentRootItem().parent():
@@ -299,17 +425,19 @@ class CNCascadingListsWidget(QtWidgets.QWidget):
 
         lastRootItem = self._currentRootItem()
         self.setCurrentRoot(lastRootItem.parent())
-        self.listWidget.setCurrentItem(lastRootItem)
+        self.setCurrentRow(self.model.rowOf(lastRootItem))
 
     def onItemDoubleClicked(self):
-        if not self.listWidget.currentItem():
-            return
-        item: CNCascadingListsWidgetItem = self.listWidget.currentItem()  # noqa
-        if item.children():
+        item = self.currentItem()
+        if item and item.hasChildren():
+            self.setCurrentRoot(item)
+
+    def onDrillIn(self, index: QtCore.QModelIndex):
+        if item := self.model.item(index.row()):
             self.setCurrentRoot(item)
 
     def selectedItems(self) -> typing.List[CNCascadingListsWidgetItem]:
-        return self.listWidget.selectedItems() # noqa
+        return [self.model.item(index.row()) for index in self.listView.selectionModel().selectedIndexes()]
 
 
 if __name__ == "__main__":
@@ -17,6 +17,8 @@
 import sys
 import datetime
 from qtpy import QtWidgets, QtCore
+from simpleaccounting.app import events
+from simpleaccounting.app.notifier import SystemNotifier
 from simpleaccounting.app.system import System, IllegalOperation, EntryNotFound
 from simpleaccounting.tools.dateutil import last_day_of_month
 from simpleaccounting.widgets.qwidgets import CustomInputDialog, HorizontalSpacer
@@ -74,13 +76,13 @@ class CurrencyWidget(QtWidgets.QWidget):
         hbox.addWidget(self.gbox_exchange)
         self.list_currency.currentItemChanged.connect(self.on_list_currencyCurrentItemChanged)
         self.table_exchange.itemSelectionChanged.connect(self.on_table_exchangeItemSelectionChanged)
+        SystemNotifier.instance().changed.connect(self.on_systemChanged)
 
     def on_action_createCurrencyTriggered(self):
         """"""
         def createCurrency(name: str) -> bool:
             try:
                 System.createCurrency(name)
-                self.updateUI()
                 return True
             except IllegalOperation as e:
                 if e.args[0] == "A2.2/2":
@@ -96,7 +98,6 @@ class CurrencyWidget(QtWidgets.QWidget):
         #
         try:
             System.deleteCurrency(self.list_currency.currentItem().text())
-            self.updateUI()
         except EntryNotFound as e:
             QtWidgets.QMessageBox.critical(None, "删除失败", f"错误：项\"{e}\"未找到。")
         except IllegalOperation as e:
@@ -114,7 +115,6 @@ class CurrencyWidget(QtWidgets.QWidget):
             date, rate = data
             try:
                 System.createExchangeRate(currency, rate, date)
-                self.on_list_currencyCurrentItemChanged()
             except IllegalOperation:
                 QtWidgets.QMessageBox.critical(None, "删除失败", "当前日期已存在汇率")
             return True
@@ -143,7 +143,6 @@ class CurrencyWidget(QtWidgets.QWidget):
         try:
             currency_name = self.list_currency.currentItem().text()
             System.deleteExchangeRate(currency_name, date)
-            self.on_list_currencyCurrentItemChanged()
         except EntryNotFound as e:
             QtWidgets.QMessageBox.critical(None, "删除失败", f"错误：项\"{e}\"未找到。")
         except IllegalOperation as e:
@@ -158,6 +157,20 @@ class CurrencyWidget(QtWidgets.QWidget):
         for currency in System.currencies():
             self.list_currency.addItem(currency.name)
 
+    def on_systemChanged(self, event):
+        """Applies currency changes to the list item by item"""
+        if isinstance(event, events.CurrencyCreated):
+            self.list_currency.addItem(event.name)
+        elif isinstance(event, events.CurrencyDeleted):
+            for item in self.list_currency.findItems(event.name, QtCore.Qt.MatchExactly):
+                self.list_currency.takeItem(self.list_currency.row(item))
+        elif isinstance(event, events.ExchangeRatesChanged):
+            item = self.list_currency.currentItem()
+            if item and item.text() == event.currency:
+                self.on_list_currencyCurrentItemChanged()
+        elif isinstance(event, events.BookOpened):
+            self.updateUI()
+
     def on_list_currencyCurrentItemChanged(self):
         item = self.list_currency.currentItem()
         self.gbox_exchange.setEnabled(bool(item))
@@ -14,11 +14,17 @@
     limitations under the License.
 """
 
+import array
+import math
+import typing
+
 from qtpy import QtWidgets, QtCore, QtGui
 
-from simpleaccounting.app.system import System
+from simpleaccounting.app.system import System, Account
+from simpleaccounting.app.reportjob import ReportJob, ReportJobRunner
+from simpleaccounting.tools.mymath import FloatWithPrecision
 from simpleaccounting.tools.dateutil import last_day_of_month, qdate_to_date, first_day_of_month
-from simpleaccounting.widgets.qwidgets import HorizontalSpacer
+from simpleaccounting.widgets.qwidgets import HorizontalSpacer, ReportProgressBar
 from simpleaccounting.widgets.freezabletableview import FreezableTableView
 
 COLUMN_ACCOUNT_CODE = 0
@@ -42,6 +48,168 @@ HORIZONTAL_HEADERS_ROW2 = [('代码', 1), ('名称', 1),
                            *[('借方（币种）', 1), ('借方（本位币）', 1), ('贷方（币种）', 1), ('贷方（本位币）', 1)] * 3]
 
 
+HEADER_ROW_COUNT = 2
+PULL_CHUNK_SIZE = 50     # accounts computed between two partial results
+
+# values of System.incurredBalances, kept per account in this order
+BALANCE_BEGIN = 0
+BALANCE_BEGIN_LOCAL = 1
+BALANCE_INCURRED_DEBIT = 2
+BALANCE_INCURRED_DEBIT_LOCAL = 3
+BALANCE_INCURRED_CREDIT = 4
+BALANCE_INCURRED_CREDIT_LOCAL = 5
+BALANCE_END = 6
+BALANCE_END_LOCAL = 7
+BALANCE_COUNT = 8
+
+# column -> (balance, sign): balances are shown on the debit side when positive and on the credit side when
+# negative, incurred sums are shown as they are when they are not zero
+BALANCE_OF_COLUMN = {
+    COLUMN_BEGINNING_DEBIT_CURRENCY: (BALANCE_BEGIN, 1),
+    COLUMN_BEGINNING_DEBIT_LOCAL: (BALANCE_BEGIN_LOCAL, 1),
+    COLUMN_BEGINNING_CREDIT_CURRENCY: (BALANCE_BEGIN, -1),
+    COLUMN_BEGINNING_CREDIT_LOCAL: (BALANCE_BEGIN_LOCAL, -1),
+    COLUMN_INCURRED_DEBIT_CURRENCY: (BALANCE_INCURRED_DEBIT, 0),
+    COLUMN_INCURRED_DEBIT_LOCAL: (BALANCE_INCURRED_DEBIT_LOCAL, 0),
+    COLUMN_INCURRED_CREDIT_CURRENCY: (BALANCE_INCURRED_CREDIT, 0),
+    COLUMN_INCURRED_CREDIT_LOCAL: (BALANCE_INCURRED_CREDIT_LOCAL, 0),
+    COLUMN_ENDING_DEBIT_CURRENCY: (BALANCE_END, 1),
+    COLUMN_ENDING_DEBIT_LOCAL: (BALANCE_END_LOCAL, 1),
+    COLUMN_ENDING_CREDIT_CURRENCY: (BALANCE_END, -1),
+    COLUMN_ENDING_CREDIT_LOCAL: (BALANCE_END_LOCAL, -1),
+}
+
+
+def header_row_texts(headers: list[tuple[str, int]]) -> list[str]:
+    texts = []
+    for header, span in headers:
+        texts.extend([header] + [""] * (span - 1))
+    return texts
+
+
+def number_to_excel_columns(n):
+    columns = []
+    while n > 0:
+        n -= 1  # 让数字从 0 开始计数
+        columns.append(chr(n % 26 + ord('A')))  # 计算当前字符
+        n //= 26  # 对列数进行整除，处理进位
+    return ''.join(columns[::-1])  # 反转字符顺序
+
+
+class EndingBalanceModel(QtCore.QAbstractTableModel):
+    """
+    Two header rows followed by one row per account. The balances are kept in one
+    flat array of ``BALANCE_COUNT`` floats per account, NaN standing for None, and
+    turned into text only when the view asks for a cell.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.header_rows = [header_row_texts(HORIZONTAL_HEADERS_ROW1), header_row_texts(HORIZONTAL_HEADERS_ROW2)]
+        self.column_labels = [number_to_excel_columns(i + 1) for i in range(COLUMN_COUNT)]
+        self.font_bold = QtGui.QFont()
+        self.font_bold.setBold(True)
+        self._codes: list[str] = []
+        self._names: list[str] = []
+        self._levels = bytearray()
+        self._is_parent = bytearray()
+        self._balances = array.array('d')
+
+    def setAccounts(self, accounts: list[Account], balances: typing.Optional[list[tuple]] = None):
+        """``balances`` holds the result of System.incurredBalances for each account, None leaves the cells empty"""
+        self.beginResetModel()
+        self._codes = [account.code for account in accounts]
+        self._names = [account.name for account in accounts]
+        self._levels = bytearray(min(255, code.count('.') + 1) for code in self._codes)
+        # a parent's code is its child's code without the last segment
+        parents = {code.rsplit('.', 1)[0] for code in self._codes if '.' in code}
+        self._is_parent = bytearray(code in parents for code in self._codes)
+        self._balances = array.array('d', [math.nan]) * (len(accounts) * BALANCE_COUNT)
+        self.endResetModel()
+        self.setBalances(0, balances or [])
+
+    def setBalances(self, start: int, balances: list[tuple]):
+        """Fills the balances of the accounts from index ``start`` on, e.g. a partial pull result"""
+        for i, values in enumerate(balances, start):
+            for j, value in enumerate(values):
+                self._balances[i * BALANCE_COUNT + j] = math.nan if value is None else FloatWithPrecision(value).value
+        # 1for
+        if balances:
+            self.dataChanged.emit(
+                self.index(HEADER_ROW_COUNT + start, 0),
+                self.index(HEADER_ROW_COUNT + start + len(balances) - 1, COLUMN_COUNT - 1)
+            )
+
+    def level(self, row: int) -> int:
+        """Level of the account at ``row``, 0 for the header rows"""
+        return 0 if row < HEADER_ROW_COUNT else self._levels[row - HEADER_ROW_COUNT]
+
+    def balance(self, row: int, column: int) -> typing.Optional[FloatWithPrecision]:
+        """The amount shown at (row, column), None when the cell is empty"""
+        if row < HEADER_ROW_COUNT or column not in BALANCE_OF_COLUMN:
+            return None
+        index, sign = BALANCE_OF_COLUMN[column]
+        value = self._balances[(row - HEADER_ROW_COUNT) * BALANCE_COUNT + index]
+        if math.isnan(value) or value == 0.0 or value * sign < 0.0:
+            return None
+        return FloatWithPrecision(abs(value))
+
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else HEADER_ROW_COUNT + len(self._codes)
+
+    def columnCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else COLUMN_COUNT
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            return self.column_labels[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index: QtCore.QModelIndex, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if row < HEADER_ROW_COUNT:
+            if role == QtCore.Qt.DisplayRole:
+                return self.header_rows[row][column]
+            elif role == QtCore.Qt.TextAlignmentRole:
+                return int(QtCore.Qt.AlignCenter)
+            return None
+
+        if role == QtCore.Qt.DisplayRole:
+            if column == COLUMN_ACCOUNT_CODE:
+                return self._codes[row - HEADER_ROW_COUNT]
+            elif column == COLUMN_ACCOUNT_NAME:
+                return self._names[row - HEADER_ROW_COUNT]
+            balance = self.balance(row, column)
+            return str(balance) if balance is not None else None
+        elif role == QtCore.Qt.UserRole:
+            return self.balance(row, column)
+        elif role == QtCore.Qt.TextAlignmentRole:
+            if column in BALANCE_OF_COLUMN:
+                return int(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+        elif role == QtCore.Qt.FontRole:
+            if self._is_parent[row - HEADER_ROW_COUNT]:
+                return self.font_bold
+        return None
+
+
+class AccountLevelFilterProxyModel(QtCore.QSortFilterProxyModel):
+    """Hides accounts deeper than ``maxLevel``, the header rows always pass"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._max_level: typing.Optional[int] = None
+
+    def setMaxLevel(self, level: typing.Optional[int]):
+        if level != self._max_level:
+            self._max_level = level
+            self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QtCore.QModelIndex) -> bool:
+        return self._max_level is None or self.sourceModel().level(source_row) <= self._max_level
+
+
 class EndingBalanceWidget(QtWidgets.QWidget):
 
     def __init__(self):
@@ -54,8 +222,19 @@ class EndingBalanceWidget(QtWidgets.QWidget):
         self.setWindowTitle("发生额及余额")
         self.de_begin = QtWidgets.QDateEdit(first_day_of_month(System.meta().month_until))
         self.de_end = QtWidgets.QDateEdit(last_day_of_month(System.meta().month_until))
-        self.model = QtGui.QStandardItemModel()
-        self.table = FreezableTableView(self.model)
+        self.model = EndingBalanceModel(self)
+        self.proxy = AccountLevelFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.table = FreezableTableView(self.proxy)
+        self.proxy.modelReset.connect(self.setHeaderSpans)
+        self.setHeaderSpans()
+        self.table.freezeToRow(HEADER_ROW_COUNT)
+        self.runner = ReportJobRunner(self)
+        self.runner.partial.connect(self.on_runnerPartial)
+        self.runner.failed.connect(self.on_runnerFailed)
+        self.pbar = ReportProgressBar(self.runner)
+        self.de_begin.dateChanged.connect(self.runner.cancel)
+        self.de_end.dateChanged.connect(self.runner.cancel)
         self.tbar = QtWidgets.QToolBar()
         self.tbar.setToolButtonStyle(QtCore.Qt.ToolButtonTextUnderIcon)
         self.action_currency_visible = QtWidgets.QAction(QtGui.QIcon(":/icons/dollar-yuan-exchange.png"), "币种", self)
@@ -77,6 +256,7 @@ class EndingBalanceWidget(QtWidgets.QWidget):
         hbox.addWidget(QtWidgets.QLabel("结束日期"))
         hbox.addWidget(self.de_end)
         self.tbar.addWidget(HorizontalSpacer())
+        self.pbar.addToToolBar(self.tbar)
         self.tbar.addWidget(container)
         self.tbar.addSeparator()
         self.tbar.addAction(self.action_currency_visible)
@@ -90,16 +270,15 @@ class EndingBalanceWidget(QtWidgets.QWidget):
         vbox.addWidget(self.tbar)
         vbox.addWidget(self.table)
 
-    def headerLabels(self, num_columns: int):
-        def number_to_excel_columns(n):
-            columns = []
-            while n > 0:
-                n -= 1  # 让数字从 0 开始计数
-                columns.append(chr(n % 26 + ord('A')))  # 计算当前字符
-                n //= 26  # 对列数进行整除，处理进位
-            return ''.join(columns[::-1])  # 反转字符顺序
-
-        return [number_to_excel_columns(i + 1) for i in range(num_columns)]
+    def setHeaderSpans(self):
+        """"""
+        for r, headers in enumerate([HORIZONTAL_HEADERS_ROW1, HORIZONTAL_HEADERS_ROW2]):
+            col = 0
+            for header, span in headers:
+                if span > 1:
+                    self.table.setSpan(r, col, 1, span)
+                col += span
+        # 1for
 
     def setCurrencyVisible(self, b: bool):
         for col in [COLUMN_BEGINNING_DEBIT_CURRENCY, COLUMN_BEGINNING_CREDIT_CURRENCY,
@@ -108,117 +287,45 @@ class EndingBalanceWidget(QtWidgets.QWidget):
             self.table.setColumnHidden(col, not b)
 
     def updateUI(self):
-        self.model.clear()
-        self.model.setColumnCount(COLUMN_COUNT)
-        self.model.setHorizontalHeaderLabels(self.headerLabels(COLUMN_COUNT))
-        col = 0
-        for header, span in HORIZONTAL_HEADERS_ROW1:
-            item = QtGui.QStandardItem()
-            item.setText(header)
-            item.setTextAlignment(QtCore.Qt.AlignCenter)
-            self.model.setItem(0, col, item)
-            self.table.setSpan(0, col, 1, span)
-            col += span
-
-        col = 0
-        for header, span in HORIZONTAL_HEADERS_ROW2:
-            item = QtGui.QStandardItem()
-            item.setText(header)
-            item.setTextAlignment(QtCore.Qt.AlignCenter)
-            self.model.setItem(1, col, item)
-            self.table.setSpan(1, col, 1, span)
-            col += span
-
-        font_bold = self.font()
-        font_bold.setBold(True)
-        for r, account in enumerate(System.accounts()):
-            r = r + 2  # first two header row
-            item = QtGui.QStandardItem(account.code)
-            if account.children:
-                item.setFont(font_bold)
-            self.model.setItem(r, COLUMN_ACCOUNT_CODE, item)
-            item = QtGui.QStandardItem(account.name)
-            if account.children:
-                item.setFont(font_bold)
-            self.model.setItem(r, COLUMN_ACCOUNT_NAME, item)
-        # 1for
-        self.table.freezeToRow(2)
+        self.runner.cancel()
+        self.model.setAccounts(System.accounts())
         self.setCurrencyVisible(self.action_currency_visible.isChecked())
 
     def on_action_pullTriggered(self):
+        pre = qdate_to_date(self.de_begin.date())
+        cur = qdate_to_date(self.de_end.date())
 
-        class AlignRightStandardItem(QtGui.QStandardItem):
-            def __init__(self, text: str, bold=False):
-                super().__init__(text)
-                self.setTextAlignment(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
-                self.setBold(bold)
+        accounts = System.accounts()
+        self.model.setAccounts(accounts)
+        self.setCurrencyVisible(self.action_currency_visible.isChecked())
 
-            def setBold(self, b: bool):
-                font = self.font()
-                font.setBold(b)
-                self.setFont(font)
+        def pull(job: ReportJob):
+            for start in range(0, len(accounts), PULL_CHUNK_SIZE):
+                chunk = []
+                for account in accounts[start:start + PULL_CHUNK_SIZE]:
+                    job.checkCancelled()
+                    chunk.append(System.incurredBalances(account.code, pre, cur))
+                # 1for
+                job.reportPartial((start, chunk))
+                job.reportProgress(start + len(chunk), len(accounts))
+            # 1for
+        #
+        # pulled again when a save overlapped it, the balances then come from one state of the book
+        self.runner.start(lambda job: System.consistentRead(lambda: pull(job)))
 
-        self.updateUI()
+    def on_runnerPartial(self, chunk):
+        start, balances = chunk
+        self.model.setBalances(start, balances)
 
-        pre = qdate_to_date(self.de_begin.date())
-        cur = qdate_to_date(self.de_end.date())
-
-        for r, account in enumerate(System.accounts()):
-            r = r + 2  # first two header row
-            bold = bool(account.children)
-            (begin_amount, begin_local_amount,
-             incurred_debit_sum, incurred_debit_sum_local,
-             incurred_credit_sum, incurred_credit_sum_local,
-             end_amount, end_local_amount) = System.incurredBalances(account.code, pre, cur)
-            # --- beginning balance
-            if begin_amount and begin_amount > 0.0:
-                self.model.setItem(r, COLUMN_BEGINNING_DEBIT_CURRENCY, AlignRightStandardItem(str(begin_amount), bold))
-            elif begin_amount and begin_amount < 0.0:
-                self.model.setItem(r, COLUMN_BEGINNING_CREDIT_CURRENCY, AlignRightStandardItem(str(abs(begin_amount)), bold))
-            if begin_local_amount > 0.0:
-                self.model.setItem(r, COLUMN_BEGINNING_DEBIT_LOCAL, AlignRightStandardItem(str(begin_local_amount), bold))
-            elif begin_local_amount < 0.0:
-                self.model.setItem(r, COLUMN_BEGINNING_CREDIT_LOCAL, AlignRightStandardItem(str(abs(begin_local_amount)), bold))
-
-            # --- incurred summary
-            if incurred_debit_sum and incurred_debit_sum != 0.0:
-                self.model.setItem(r, COLUMN_INCURRED_DEBIT_CURRENCY, AlignRightStandardItem(str(incurred_debit_sum), bold))
-            if incurred_debit_sum_local != 0.0:
-                self.model.setItem(r, COLUMN_INCURRED_DEBIT_LOCAL, AlignRightStandardItem(str(incurred_debit_sum_local), bold))
-            if incurred_credit_sum and incurred_credit_sum != 0.0:
-                self.model.setItem(r, COLUMN_INCURRED_CREDIT_CURRENCY, AlignRightStandardItem(str(incurred_credit_sum), bold))
-            if incurred_credit_sum_local != 0.0:
-                self.model.setItem(r, COLUMN_INCURRED_CREDIT_LOCAL, AlignRightStandardItem(str(incurred_credit_sum_local), bold))
-
-            # --- ending balance
-            if end_amount and end_amount > 0.0:
-                self.model.setItem(r, COLUMN_ENDING_DEBIT_CURRENCY, AlignRightStandardItem(str(end_amount), bold))
-            elif end_amount and end_amount < 0.0:
-                self.model.setItem(r, COLUMN_ENDING_CREDIT_CURRENCY, AlignRightStandardItem(str(abs(end_amount)), bold))
-            if end_local_amount > 0.0:
-                self.model.setItem(r, COLUMN_ENDING_DEBIT_LOCAL, AlignRightStandardItem(str(end_local_amount), bold))
-            elif end_local_amount < 0.0:
-                self.model.setItem(r, COLUMN_ENDING_CREDIT_LOCAL, AlignRightStandardItem(str(abs(end_local_amount)), bold))
-            #
+    def on_runnerFailed(self, e: Exception):
+        QtWidgets.QMessageBox.critical(None, "拉取失败", f"{e}")
 
     def on_action_level1Triggered(self):
         """"""
-        for r in range(2, self.model.rowCount()):
-            account_code = self.model.item(r, 0).text()
-            if len(account_code.split('.')) > 1:
-                self.table.hideRow(r)
-            else:
-                self.table.showRow(r)
+        self.proxy.setMaxLevel(1)
 
     def on_action_level2Triggered(self):
-        for r in range(2, self.model.rowCount()):
-            account_code = self.model.item(r, 0).text()
-            if len(account_code.split('.')) > 2:
-                self.table.hideRow(r)
-            else:
-                self.table.showRow(r)
+        self.proxy.setMaxLevel(2)
 
     def on_action_level3Triggered(self):
-        for r in range(2, self.model.rowCount()):
-            self.table.showRow(r)
-
+        self.proxy.setMaxLevel(None)
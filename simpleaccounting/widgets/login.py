@@ -14,7 +14,6 @@
     limitations under the License.
 """
 
-import glob
 import pathlib
 import datetime
 from qtpy import QtWidgets, QtCore, QtGui
@@ -22,6 +21,7 @@ from qtpy import QtWidgets, QtCore, QtGui
 from simpleaccounting.tools.dateutil import month_of_date
 from simpleaccounting.widgets.qwidgets import CustomInputDialog, CustomQDialog, CustomQComboBox
 from simpleaccounting.app.system import System
+from simpleaccounting.app.catalog import BookCatalog
 from simpleaccounting.app.iniconfig import INIConfig, SIMPLEACCOUNTING_DIR
 
 
@@ -68,6 +68,7 @@ class LoginDialog(CustomQDialog):
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.catalog = BookCatalog(pathlib.Path(SIMPLEACCOUNTING_DIR))
         self.setupUI()
         self.updateUI()
 
@@ -100,23 +101,20 @@ class LoginDialog(CustomQDialog):
     def updateUI(self):
         self.cb_books.blockSignals(True)
         self.cb_books.clear()
-        for f in glob.glob("*.db", root_dir=SIMPLEACCOUNTING_DIR):
+        for f in self.catalog.books():
             self.cb_books.addItem(f)
         self.cb_books.blockSignals(False)
         self.on_cb_booksCurrentTextChanged()
 
     def on_cb_booksCurrentTextChanged(self):
-        if self.cb_books.currentText():
-            System.bindDatabase(pathlib.Path(SIMPLEACCOUNTING_DIR) / self.cb_books.currentText())
-            try:
-                meta = System.meta()
-                self.lbl_company.setText(meta.company)
-                self.lbl_standard.setText(meta.standard)
-                self.lbl_month_from.setText(meta.month_from.strftime("%Y.%m"))
-                self.lbl_month_until.setText(meta.month_until.strftime("%Y.%m"))
-                self.btn_login.setEnabled(True)
-            except Exception as e:
-                self.btn_login.setEnabled(False)
+        # only the Meta of the book is read here, the book is bound on login
+        info = self.catalog.info(self.cb_books.currentText()) if self.cb_books.currentText() else None
+        if info is not None:
+            self.lbl_company.setText(info.company)
+            self.lbl_standard.setText(info.standard)
+            self.lbl_month_from.setText(info.month_from.strftime("%Y.%m"))
+            self.lbl_month_until.setText(info.month_until.strftime("%Y.%m"))
+        self.btn_login.setEnabled(info is not None)
 
     def on_btn_registerClicked(self):
         dialog = RegisterDialog(pathlib.Path(SIMPLEACCOUNTING_DIR))
@@ -124,4 +122,4 @@ class LoginDialog(CustomQDialog):
         self.updateUI()
 
     def on_btn_loginClicked(self):
-        self.sigLoginRequest.emit(pathlib.Path(SIMPLEACCOUNTING_DIR) / f"{self.cb_books.currentText()}.db")
+        self.sigLoginRequest.emit(pathlib.Path(SIMPLEACCOUNTING_DIR) / self.cb_books.currentText())
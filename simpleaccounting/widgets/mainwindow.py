@@ -17,6 +17,7 @@ import datetime
 import typing
 from qtpy import QtWidgets, QtGui, QtCore
 from simpleaccounting.app.system import System
+from simpleaccounting.app import startuptrace
 from simpleaccounting.widgets.account import AccountWidget
 from simpleaccounting.widgets.currency import CurrencyWidget
 from simpleaccounting.widgets.endingbalance import EndingBalanceWidget
@@ -29,12 +30,20 @@ from simpleaccounting.widgets.voucheredit import VoucherEditWidget
 from simpleaccounting.widgets.balancesheet import BalanceSheetWidget
 
 
+MRU_FLUSH_INTERVAL_MS = 30 * 1000
+
+
 class MainWindow(QtWidgets.QMainWindow):
 
     def __init__(self):
         super().__init__()
+        self.painted = False
         self.setupUI()
         self.updateUI()
+        # write the account picking statistics back in batches instead of on every pick
+        self.timer_mru_flush = QtCore.QTimer(self)
+        self.timer_mru_flush.timeout.connect(System.flushMRUAccounts)
+        self.timer_mru_flush.start(MRU_FLUSH_INTERVAL_MS)
 
     def setupUI(self):
         self.toolbar = QtWidgets.QToolBar()
@@ -54,7 +63,6 @@ class MainWindow(QtWidgets.QMainWindow):
         self.action_show_balance_sheet_window.triggered.connect(self.on_action_showBalanceSheetWindowTriggered)
         self.action_show_profit_statement_window = QtWidgets.QAction(QtGui.QIcon(":/icons/transaction.png"), "利润表")
         self.action_show_profit_statement_window.triggered.connect(self.on_action_showProfitStatementWindow)
-        self.action_show_cash_flow_window.triggered.connect(self.on_action_showCashFlowWindowTriggered)
         self.action_show_cash_flow_window = QtWidgets.QAction(QtGui.QIcon(":/icons/transaction.png"), "现金流量表")
         self.action_show_cash_flow_window.triggered.connect(self.on_action_showCashFlowWindowTriggered)
         self.toolbar.addAction(self.action_show_accounts_window)
@@ -67,70 +75,104 @@ class MainWindow(QtWidgets.QMainWindow):
         self.mdi_area = QtWidgets.QMdiArea()
         self.addToolBar(self.toolbar)
         self.setCentralWidget(self.mdi_area)
-        self.account_widget = AccountWidget()
-        self.account_sub_window = QtWidgets.QMdiSubWindow()
-        self.account_sub_window.setWidget(self.account_widget)
-        self.account_sub_window.setWindowIcon(QtGui.QIcon(":/icons/accounting.png"))
-        self.currency_widget = CurrencyWidget()
-        self.currency_sub_window = QtWidgets.QMdiSubWindow()
-        self.currency_sub_window.setWidget(self.currency_widget)
-        self.currency_sub_window.setWindowIcon(QtGui.QIcon(":/icons/dollar-taiwan.png"))
-        self.voucher_widget = VoucherWidget()
-        self.voucher_widget.signal_voucher_edit_requested.connect(self.on_voucherEditRequested)
-        self.voucher_widget.signal_mecf_requested.connect(self.on_mecfRequested)
-        self.voucher_widget.signal_yecf_requested.connect(self.on_yecfRequested)
-        self.voucher_widget.signal_exchange_gains_losses_requested.connect(self.on_exchangeGainsLossesRequested)
-        self.voucher_sub_window = QtWidgets.QMdiSubWindow()
-        self.voucher_sub_window.setWidget(self.voucher_widget)
-        self.voucher_sub_window.setWindowIcon(QtGui.QIcon(":/icons/pay-date.png"))
-        self.subsidiary_ledger_widget = SubsidiaryLedgerWidget()
-        self.subsidiary_ledger_widget.signal_view_voucher.connect(self.on_viewVoucher)
-        self.subsidiary_ledger_sub_window = QtWidgets.QMdiSubWindow()
-        self.subsidiary_ledger_sub_window.setWidget(self.subsidiary_ledger_widget)
-        self.subsidiary_ledger_sub_window.setWindowIcon(QtGui.QIcon(":/icons/receipt.png"))
-        self.subsidiary_ledger_sub_window.resize(1600, 400)
-        self.subsidiary_ledger_sub_window.move(20, 20)
-        self.subsidiary_ledger_sub_window.hide()
-        self.voucher_viewer_widget = VoucherEditWidget(System.meta().month_until)
-        self.voucher_viewer_widget.setReadOnly(True)
-        self.voucher_viewer_sub_window = QtWidgets.QMdiSubWindow()
-        self.voucher_viewer_sub_window.setWidget(self.voucher_viewer_widget)
-        self.voucher_viewer_sub_window.setWidget(self.voucher_viewer_widget)
-        self.voucher_viewer_sub_window.setWindowIcon(QtGui.QIcon(":/icons/receipt.png"))
-        self.voucher_viewer_sub_window.resize(1600, 400)
-        self.voucher_viewer_sub_window.move(20, 20)
-        self.voucher_viewer_sub_window.hide()
-        self.ending_balance_widget = EndingBalanceWidget()
-        self.ending_balance_sub_window = QtWidgets.QMdiSubWindow()
-        self.ending_balance_sub_window.setWidget(self.ending_balance_widget)
-        self.ending_balance_sub_window.setWindowIcon(QtGui.QIcon(":/icons/bank.png"))
-        self.ending_balance_sub_window.resize(1600, 800)
-        self.ending_balance_sub_window.hide()
-        self.balance_sheet_widget = BalanceSheetWidget()
-        self.balance_sheet_sub_window = QtWidgets.QMdiSubWindow()
-        self.balance_sheet_sub_window.setWidget(self.balance_sheet_widget)
-        self.balance_sheet_sub_window.setWindowIcon(QtGui.QIcon(":/icons/fund-accounting.png"))
-        self.balance_sheet_sub_window.resize(1600, 800)
-        self.balance_sheet_sub_window.hide()
-        self.mdi_area.addSubWindow(self.account_sub_window)
-        self.mdi_area.addSubWindow(self.currency_sub_window)
-        self.mdi_area.addSubWindow(self.voucher_sub_window)
-        self.mdi_area.addSubWindow(self.subsidiary_ledger_sub_window)
-        self.mdi_area.addSubWindow(self.voucher_viewer_sub_window)
-        self.mdi_area.addSubWindow(self.ending_balance_sub_window)
-        self.mdi_area.addSubWindow(self.balance_sheet_sub_window)
+        # sub-windows are built on first activation, only the ones shown at start are built here
+        self.account_widget: typing.Optional[AccountWidget] = None
+        self.account_sub_window: typing.Optional[QtWidgets.QMdiSubWindow] = None
+        self.currency_widget: typing.Optional[CurrencyWidget] = None
+        self.currency_sub_window: typing.Optional[QtWidgets.QMdiSubWindow] = None
+        self.voucher_widget: typing.Optional[VoucherWidget] = None
+        self.voucher_sub_window: typing.Optional[QtWidgets.QMdiSubWindow] = None
+        self.subsidiary_ledger_widget: typing.Optional[SubsidiaryLedgerWidget] = None
+        self.subsidiary_ledger_sub_window: typing.Optional[QtWidgets.QMdiSubWindow] = None
+        self.voucher_viewer_widget: typing.Optional[VoucherEditWidget] = None
+        self.voucher_viewer_sub_window: typing.Optional[QtWidgets.QMdiSubWindow] = None
+        self.ending_balance_widget: typing.Optional[EndingBalanceWidget] = None
+        self.ending_balance_sub_window: typing.Optional[QtWidgets.QMdiSubWindow] = None
+        self.balance_sheet_widget: typing.Optional[BalanceSheetWidget] = None
+        self.balance_sheet_sub_window: typing.Optional[QtWidgets.QMdiSubWindow] = None
+        self.accountWidget()
+        self.currencyWidget()
+        self.voucherWidget()
+
+    def addSubWindow(self, widget: QtWidgets.QWidget, icon: str,
+                     size: tuple[int, int] = None, pos: tuple[int, int] = None) -> QtWidgets.QMdiSubWindow:
+        sub_window = QtWidgets.QMdiSubWindow()
+        sub_window.setWidget(widget)
+        sub_window.setWindowIcon(QtGui.QIcon(icon))
+        if size is not None:
+            sub_window.resize(*size)
+        if pos is not None:
+            sub_window.move(*pos)
+        self.mdi_area.addSubWindow(sub_window)
+        return sub_window
+
+    def accountWidget(self) -> AccountWidget:
+        if self.account_widget is None:
+            self.account_widget = AccountWidget()
+            self.account_sub_window = self.addSubWindow(self.account_widget, ":/icons/accounting.png")
+        return self.account_widget
+
+    def currencyWidget(self) -> CurrencyWidget:
+        if self.currency_widget is None:
+            self.currency_widget = CurrencyWidget()
+            self.currency_sub_window = self.addSubWindow(self.currency_widget, ":/icons/dollar-taiwan.png")
+        return self.currency_widget
+
+    def voucherWidget(self) -> VoucherWidget:
+        if self.voucher_widget is None:
+            self.voucher_widget = VoucherWidget()
+            self.voucher_widget.signal_voucher_edit_requested.connect(self.on_voucherEditRequested)
+            self.voucher_widget.signal_mecf_requested.connect(self.on_mecfRequested)
+            self.voucher_widget.signal_yecf_requested.connect(self.on_yecfRequested)
+            self.voucher_widget.signal_exchange_gains_losses_requested.connect(self.on_exchangeGainsLossesRequested)
+            self.voucher_sub_window = self.addSubWindow(self.voucher_widget, ":/icons/pay-date.png")
+        return self.voucher_widget
+
+    def subsidiaryLedgerWidget(self) -> SubsidiaryLedgerWidget:
+        if self.subsidiary_ledger_widget is None:
+            self.subsidiary_ledger_widget = SubsidiaryLedgerWidget()
+            self.subsidiary_ledger_widget.signal_view_voucher.connect(self.on_viewVoucher)
+            self.subsidiary_ledger_sub_window = self.addSubWindow(
+                self.subsidiary_ledger_widget, ":/icons/receipt.png", (1600, 400), (20, 20))
+        return self.subsidiary_ledger_widget
+
+    def voucherViewerWidget(self, month: datetime.date = None) -> VoucherEditWidget:
+        """The read-only voucher viewer, built on ``month`` (default the current month) the first time"""
+        if self.voucher_viewer_widget is None:
+            self.voucher_viewer_widget = VoucherEditWidget(month or System.meta().month_until)
+            self.voucher_viewer_widget.setReadOnly(True)
+            self.voucher_viewer_sub_window = self.addSubWindow(
+                self.voucher_viewer_widget, ":/icons/receipt.png", (1600, 400), (20, 20))
+        return self.voucher_viewer_widget
+
+    def endingBalanceWidget(self) -> EndingBalanceWidget:
+        if self.ending_balance_widget is None:
+            self.ending_balance_widget = EndingBalanceWidget()
+            self.ending_balance_sub_window = self.addSubWindow(
+                self.ending_balance_widget, ":/icons/bank.png", (1600, 800))
+        return self.ending_balance_widget
+
+    def balanceSheetWidget(self) -> BalanceSheetWidget:
+        if self.balance_sheet_widget is None:
+            self.balance_sheet_widget = BalanceSheetWidget()
+            self.balance_sheet_sub_window = self.addSubWindow(
+                self.balance_sheet_widget, ":/icons/fund-accounting.png", (1600, 800))
+        return self.balance_sheet_widget
+
+    def editLockedSubWindows(self) -> list[QtWidgets.QMdiSubWindow]:
+        return [w for w in (self.account_sub_window, self.currency_sub_window, self.voucher_sub_window)
+                if w is not None]
 
     def enterVoucherEditMode(self):
-        self.account_sub_window.setEnabled(False)
-        self.currency_sub_window.setEnabled(False)
-        self.voucher_sub_window.setEnabled(False)
+        for sub_window in self.editLockedSubWindows():
+            sub_window.setEnabled(False)
 
     def quitVoucherEditMode(self):
         try:
-            self.account_sub_window.setEnabled(True)
-            self.currency_sub_window.setEnabled(True)
-            self.voucher_sub_window.setEnabled(True)
-            self.voucher_widget.on_listMonthCurrentChanged()
+            for sub_window in self.editLockedSubWindows():
+                sub_window.setEnabled(True)
+            if self.voucher_widget is not None:
+                self.voucher_widget.on_listMonthCurrentChanged()
         except Exception:
             ...
 
@@ -184,28 +226,42 @@ class MainWindow(QtWidgets.QMainWindow):
         self.setWindowTitle(f"{meta.company} "
                             f"{meta.month_from.strftime('%Y年%m月')}-{meta.month_until.strftime('%Y年%m月')}")
 
+    def paintEvent(self, event: QtGui.QPaintEvent):
+        super().paintEvent(event)
+        if not self.painted:
+            self.painted = True
+            # the sub-windows paint right after the main window, report once they are done
+            QtCore.QTimer.singleShot(0, self.on_firstPainted)
+
+    def on_firstPainted(self):
+        startuptrace.end('first paint')
+        startuptrace.dump()
+
     def on_viewVoucher(self, date: datetime.date, voucher_number: str):
-        self.voucher_viewer_widget.setDateMonth(month_of_date(date))
-        self.voucher_viewer_widget.setCurrentVoucher(voucher_number)
-        self.voucher_viewer_widget.show()
+        created = self.voucher_viewer_widget is None
+        viewer = self.voucherViewerWidget(month_of_date(date))
+        if not created:
+            viewer.setDateMonth(month_of_date(date))
+        viewer.setCurrentVoucher(voucher_number)
+        viewer.show()
 
     def on_action_showAccountsWindowTriggered(self):
-        self.account_widget.show()
+        self.accountWidget().show()
 
     def on_action_showCurrencyWindowTriggered(self):
-        self.currency_widget.show()
+        self.currencyWidget().show()
 
     def on_action_showVoucherWindowTriggered(self):
-        self.voucher_widget.show()
+        self.voucherWidget().show()
 
     def on_action_showSubsidaryLedgerWindowTriggered(self):
-        self.subsidiary_ledger_widget.show()
+        self.subsidiaryLedgerWidget().show()
 
     def on_action_showEndingBalanceWindowTriggered(self):
-        self.ending_balance_widget.show()
+        self.endingBalanceWidget().show()
 
     def on_action_showBalanceSheetWindowTriggered(self):
-        self.balance_sheet_widget.show()
+        self.balanceSheetWidget().show()
 
     def on_action_showProfitStatementWindow(self):
         ...
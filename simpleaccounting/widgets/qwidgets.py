@@ -47,8 +47,74 @@ class CustomQComboBox(QtWidgets.QComboBox):
         self.setMinimumHeight(int(self.fontMetrics().height() * 2.0))
 
 
+def accountItemIndex(combobox: QtWidgets.QComboBox, code: str) -> int:
+    """Row of the account ``code`` in a combobox of ``code name`` items sorted by code, -1 if missing"""
+    for i in range(combobox.count()):
+        account = combobox.itemData(i, QtCore.Qt.UserRole)
+        if account is not None and account.code == code:
+            return i
+    # 1for
+    return -1
+
+
+def insertAccountItem(combobox: QtWidgets.QComboBox, account):
+    """Inserts ``account`` into a combobox of ``code name`` items keeping the items sorted by code"""
+    index = combobox.count()
+    for i in range(combobox.count()):
+        other = combobox.itemData(i, QtCore.Qt.UserRole)
+        if other is not None and other.code > account.code:
+            index = i
+            break
+    # 1for
+    combobox.insertItem(index, f"{account.code} {account.name}", account)
+
+
+def removeAccountItem(combobox: QtWidgets.QComboBox, code: str):
+    if (index := accountItemIndex(combobox, code)) != -1:
+        combobox.removeItem(index)
+
+
+def updateAccountItem(combobox: QtWidgets.QComboBox, account):
+    if (index := accountItemIndex(combobox, account.code)) != -1:
+        combobox.setItemData(index, account, QtCore.Qt.UserRole)
+
+
 class HorizontalSpacer(QtWidgets.QWidget):
 
     def __init__(self):
         super().__init__()
-        self.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Preferred)
\ No newline at end of file
+        self.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Preferred)
+
+
+class ReportProgressBar(QtWidgets.QProgressBar):
+    """Shows the progress of the jobs of a ReportJobRunner, hidden while no job runs"""
+
+    def __init__(self, runner):
+        super().__init__()
+        self.setMaximumWidth(self.fontMetrics().horizontalAdvance('9' * 20))
+        self.setTextVisible(False)
+        self.action = None
+        self.setShown(False)
+        runner.started.connect(self.on_started)
+        runner.progress.connect(self.on_progress)
+        runner.stopped.connect(lambda: self.setShown(False))
+
+    def addToToolBar(self, tbar: QtWidgets.QToolBar):
+        # widgets in a tool bar are shown and hidden through their action
+        self.action = tbar.addWidget(self)
+        self.setShown(False)
+
+    def setShown(self, b: bool):
+        if self.action is not None:
+            self.action.setVisible(b)
+        else:
+            self.setVisible(b)
+
+    def on_started(self):
+        # busy indicator until the job reports how much there is to do
+        self.setRange(0, 0)
+        self.setShown(True)
+
+    def on_progress(self, done: int, total: int):
+        self.setRange(0, total)
+        self.setValue(done)
@@ -14,13 +14,20 @@
     limitations under the License.
 """
 
+import array
 import datetime
+import typing
 from qtpy import QtWidgets, QtCore, QtGui
-from simpleaccounting.app.system import System
+from simpleaccounting.app import events
+from simpleaccounting.app.events import is_related_account
+from simpleaccounting.app.notifier import SystemNotifier
+from simpleaccounting.app.system import System, LedgerEntry
+from simpleaccounting.app.reportjob import ReportJobRunner
 from simpleaccounting.tools.dateutil import last_day_of_month, first_day_of_month, month_of_date
-from simpleaccounting.widgets.qwidgets import CustomQDialog, HorizontalSpacer
+from simpleaccounting.widgets.qwidgets import CustomQDialog, HorizontalSpacer, ReportProgressBar, insertAccountItem, \
+    removeAccountItem, updateAccountItem
 from simpleaccounting.tools.mymath import FloatWithPrecision
-from simpleaccounting.tools import stringscores
+from simpleaccounting.tools.searchindex import SearchIndex
 from simpleaccounting.widgets.voucheredit import VoucherEditWidget, AccountSelectDialog
 
 
@@ -34,28 +41,247 @@ COLUMN_CURRENCY = 6
 COLUMN_EXCHANGE_RATE = 7
 COLUMN_DEBIT_LOCAL_AMOUNT = 8
 COLUMN_CREDIT_LOCAL_AMOUNT = 9
-COLUMN_TAG = 10
-COLUMN_COUNT = 11
+COLUMN_BALANCE = 10
+COLUMN_TAG = 11
+COLUMN_COUNT = 12
+
+COLUMNS = ["日期", "凭证记字号", "摘要", "科目名称", "借方币种金额", "贷方币种金额", "币种", "汇率", "借方金额", "贷方金额", "余额", "标签"]
+COLUMNS_WIDTH = [12, 20, 20, 20, 12, 12, 8, 8, 12, 12, 12, 6]
+
+
+class SubsidiaryLedgerModel(QtCore.QAbstractTableModel):
+    """
+    Ledger rows kept column-wise in compact arrays, cells are formatted only when
+    the view asks for them. The first row holds the opening balance and the last
+    row the local amount totals.
+    """
+    DEBIT = 0
+    CREDIT = 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.font_bold = QtGui.QFont()
+        self.font_bold.setBold(True)
+        self.font_link = QtGui.QFont(self.font_bold)
+        self.font_link.setUnderline(True)
+        self.brush_link = QtGui.QBrush(QtGui.QColor(0, 0, 255))
+        self.brush_total_background = QtGui.QBrush(QtGui.QColor("#1e58ff"))
+        self.brush_total_foreground = QtGui.QBrush(QtGui.QColor("#ffffff"))
+        self._reset()
 
-COLUMNS = ["日期", "凭证记字号", "摘要", "科目名称", "借方币种金额", "贷方币种金额", "币种", "汇率", "借方金额", "贷方金额", "标签"]
-COLUMNS_WIDTH = [12, 20, 20, 20, 12, 12, 8, 8, 12, 12, 6]
-
-
-class SubsidaryLedgerTableWidget(QtWidgets.QTableWidget):
-    """"""
+    def clear(self):
+        self.beginResetModel()
+        self._reset()
+        self.endResetModel()
+
+    def _reset(self):
+        self._ordinals = array.array('l')       # voucher date as proleptic ordinal
+        self._numbers: list[str] = []
+        self._briefs: list[str] = []
+        self._accounts: list[str] = []
+        self._currencies: list[str] = []
+        self._exchange_rates = array.array('d')
+        self._amounts = array.array('d')
+        self._local_amounts = array.array('d')
+        self._balances = array.array('d')
+        self._directions = bytearray()
+        self.opening_balance = FloatWithPrecision(0.0)
+        self.debit_total = FloatWithPrecision(0.0)
+        self.credit_total = FloatWithPrecision(0.0)
+
+    def setEntries(self, opening_balance: FloatWithPrecision, entries: typing.Iterable[LedgerEntry]):
+        self.beginResetModel()
+        self._reset()
+        interned = {}
+        debit_total = FloatWithPrecision(0.0)
+        credit_total = FloatWithPrecision(0.0)
+        for entry in entries:
+            self._ordinals.append(entry.date.toordinal())
+            self._numbers.append(entry.voucher_number)
+            self._briefs.append(entry.brief or "")
+            # account names and currencies repeat a lot, keep one copy of each
+            self._accounts.append(interned.setdefault(entry.account, entry.account))
+            self._currencies.append(interned.setdefault(entry.currency, entry.currency))
+            self._exchange_rates.append(entry.exchange_rate)
+            self._balances.append(entry.balance.value)
+            if entry.debit_local_amount is not None:
+                debit_total += entry.debit_local_amount
+                self._amounts.append(entry.debit_amount)
+                self._local_amounts.append(entry.debit_local_amount.value)
+                self._directions.append(self.DEBIT)
+            else:
+                credit_total += entry.credit_local_amount
+                self._amounts.append(entry.credit_amount)
+                self._local_amounts.append(entry.credit_local_amount.value)
+                self._directions.append(self.CREDIT)
+        # 1for
+        self.opening_balance = FloatWithPrecision(opening_balance)
+        self.debit_total = debit_total
+        self.credit_total = credit_total
+        self.endResetModel()
+
+    def isOpeningRow(self, row: int) -> bool:
+        return row == 0
+
+    def isTotalRow(self, row: int) -> bool:
+        return row == len(self._numbers) + 1
+
+    def voucher(self, row: int) -> typing.Optional[tuple[datetime.date, str]]:
+        """Date and number of the voucher at ``row``, None for the opening and totals rows"""
+        if 1 <= row <= len(self._numbers):
+            return datetime.date.fromordinal(self._ordinals[row - 1]), self._numbers[row - 1]
+        return None
+
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._numbers) + 2
+
+    def columnCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else COLUMN_COUNT
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            return COLUMNS[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index: QtCore.QModelIndex):
+        if self.isOpeningRow(index.row()) or self.isTotalRow(index.row()):
+            return QtCore.Qt.ItemIsSelectable
+        return QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEnabled
+
+    def data(self, index: QtCore.QModelIndex, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if self.isOpeningRow(row):
+            return self.openingData(column, role)
+        if self.isTotalRow(row):
+            return self.totalData(column, role)
+        row -= 1
+
+        if role == QtCore.Qt.DisplayRole:
+            return self.displayText(row, column)
+        elif role == QtCore.Qt.TextAlignmentRole:
+            return int(QtCore.Qt.AlignHCenter if column == COLUMN_CURRENCY else QtCore.Qt.AlignRight)
+        elif role == QtCore.Qt.FontRole:
+            return self.font_link if column == COLUMN_VOUCHER_NUMBER else self.font_bold
+        elif role == QtCore.Qt.ForegroundRole:
+            return self.brush_link if column in [COLUMN_VOUCHER_NUMBER, COLUMN_ACCOUNT] else None
+        elif role == QtCore.Qt.UserRole:
+            if column == COLUMN_VOUCHER_NUMBER:
+                return self.voucher(row + 1)
+            elif column == COLUMN_BALANCE:
+                return FloatWithPrecision(self._balances[row])
+            elif column == COLUMN_DEBIT_LOCAL_AMOUNT and self._directions[row] == self.DEBIT:
+                return FloatWithPrecision(self._local_amounts[row])
+            elif column == COLUMN_CREDIT_LOCAL_AMOUNT and self._directions[row] == self.CREDIT:
+                return FloatWithPrecision(self._local_amounts[row])
+        return None
+
+    def displayText(self, row: int, column: int) -> str:
+        direction = self._directions[row]
+        if column == COLUMN_DATE:
+            return datetime.date.fromordinal(self._ordinals[row]).strftime('%Y-%m-%d')
+        elif column == COLUMN_VOUCHER_NUMBER:
+            return self._numbers[row]
+        elif column == COLUMN_BRIEF:
+            return self._briefs[row]
+        elif column == COLUMN_ACCOUNT:
+            return self._accounts[row]
+        elif column == COLUMN_CURRENCY:
+            return self._currencies[row]
+        elif column == COLUMN_EXCHANGE_RATE:
+            return str(FloatWithPrecision(self._exchange_rates[row]))
+        elif column == COLUMN_DEBIT_CURRENCY_AMOUNT and direction == self.DEBIT:
+            return str(FloatWithPrecision(self._amounts[row]))
+        elif column == COLUMN_CREDIT_CURRENCY_AMOUNT and direction == self.CREDIT:
+            return str(FloatWithPrecision(self._amounts[row]))
+        elif column == COLUMN_DEBIT_LOCAL_AMOUNT and direction == self.DEBIT:
+            return str(FloatWithPrecision(self._local_amounts[row]))
+        elif column == COLUMN_CREDIT_LOCAL_AMOUNT and direction == self.CREDIT:
+            return str(FloatWithPrecision(self._local_amounts[row]))
+        elif column == COLUMN_BALANCE:
+            return str(FloatWithPrecision(self._balances[row]))
+        return ""
+
+    def openingData(self, column: int, role):
+        if role == QtCore.Qt.DisplayRole:
+            if column == COLUMN_BRIEF:
+                return "期初余额"
+            elif column == COLUMN_BALANCE:
+                return str(self.opening_balance)
+        elif role == QtCore.Qt.UserRole and column == COLUMN_BALANCE:
+            return self.opening_balance
+        elif role == QtCore.Qt.TextAlignmentRole:
+            return int(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+        elif role == QtCore.Qt.FontRole:
+            return self.font_bold
+        return None
+
+    def closingBalance(self) -> FloatWithPrecision:
+        return FloatWithPrecision(self._balances[-1]) if self._balances else self.opening_balance
+
+    def totalData(self, column: int, role):
+        if role == QtCore.Qt.DisplayRole:
+            if column == COLUMN_BRIEF:
+                return "合计"
+            elif column == COLUMN_DEBIT_LOCAL_AMOUNT:
+                return str(self.debit_total)
+            elif column == COLUMN_CREDIT_LOCAL_AMOUNT:
+                return str(self.credit_total)
+            elif column == COLUMN_BALANCE:
+                return str(self.closingBalance())
+        elif role == QtCore.Qt.UserRole:
+            if column == COLUMN_DEBIT_LOCAL_AMOUNT:
+                return self.debit_total
+            elif column == COLUMN_CREDIT_LOCAL_AMOUNT:
+                return self.credit_total
+            elif column == COLUMN_BALANCE:
+                return self.closingBalance()
+        elif role == QtCore.Qt.TextAlignmentRole:
+            return int(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+        elif role == QtCore.Qt.FontRole:
+            return self.font_bold
+        elif role == QtCore.Qt.BackgroundRole:
+            return self.brush_total_background
+        elif role == QtCore.Qt.ForegroundRole:
+            return self.brush_total_foreground
+        return None
+
+
+class SubsidiaryLedgerTableView(QtWidgets.QTableView):
+    """Fits the height of the rows scrolled into view only, instead of every row of the model"""
     def __init__(self):
         super().__init__()
+        self._fitted_rows = set()
         self.setupUI()
 
     def setupUI(self):
         self.setWordWrap(True)
         self.setAlternatingRowColors(True)
-        self.setColumnCount(COLUMN_COUNT)
-        self.setHorizontalHeaderLabels(COLUMNS)
+        self.setModel(SubsidiaryLedgerModel(self))
         self.verticalHeader().setVisible(False)
         self.horizontalHeader().setStretchLastSection(True)
         self.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
-        self.clear()
+        self.model().modelReset.connect(self.on_modelReset)
+        self.verticalScrollBar().valueChanged.connect(lambda *args: self.fitVisibleRows())
+
+    def on_modelReset(self):
+        self._fitted_rows.clear()
+        self.fitVisibleRows()
+
+    def fitVisibleRows(self):
+        """Sizes the rows in the viewport that have not been sized yet"""
+        first = self.rowAt(0)
+        if first == -1:
+            first = 0
+        last = self.rowAt(self.viewport().height() - 1)
+        if last == -1:
+            last = self.model().rowCount() - 1
+        for row in range(first, last + 1):
+            if row not in self._fitted_rows:
+                self._fitted_rows.add(row)
+                self.resizeRowToContents(row)
+        # 1for
 
     def resizeEvent(self, *args, **kwargs):
         """"""
@@ -65,61 +291,8 @@ class SubsidaryLedgerTableWidget(QtWidgets.QTableWidget):
         # !for
         super().resizeEvent(*args, **kwargs)
         # 调整表格宽度变化时的行高
-        self.resizeRowsToContents()
-
-    def clear(self):
-        super().clear()
-        self.setHorizontalHeaderLabels(COLUMNS)
-        super().setRowCount(0)
-        self.insertRow(0)
-
-        row_last = self.rowCount() - 1
-        for i in range(COLUMN_COUNT):
-            item = QtWidgets.QTableWidgetItem()
-            font = item.font()
-            font.setBold(True)
-            item.setFont(font)
-            item.setFlags(QtCore.Qt.ItemIsSelectable)
-            item.setTextAlignment(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
-            item.setBackground(QtGui.QColor("#1e58ff"))
-            item.setForeground(QtGui.QColor("#ffffff"))
-            self.setItem(row_last, i, item)
-            if i == COLUMN_BRIEF:
-                item.setText("合计")
-            elif i in [COLUMN_DEBIT_LOCAL_AMOUNT, COLUMN_CREDIT_LOCAL_AMOUNT]:
-                item.setText(str(FloatWithPrecision(0.0)))
-
-    def insertRow(self, row: int):
-        super().insertRow(row)
-        for i in range(COLUMN_COUNT):
-            item = QtWidgets.QTableWidgetItem()
-            if i in [COLUMN_CURRENCY]:
-                item.setTextAlignment(QtCore.Qt.AlignHCenter)
-            else:
-                item.setTextAlignment(QtCore.Qt.AlignRight)
-            #
-            if i == COLUMN_VOUCHER_NUMBER:
-                font: QtGui.QFont = item.font()
-                font.setUnderline(True)
-                item.setFont(font)
-                item.setForeground(QtGui.QBrush(QtGui.QColor(0, 0, 255)))
-            if i == COLUMN_ACCOUNT:
-                item.setForeground(QtGui.QBrush(QtGui.QColor(0, 0, 255)))
-            #
-            font = item.font()
-            font.setBold(True)
-            item.setFont(font)
-            self.setItem(row, i, item)
-
-    def removeRow(self, row: int):
-        if row == self.rowCount() - 1:
-            return
-        super().removeRow(row)
-
-    def setRowCount(self, rows: int):
-        self.clear()
-        for _ in range(max(0, rows)):
-            self.insertRow(0)
+        self._fitted_rows.clear()
+        self.fitVisibleRows()
 
 
 class SubsidiaryLedgerWidget(QtWidgets.QWidget):
@@ -144,9 +317,16 @@ class SubsidiaryLedgerWidget(QtWidgets.QWidget):
         self.tb_choose_account.clicked.connect(self.on_tb_chooseAccountTriggered)
         self.de_from = QtWidgets.QDateEdit(self)
         self.de_until = QtWidgets.QDateEdit(self)
-        self.table = SubsidaryLedgerTableWidget()
+        self.runner = ReportJobRunner(self)
+        self.runner.finished.connect(self.on_runnerFinished)
+        self.runner.failed.connect(self.on_runnerFailed)
+        self.pbar = ReportProgressBar(self.runner)
+        self.de_from.dateChanged.connect(self.runner.cancel)
+        self.de_until.dateChanged.connect(self.runner.cancel)
+        self.cbox_account.currentIndexChanged.connect(self.runner.cancel)
+        self.table = SubsidiaryLedgerTableView()
         self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
-        self.table.itemDoubleClicked.connect(self.on_tableItemDoubleClicked)
+        self.table.doubleClicked.connect(self.on_tableDoubleClicked)
         self.action_pull = QtWidgets.QAction(QtGui.QIcon(":/icons/persistenceEntity.svg"), "拉取", self)
         self.action_pull.triggered.connect(self.on_actionPullTriggered)
         self.action_print = QtWidgets.QAction(QtGui.QIcon(":/icons/print.svg"), "打印", self)
@@ -157,6 +337,7 @@ class SubsidiaryLedgerWidget(QtWidgets.QWidget):
         self.tbar = QtWidgets.QToolBar(self)
         self.tbar.addAction(self.action_print)
         self.tbar.addWidget(HorizontalSpacer())
+        self.pbar.addToToolBar(self.tbar)
         container = QtWidgets.QWidget()
         hbox = QtWidgets.QHBoxLayout(container)
         hbox.addWidget(QtWidgets.QLabel("科目"))
@@ -174,11 +355,14 @@ class SubsidiaryLedgerWidget(QtWidgets.QWidget):
         layout = QtWidgets.QVBoxLayout(self)
         layout.addWidget(self.tbar)
         layout.addWidget(self.table)
+        self._pulled = None     # (account code, date from, date until) of the entries on display
+        SystemNotifier.instance().changed.connect(self.on_systemChanged)
 
     def updateUI(self):
         self.de_from.setDate(first_day_of_month(System.meta().month_from))
         self.de_until.setDate(last_day_of_month(System.meta().month_until))
         self.cbox_account.clear()
+        self.account_index = None       # built on first search
         for account in System.accounts():
             self.cbox_account.addItem(f"{account.code} {account.name}", account)
         # 1for
@@ -203,71 +387,41 @@ class SubsidiaryLedgerWidget(QtWidgets.QWidget):
         if date_from > date_until:
             date_until, date_from = date_from, date_until
 
-        entries = []
-        for v in System.vouchers(lambda v: v.date >= date_from and v.date <= date_until):
-            for entry in v.debit_entries:
-                if entry.account.code.startswith(account.code):
-                    entries.append(('debit', v, entry))
-                # 1if
-            # 1for
-            for entry in v.credit_entries:
-                if entry.account.code.startswith(account.code):
-                    entries.append(('credit', v, entry))
-                # 1if
-            # 1for
-        # 1for
-        self.table.setRowCount(len(entries))
-
-        for i, (direction, voucher, entry) in enumerate(entries):
-            self.table.item(i, COLUMN_DATE).setText(voucher.date.strftime('%Y-%m-%d'))
-            self.table.item(i, COLUMN_VOUCHER_NUMBER).setText(voucher.number)
-            self.table.item(i, COLUMN_VOUCHER_NUMBER).setData(
-                QtCore.Qt.UserRole,
-                voucher
-            )
-            self.table.item(i, COLUMN_BRIEF).setText(entry.brief)
-            self.table.item(i, COLUMN_ACCOUNT).setText(entry.account.qualname)
-            self.table.item(i, COLUMN_CURRENCY).setText(entry.currency)
-            self.table.item(i, COLUMN_EXCHANGE_RATE).setText(str(entry.exchange_rate))
-            if direction == 'debit':
-                self.table.item(i, COLUMN_DEBIT_CURRENCY_AMOUNT).setText(str(entry.amount))
-                self.table.item(i, COLUMN_DEBIT_LOCAL_AMOUNT).setText(
-                    str(entry.amount * entry.exchange_rate)
-                )
-                self.table.item(i, COLUMN_DEBIT_LOCAL_AMOUNT).setData(
-                    QtCore.Qt.ItemDataRole.UserRole,
-                    entry.amount * entry.exchange_rate
-                )
-            else:
-                self.table.item(i, COLUMN_CREDIT_CURRENCY_AMOUNT).setText(str(entry.amount))
-                self.table.item(i, COLUMN_CREDIT_LOCAL_AMOUNT).setText(
-                    str(entry.amount * entry.exchange_rate)
-                )
-                self.table.item(i, COLUMN_CREDIT_LOCAL_AMOUNT).setData(
-                    QtCore.Qt.ItemDataRole.UserRole,
-                    entry.amount * entry.exchange_rate
-                )
-
-        self.table.resizeRowsToContents()
+        self.pull(account.code, date_from, date_until)
         self.setWindowTitle(f"明细账 - {account.qualname } - {date_from.strftime('%Y年%m月%d日')}至{date_until.strftime('%Y年%m月%d日')}")
-        self.refreshDebitCreditTotal()
 
-    def refreshDebitCreditTotal(self):
-        debit_total = FloatWithPrecision(0.0)
-        credit_total = FloatWithPrecision(0.0)
-        last_row = self.table.rowCount() - 1
-        for row in range(last_row):
-            debit_currency_amount = self.table.item(row, COLUMN_DEBIT_LOCAL_AMOUNT).data(QtCore.Qt.ItemDataRole.UserRole)
-            credit_currency_amount = self.table.item(row, COLUMN_CREDIT_LOCAL_AMOUNT).data(QtCore.Qt.ItemDataRole.UserRole)
-            if debit_currency_amount:
-                debit_total += debit_currency_amount
-            if credit_currency_amount:
-                credit_total += credit_currency_amount
-        # 1for
-        self.table.item(last_row, COLUMN_DEBIT_LOCAL_AMOUNT).setText(str(debit_total))
-        self.table.item(last_row, COLUMN_DEBIT_LOCAL_AMOUNT).setData(QtCore.Qt.ItemDataRole.UserRole, debit_total)
-        self.table.item(last_row, COLUMN_CREDIT_LOCAL_AMOUNT).setText(str(credit_total))
-        self.table.item(last_row, COLUMN_CREDIT_LOCAL_AMOUNT).setData(QtCore.Qt.ItemDataRole.UserRole, credit_total)
+    def pull(self, account_code: str, date_from: datetime.date, date_until: datetime.date):
+        self._pulled = (account_code, date_from, date_until)
+        self.runner.start(lambda job: System.ledgerEntries(account_code, date_from, date_until))
+
+    def on_runnerFinished(self, result):
+        self.table.model().setEntries(*result)
+
+    def on_systemChanged(self, event):
+        """Keeps the account combobox in step, pulls again when a voucher on display changed"""
+        if isinstance(event, events.AccountCreated):
+            insertAccountItem(self.cbox_account, System.account(event.code))
+            self.account_index = None
+        elif isinstance(event, events.AccountDeleted):
+            removeAccountItem(self.cbox_account, event.code)
+            self.account_index = None
+        elif isinstance(event, events.AccountCurrencySet):
+            updateAccountItem(self.cbox_account, System.account(event.code))
+        elif isinstance(event, (events.VoucherChanged, events.VoucherDeleted)):
+            if self._pulled is not None:
+                code, _, date_until = self._pulled
+                if min(event.dates) <= date_until and \
+                        any(is_related_account(code, other) for other in event.accounts):
+                    self.pull(*self._pulled)
+        elif isinstance(event, events.VoucherRenumbered):
+            if self._pulled is not None and event.date <= self._pulled[2]:
+                self.pull(*self._pulled)
+        elif isinstance(event, events.BookOpened):
+            self._pulled = None
+            self.updateUI()
+
+    def on_runnerFailed(self, e: Exception):
+        QtWidgets.QMessageBox.critical(None, "拉取失败", f"{e}")
 
     def on_cbox_accountEditingFinished(self):
         editedText = self.cbox_account.lineEdit().text()
@@ -276,19 +430,13 @@ class SubsidiaryLedgerWidget(QtWidgets.QWidget):
             if self.cbox_account.itemData(i, QtCore.Qt.UserRole) is None:
                 self.cbox_account.removeItem(i)
         # 1To
-        accounts = [self.cbox_account.itemData(i, QtCore.Qt.UserRole) for i in range(self.cbox_account.count())]
-
-        rets = stringscores.findMatchingChoices(
-            editedText,
-            [f"{a.code} {a.name}" for a in accounts],
-            template='<b>{0}</b>',
-            valid_only=True,
-            sort=True
-        )
+        if self.account_index is None:
+            self.account_index = SearchIndex((self.cbox_account.itemText(i) for i in range(self.cbox_account.count())),
+                                             pinyin=System.accountPinyin())
+        # !if
+        rets = self.account_index.search(editedText, template='<b>{0}</b>')
         if rets:
-            name, named, _ = rets[0]
-            index = next((i for i, a in enumerate(accounts) if f"{a.code} {a.name}" == name), None)
-            self.cbox_account.setCurrentIndex(index) if index else ...
+            self.cbox_account.setCurrentIndex(rets[0].index)
         else:
             self.cbox_account.setCurrentIndex(0)
 
@@ -301,11 +449,11 @@ class SubsidiaryLedgerWidget(QtWidgets.QWidget):
         #
         AccountSelectDialog(on_accept).exec_()
 
-    def on_tableItemDoubleClicked(self, item: QtWidgets.QTableWidgetItem):
-        if item.column() == COLUMN_VOUCHER_NUMBER:
-            voucher = item.data(QtCore.Qt.UserRole)
+    def on_tableDoubleClicked(self, index: QtCore.QModelIndex):
+        if index.column() == COLUMN_VOUCHER_NUMBER:
+            voucher = self.table.model().voucher(index.row())
             if voucher:
-                self.signal_view_voucher.emit(voucher.date, voucher.number)
+                self.signal_view_voucher.emit(*voucher)
 
     def on_actionPrintTriggered(self):
         print("打印明细账")
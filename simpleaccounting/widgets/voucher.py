@@ -141,20 +141,20 @@ class VoucherWidget(QtWidgets.QWidget):
             date_until = last_day_of_month(date_from)
             self.gbox.setTitle(date.strftime('%Y年%m月'))
 
-            vouchers = System.vouchers(lambda v: v.date >= date_from and v.date <= date_until and v.category == '记账')
-            self.label_voucher_count.setText(str(len(vouchers)))
+            counts = System.voucherCounts(date_from, date_until)
+            self.label_voucher_count.setText(str(counts.get('记账', 0)))
 
-            vouchers = System.vouchers(lambda v: v.date >= date_from and v.date <= date_until and v.category == '汇兑损益结转')
-            self.label_exchange_gains_losses_voucher_state.setText(str(len(vouchers)))
-            self.label_exchange_gains_losses_voucher_state.setStyleSheet('color: green;' if len(vouchers) > 0 else 'color: red;')
+            count = counts.get('汇兑损益结转', 0)
+            self.label_exchange_gains_losses_voucher_state.setText(str(count))
+            self.label_exchange_gains_losses_voucher_state.setStyleSheet('color: green;' if count > 0 else 'color: red;')
 
-            vouchers = System.vouchers(lambda v: v.date >= date_from and v.date <= date_until and v.category == '月末结转')
-            self.label_month_ending_voucher_state.setText(str(len(vouchers)))
-            self.label_month_ending_voucher_state.setStyleSheet('color: green;' if len(vouchers) > 0 else 'color: red;')
+            count = counts.get('月末结转', 0)
+            self.label_month_ending_voucher_state.setText(str(count))
+            self.label_month_ending_voucher_state.setStyleSheet('color: green;' if count > 0 else 'color: red;')
 
-            vouchers = System.vouchers(lambda v: v.date >= date_from and v.date <= date_until and v.category == '年末结转')
-            self.label_year_ending_voucher_state.setText(str(len(vouchers)))
-            self.label_year_ending_voucher_state.setStyleSheet('color: green;' if len(vouchers) > 0 else 'color: red;')
+            count = counts.get('年末结转', 0)
+            self.label_year_ending_voucher_state.setText(str(count))
+            self.label_year_ending_voucher_state.setStyleSheet('color: green;' if count > 0 else 'color: red;')
 
             # 年初1月启用年末结转
             self.btn_last_year_end_carry_forward_voucher.setEnabled(date.month == 12)
@@ -19,6 +19,7 @@ import typing
 
 from qtpy import QtWidgets, QtCore, QtGui
 from simpleaccounting.app.system import System, VoucherEntry, Voucher, IllegalOperation, EntryNotFound
+from simpleaccounting.app.prefetch import Prefetcher
 from simpleaccounting.tools.mymath import FloatWithPrecision
 from simpleaccounting.widgets.qwidgets import HorizontalSpacer, CustomInputDialog
 from simpleaccounting.widgets.account import AccountActivateDialog
@@ -90,7 +91,7 @@ class AccountItemDelegate(QtWidgets.QStyledItemDelegate):
         model.setData(index, datetime.datetime.now(), QtCore.Qt.ItemDataRole.StatusTipRole)
 
     def setCurrencyIfNot(self, account):
-        if not account.children and account.currency is None:
+        if account.is_leaf and account.currency is None:
             def setCurrency(currency_name, need_exchange_gains_losses):
                 System.setAccountCurrency(account.code, currency_name, need_exchange_gains_losses)
                 return True
@@ -304,10 +305,13 @@ class VoucherEditWidget(QtWidgets.QWidget):
         super().__init__()
         self.setupUI()
         self._readonly = False
+        self._dirty_rows = set()
+        self.voucher_cache = Prefetcher(System.voucher)
+        self.destroyed.connect(self.voucher_cache.shutdown)
         self.setDateMonth(date_month)
         self.dateedit.dateChanged.connect(lambda *args: (self.action_save.setEnabled(True), self.refresh(True)))
         self.table.tb_choose_account.clicked.connect(self.on_tb_chooseAccountClicked)
-        self.startTimer(200)
+        self.table.itemChanged.connect(self.on_tableItemChanged)
 
     def setDateMonth(self, date_month: datetime.date):
         self.date_month = date_month
@@ -317,6 +321,7 @@ class VoucherEditWidget(QtWidgets.QWidget):
             last_day_of_month(self.date_month)
         )
         self.dateedit.blockSignals(False)
+        self.voucher_cache.invalidate()
         self.vouchers = self.vouchersInThisMonth()
         self.index_current = -1 if len(self.vouchers) == 0 else 0
         self.updateUI()
@@ -340,6 +345,10 @@ class VoucherEditWidget(QtWidgets.QWidget):
         self.lbl_voucher_category.setStyleSheet('color: blue;')
         self.lbl_voucher_category.setFont(font)
         self.table = VoucherEditTableWidget()
+        self.timer_refresh = QtCore.QTimer(self)
+        self.timer_refresh.setSingleShot(True)
+        self.timer_refresh.setInterval(0)
+        self.timer_refresh.timeout.connect(self.refreshDirtyRows)
         self.action_print = QtWidgets.QAction(QtGui.QIcon(":/icons/print.svg"), "打印", self)
         self.action_print.triggered.connect(self.printVoucher)
         self.action_print.setShortcut(QtGui.QKeySequence('Ctrl+P'))
@@ -446,7 +455,8 @@ class VoucherEditWidget(QtWidgets.QWidget):
                 *self.inputVoucherEntries()
             )
             # update local cache
-            self.vouchers[self.index_current] = System.voucher(self.vouchers[self.index_current].number)
+            self.vouchers[self.index_current].date = qdate_to_date(self.dateedit.date())
+            self.voucher_cache.invalidate(self.vouchers[self.index_current].number)
             self.action_save.setEnabled(False)
             return True
         except IllegalOperation as e:
@@ -476,7 +486,58 @@ class VoucherEditWidget(QtWidgets.QWidget):
         self.table.item(last_row, COLUMN_CREDIT_LOCAL_AMOUNT).setText(str(credit_total))
         self.table.item(last_row, COLUMN_CREDIT_LOCAL_AMOUNT).setData(QtCore.Qt.ItemDataRole.UserRole, credit_total)
 
+    def adjustLocalDebitCreditTotal(self, debit_delta: FloatWithPrecision, credit_delta: FloatWithPrecision):
+        """Applies the change of one row to the totals row instead of summing up every row again"""
+        last_row = self.table.rowCount() - 1
+        debit_total = self.table.item(last_row, COLUMN_DEBIT_LOCAL_AMOUNT).data(QtCore.Qt.ItemDataRole.UserRole)
+        credit_total = self.table.item(last_row, COLUMN_CREDIT_LOCAL_AMOUNT).data(QtCore.Qt.ItemDataRole.UserRole)
+        debit_total = FloatWithPrecision(debit_total or 0.0) + debit_delta
+        credit_total = FloatWithPrecision(credit_total or 0.0) + credit_delta
+        self.table.item(last_row, COLUMN_DEBIT_LOCAL_AMOUNT).setText(str(debit_total))
+        self.table.item(last_row, COLUMN_DEBIT_LOCAL_AMOUNT).setData(QtCore.Qt.ItemDataRole.UserRole, debit_total)
+        self.table.item(last_row, COLUMN_CREDIT_LOCAL_AMOUNT).setText(str(credit_total))
+        self.table.item(last_row, COLUMN_CREDIT_LOCAL_AMOUNT).setData(QtCore.Qt.ItemDataRole.UserRole, credit_total)
+
+    def localDebitCreditAmounts(self, row: int) -> tuple[FloatWithPrecision, FloatWithPrecision]:
+        debit = self.table.item(row, COLUMN_DEBIT_LOCAL_AMOUNT).data(QtCore.Qt.ItemDataRole.UserRole)
+        credit = self.table.item(row, COLUMN_CREDIT_LOCAL_AMOUNT).data(QtCore.Qt.ItemDataRole.UserRole)
+        return FloatWithPrecision(debit or 0.0), FloatWithPrecision(credit or 0.0)
+
+    def on_tableItemChanged(self, item: QtWidgets.QTableWidgetItem):
+        """Delegates mark edited cells with a StatusTipRole timestamp, collect their rows for the next refresh"""
+        if item.data(QtCore.Qt.ItemDataRole.StatusTipRole) is None:
+            return
+        self._dirty_rows.add(item.row())
+        # coalesce all the edits of one event loop turn into a single refresh
+        if not self.timer_refresh.isActive():
+            self.timer_refresh.start()
+
+    def refreshDirtyRows(self):
+        rows, self._dirty_rows = self._dirty_rows, set()
+        last_row = self.table.rowCount() - 1
+        # refreshing writes into the table, don't let it mark the rows dirty again
+        self.table.blockSignals(True)
+        try:
+            for row in sorted(rows):
+                if 0 <= row < last_row:
+                    self.refreshRow(row)
+                    self.table.resizeRowToContents(row)
+        finally:
+            self.table.blockSignals(False)
+
     def refresh(self, force=False):
+        """Refreshes every row, ``force`` re-reads the exchange rates e.g. after the voucher date changed"""
+        self._dirty_rows.clear()
+        self.table.blockSignals(True)
+        try:
+            for row in range(self.table.rowCount() - 1):
+                self.refreshRow(row, force)
+            self.refreshLocalDebitCreditTotal()
+        finally:
+            self.table.blockSignals(False)
+        self.table.resizeRowsToContents()
+
+    def refreshRow(self, row: int, force=False):
 
         def isRefreshNeeded(item) -> bool:
             needed = item.data(QtCore.Qt.ItemDataRole.StatusTipRole) is not None
@@ -518,92 +579,85 @@ class VoucherEditWidget(QtWidgets.QWidget):
                     QtCore.Qt.ItemDataRole.UserRole,
                     credit_currency_amount * exchange_rate
                 )
-            #
-            self.refreshLocalDebitCreditTotal()
 
-        for row in range(self.table.rowCount()):
-            if isRefreshNeeded(self.table.item(row, COLUMN_BRIEF)):
-                ...
+        debit_before, credit_before = self.localDebitCreditAmounts(row)
 
-            if isRefreshNeeded(self.table.item(row, COLUMN_ACCOUNT)) or force:
-                account = self.table.item(row, COLUMN_ACCOUNT).data(QtCore.Qt.ItemDataRole.UserRole)
-                if account and account.currency:
-                    self.table.item(row, COLUMN_CURRENCY).setText(
-                        account.currency.name
-                    )
-                    self.table.item(row, COLUMN_CURRENCY).setData(
-                        QtCore.Qt.ItemDataRole.UserRole,
-                        account.currency
-                    )
-                    self.table.item(row, COLUMN_EXCHANGE_RATE).setText(
-                        str(System.exchangeRate(account.currency.name, qdate_to_date(self.dateedit.date())).rate)
-                    )
-                    self.table.item(row, COLUMN_EXCHANGE_RATE).setData(
-                        QtCore.Qt.ItemDataRole.UserRole,
-                        System.exchangeRate(account.currency.name, qdate_to_date(self.dateedit.date())).rate
-                    )
-                    setDirty(self.table.item(row, COLUMN_EXCHANGE_RATE))
-                else:
-                    self.table.item(row, COLUMN_CURRENCY).setText("")
-                    self.table.item(row, COLUMN_CURRENCY).setData(
-                        QtCore.Qt.ItemDataRole.UserRole,
-                        None
-                    )
-                    self.table.item(row, COLUMN_EXCHANGE_RATE).setText("")
-                    self.table.item(row, COLUMN_EXCHANGE_RATE).setData(
-                        QtCore.Qt.ItemDataRole.UserRole,
-                        None
-                    )
-                    setDirty(self.table.item(row, COLUMN_EXCHANGE_RATE))
+        if isRefreshNeeded(self.table.item(row, COLUMN_BRIEF)):
+            ...
 
-            if isRefreshNeeded(self.table.item(row, COLUMN_CURRENCY)):
-                currency = self.table.item(row, COLUMN_CURRENCY).data(QtCore.Qt.UserRole)
+        if isRefreshNeeded(self.table.item(row, COLUMN_ACCOUNT)) or force:
+            account = self.table.item(row, COLUMN_ACCOUNT).data(QtCore.Qt.ItemDataRole.UserRole)
+            if account and account.currency:
+                exchange_rate = System.exchangeRate(account.currency.name, qdate_to_date(self.dateedit.date())).rate
+                self.table.item(row, COLUMN_CURRENCY).setText(
+                    account.currency.name
+                )
+                self.table.item(row, COLUMN_CURRENCY).setData(
+                    QtCore.Qt.ItemDataRole.UserRole,
+                    account.currency
+                )
                 self.table.item(row, COLUMN_EXCHANGE_RATE).setText(
-                    str(System.exchangeRate(currency.name, qdate_to_date(self.dateedit.date())).rate)
+                    str(exchange_rate)
                 )
                 self.table.item(row, COLUMN_EXCHANGE_RATE).setData(
                     QtCore.Qt.ItemDataRole.UserRole,
-                    System.exchangeRate(currency.name, qdate_to_date(self.dateedit.date())).rate
+                    exchange_rate
                 )
                 setDirty(self.table.item(row, COLUMN_EXCHANGE_RATE))
-
-            if isRefreshNeeded(self.table.item(row, COLUMN_EXCHANGE_RATE)):
-                refreshLocalAmount(row)
-
-            if isRefreshNeeded(self.table.item(row, COLUMN_DEBIT_CURRENCY_AMOUNT)):
-                self.table.item(row, COLUMN_CREDIT_CURRENCY_AMOUNT).setText("")
-                self.table.item(row, COLUMN_CREDIT_CURRENCY_AMOUNT).setData(
+            else:
+                self.table.item(row, COLUMN_CURRENCY).setText("")
+                self.table.item(row, COLUMN_CURRENCY).setData(
                     QtCore.Qt.ItemDataRole.UserRole,
                     None
                 )
-                refreshLocalAmount(row)
-
-            if isRefreshNeeded(self.table.item(row, COLUMN_CREDIT_CURRENCY_AMOUNT)):
-                self.table.item(row, COLUMN_DEBIT_CURRENCY_AMOUNT).setText("")
-                self.table.item(row, COLUMN_DEBIT_CURRENCY_AMOUNT).setData(
+                self.table.item(row, COLUMN_EXCHANGE_RATE).setText("")
+                self.table.item(row, COLUMN_EXCHANGE_RATE).setData(
                     QtCore.Qt.ItemDataRole.UserRole,
                     None
                 )
-                refreshLocalAmount(row)
+                setDirty(self.table.item(row, COLUMN_EXCHANGE_RATE))
+
+        if isRefreshNeeded(self.table.item(row, COLUMN_CURRENCY)):
+            currency = self.table.item(row, COLUMN_CURRENCY).data(QtCore.Qt.UserRole)
+            exchange_rate = System.exchangeRate(currency.name, qdate_to_date(self.dateedit.date())).rate
+            self.table.item(row, COLUMN_EXCHANGE_RATE).setText(
+                str(exchange_rate)
+            )
+            self.table.item(row, COLUMN_EXCHANGE_RATE).setData(
+                QtCore.Qt.ItemDataRole.UserRole,
+                exchange_rate
+            )
+            setDirty(self.table.item(row, COLUMN_EXCHANGE_RATE))
+
+        if isRefreshNeeded(self.table.item(row, COLUMN_EXCHANGE_RATE)):
+            refreshLocalAmount(row)
+
+        if isRefreshNeeded(self.table.item(row, COLUMN_DEBIT_CURRENCY_AMOUNT)):
+            self.table.item(row, COLUMN_CREDIT_CURRENCY_AMOUNT).setText("")
+            self.table.item(row, COLUMN_CREDIT_CURRENCY_AMOUNT).setData(
+                QtCore.Qt.ItemDataRole.UserRole,
+                None
+            )
+            refreshLocalAmount(row)
+
+        if isRefreshNeeded(self.table.item(row, COLUMN_CREDIT_CURRENCY_AMOUNT)):
+            self.table.item(row, COLUMN_DEBIT_CURRENCY_AMOUNT).setText("")
+            self.table.item(row, COLUMN_DEBIT_CURRENCY_AMOUNT).setData(
+                QtCore.Qt.ItemDataRole.UserRole,
+                None
+            )
+            refreshLocalAmount(row)
         #
-        self.table.resizeRowsToContents()
+        debit_after, credit_after = self.localDebitCreditAmounts(row)
+        if debit_after != debit_before or credit_after != credit_before:
+            self.adjustLocalDebitCreditTotal(debit_after - debit_before, credit_after - credit_before)
 
     def vouchersInThisMonth(self):
-        """"""
-        return sorted(
-            System.vouchers(
-            lambda v: first_day_of_month(self.date_month) <= v.date and
-                      last_day_of_month(self.date_month) >= v.date),
-            key=lambda v: v.number
-        )
+        """Numbers, dates and categories only, full vouchers are loaded by ``voucher_cache`` when shown"""
+        return System.voucherHeadersOfMonth(self.date_month)
 
     def accountingVouchersInThisMonth(self):
-        return sorted(
-            System.vouchers(
-                lambda v: first_day_of_month(self.date_month) <= v.date and
-                          last_day_of_month(self.date_month) >= v.date and v.category == '记账') ,
-            key=lambda v: v.number
-        )
+        return System.voucherHeadersOfMonth(self.date_month, '记账')
 
     def inputVoucherEntries(self) -> tuple[list[VoucherEntry], list[VoucherEntry]]:
         """
@@ -656,7 +710,11 @@ class VoucherEditWidget(QtWidgets.QWidget):
         # change visible widget
         if self.index_current != -1:
             self.stack.setCurrentWidget(self.table)
-            voucher = self.vouchers[self.index_current]
+            voucher = self.voucher_cache.get(self.vouchers[self.index_current].number)
+            self.voucher_cache.prefetch(*(
+                self.vouchers[i].number for i in (self.index_current + 1, self.index_current - 1)
+                if 0 <= i < len(self.vouchers)
+            ))
             self.dateedit.setDate(voucher.date)
             self.lbl_voucher_number.setText(voucher.number)
             self.lbl_voucher_category.setText(voucher.category)
@@ -670,6 +728,7 @@ class VoucherEditWidget(QtWidgets.QWidget):
         self.action_save.setEnabled(False)
 
     def loadVoucherIntoTable(self, voucher: Voucher):
+        self._dirty_rows.clear()
         self.table.clear()
         row_count = len(voucher.debit_entries) + len(voucher.credit_entries)
         self.table.setRowCount(row_count if row_count > 0 else 8)
@@ -734,15 +793,17 @@ class VoucherEditWidget(QtWidgets.QWidget):
             )
         # !for
         self.refreshLocalDebitCreditTotal()
-
-    def timerEvent(self, *args, **kwargs):
-        super().timerEvent(*args, **kwargs)
-        self.refresh()
+        self.table.resizeRowsToContents()
 
     def on_action_removeCurrentRowTriggered(self):
         row = self.table.currentRow()
-        if row != -1:
+        if row != -1 and row != self.table.rowCount() - 1:
+            # pending rows are addressed by index, settle them before the indices shift
+            self.refreshDirtyRows()
+            debit, credit = self.localDebitCreditAmounts(row)
             self.table.removeRow(row)
+            self.adjustLocalDebitCreditTotal(-debit, -credit)
+            self.action_save.setEnabled(True)
 
     def on_action_insertRowLastTriggered(self):
         row = self.table.rowCount() - 1
@@ -755,6 +816,8 @@ class VoucherEditWidget(QtWidgets.QWidget):
         ret = QtWidgets.QMessageBox.question(None, "提示", "作废凭证将重排所有当月凭证号，是否作废该凭证?")
         if ret == QtWidgets.QDialogButtonBox.Yes:
             System.deleteVoucher(self.vouchers[self.index_current].number)
+            # renumbering shifts the numbers of the vouchers cached
+            self.voucher_cache.invalidate()
             accounting_vouchers = self.accountingVouchersInThisMonth()
             for i, v in enumerate(accounting_vouchers):
                 System.changeVoucherNumber(
@@ -826,7 +889,7 @@ class VoucherEditWidget(QtWidgets.QWidget):
         AccountSelectDialog(on_accept).exec_()
 
     def setCurrencyIfNot(self, account) -> bool:
-        if not account.children and account.currency is None:
+        if account.is_leaf and account.currency is None:
             def setCurrency(currency_name, need_exchange_gains_losses):
                 System.setAccountCurrency(account.code, currency_name, need_exchange_gains_losses)
                 return True
@@ -863,12 +926,12 @@ class AccountSelectDialog(CustomInputDialog):
         self.setWindowTitle("选择科目")
         # 创建垂直布局
         self.cascader = CNCascadingListsWidget(self)
-        self.cascader.setRoot(self.root())
+        self.cascader.setRoot(self.root(), pinyin=System.accountPinyin())
         self.cascader.searchbar.sigKeyEnterReturnPressed.connect(self.accept)
         layout = QtWidgets.QVBoxLayout(self)
         layout.addWidget(self.cascader)
         layout.addWidget(self.button_box)
-        self.setTabOrder(self.cascader.searchbar, self.cascader.listWidget)
+        self.setTabOrder(self.cascader.searchbar, self.cascader.listView)
 
     def accept(self):
         if not self.cascader.selectedItems():